@@ -0,0 +1,263 @@
+import asyncio
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+from app.agent.toolcall import ToolCallAgent
+from app.logger import logger
+from app.schema import AgentState
+
+
+AgentFactory = Callable[[str, str], ToolCallAgent]
+
+
+class AgentPool:
+    """Bounded pool of long-lived agents keyed by client session.
+
+    Agents are evicted least-recently-used first once the pool exceeds its size
+    or estimated memory cap, and expire after sitting idle for longer than the
+    idle timeout. Evicted agents are cleaned up in the background so their
+    browser contexts and sandbox handles are released without holding up the
+    request that caused the eviction. Agents leased by ``acquire`` are never
+    evicted until ``release`` is called, nor are running agents.
+
+    Attributes:
+        factory: Creates an agent from a model name and agent id.
+        max_agents: Maximum number of pooled agents.
+        max_memory_bytes: Cap on the estimated size of all agents' memories.
+        idle_timeout: Seconds an idle agent is kept before it expires.
+        cleanup_interval: Seconds between idle checks.
+        warm_agents: Number of pre-spawned agents to keep ready per model.
+    """
+
+    def __init__(
+        self,
+        factory: AgentFactory,
+        max_agents: int = 100,
+        max_memory_bytes: Optional[int] = None,
+        idle_timeout: float = 1800,
+        cleanup_interval: float = 60,
+        warm_agents: Optional[Dict[str, int]] = None,
+    ):
+        self.factory = factory
+        self.max_agents = max_agents
+        self.max_memory_bytes = max_memory_bytes
+        self.idle_timeout = idle_timeout
+        self.cleanup_interval = cleanup_interval
+        self.warm_agents = warm_agents or {}
+
+        # Pooled agents in least- to most-recently-used order
+        self._agents: "OrderedDict[str, ToolCallAgent]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        # Number of callers holding each agent between acquire and release
+        self._leases: Dict[str, int] = {}
+        # Unassigned agents ready to be handed to a new session, per model
+        self._warm: Dict[str, List[ToolCallAgent]] = {}
+
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._eviction_tasks: Set[asyncio.Task] = set()
+        self._is_shutting_down = False
+
+        self.hits = 0
+        self.misses = 0
+        self.warm_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def start(self) -> None:
+        """Pre-spawns warm agents and starts the idle cleanup task."""
+        for model_name in self.warm_agents:
+            self._replenish(model_name)
+
+        async def cleanup_loop():
+            while not self._is_shutting_down:
+                await asyncio.sleep(self.cleanup_interval)
+                try:
+                    await self._cleanup_idle_agents()
+                except Exception as e:
+                    logger.error(f"Error in agent pool cleanup loop: {e}")
+
+        self._cleanup_task = asyncio.create_task(cleanup_loop())
+
+    async def acquire(self, key: str, model_name: str, agent_id: str) -> ToolCallAgent:
+        """Leases the pooled agent for key, creating it on first use.
+
+        New sessions take a warm agent for the model when one is ready. The
+        agent cannot be evicted until the caller calls ``release(key)``.
+
+        Args:
+            key: Pool key identifying the client session.
+            model_name: Model the agent should use.
+            agent_id: Name given to a newly created agent.
+
+        Returns:
+            ToolCallAgent: The session's agent.
+        """
+        now = asyncio.get_running_loop().time()
+        agent = self._agents.get(key)
+        if agent is not None:
+            self.hits += 1
+            self._agents.move_to_end(key)
+            self._last_used[key] = now
+            self._leases[key] = self._leases.get(key, 0) + 1
+            return agent
+
+        self.misses += 1
+        warm = self._warm.get(model_name)
+        if warm:
+            self.warm_hits += 1
+            agent = warm.pop()
+            agent.name = agent_id
+            asyncio.get_running_loop().call_soon(self._replenish, model_name)
+        else:
+            agent = self.factory(model_name, agent_id)
+
+        self._agents[key] = agent
+        self._last_used[key] = now
+        self._leases[key] = self._leases.get(key, 0) + 1
+
+        self._enforce_limits()
+        return agent
+
+    def release(self, key: str) -> None:
+        """Ends a lease taken by ``acquire``; the agent may be evicted once idle."""
+        leases = self._leases.get(key, 0) - 1
+        if leases > 0:
+            self._leases[key] = leases
+            return
+        self._leases.pop(key, None)
+        if key in self._agents:
+            self._last_used[key] = asyncio.get_running_loop().time()
+        # The pool may have grown past its caps while this agent was leased
+        self._enforce_limits()
+
+    def lease_count(self, key: str) -> int:
+        """Number of callers currently holding the agent for key."""
+        return self._leases.get(key, 0)
+
+    def _replenish(self, model_name: str) -> None:
+        """Tops up the warm agents for a model to their configured count."""
+        if self._is_shutting_down:
+            return
+        warm = self._warm.setdefault(model_name, [])
+        while len(warm) < self.warm_agents.get(model_name, 0):
+            try:
+                warm.append(self.factory(model_name, f"warm-{len(warm)}"))
+            except Exception as e:
+                logger.error(f"Failed to pre-spawn agent for {model_name}: {e}")
+                return
+
+    @staticmethod
+    def estimate_memory(agent: ToolCallAgent) -> int:
+        """Approximates the bytes held by an agent's conversation memory."""
+        size = 0
+        for message in agent.memory.messages:
+            size += len(message.content or "") + len(message.base64_image or "")
+            for tool_call in message.tool_calls or []:
+                size += len(tool_call.function.arguments)
+        return size
+
+    def _is_evictable(self, key: str) -> bool:
+        return key not in self._leases and self._agents[key].state == AgentState.IDLE
+
+    def _enforce_limits(self) -> None:
+        """Evicts least recently used idle agents until the pool fits its caps."""
+        to_evict = []
+        candidates = [k for k in self._agents if self._is_evictable(k)]
+
+        while candidates and len(self._agents) > self.max_agents:
+            to_evict.append(self._pop(candidates.pop(0)))
+
+        if self.max_memory_bytes is not None:
+            total = sum(self.estimate_memory(a) for a in self._agents.values())
+            while candidates and total > self.max_memory_bytes:
+                agent = self._pop(candidates.pop(0))
+                total -= self.estimate_memory(agent)
+                to_evict.append(agent)
+
+        if len(self._agents) > self.max_agents:
+            logger.warning(
+                f"Agent pool over capacity ({len(self._agents)}/{self.max_agents}); "
+                "all other agents are busy"
+            )
+
+        self.evictions += len(to_evict)
+        if to_evict:
+            task = asyncio.create_task(self._cleanup_agents(to_evict))
+            self._eviction_tasks.add(task)
+            task.add_done_callback(self._eviction_tasks.discard)
+
+    def _pop(self, key: str) -> ToolCallAgent:
+        self._last_used.pop(key, None)
+        return self._agents.pop(key)
+
+    async def _cleanup_idle_agents(self) -> None:
+        """Expires idle agents and evicts any left over the pool's caps."""
+        now = asyncio.get_running_loop().time()
+        expired = []
+        for key in list(self._agents):
+            if not self._is_evictable(key):
+                # A running agent is in use; count the run as activity
+                self._last_used[key] = now
+            elif now - self._last_used[key] > self.idle_timeout:
+                expired.append(self._pop(key))
+
+        self.expirations += len(expired)
+        await self._cleanup_agents(expired)
+
+        # Agents that were busy when the caps were last enforced may now be idle
+        self._enforce_limits()
+
+    async def _cleanup_agents(self, agents: List[ToolCallAgent]) -> None:
+        for agent in agents:
+            try:
+                await agent.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning up agent '{agent.name}': {e}")
+
+    async def cleanup(self) -> None:
+        """Stops the cleanup task and cleans up all pooled and warm agents."""
+        self._is_shutting_down = True
+
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            try:
+                await asyncio.wait_for(self._cleanup_task, timeout=1.0)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+
+        agents = list(self._agents.values())
+        for warm in self._warm.values():
+            agents.extend(warm)
+        self._agents.clear()
+        self._last_used.clear()
+        self._leases.clear()
+        self._warm.clear()
+
+        await self._cleanup_agents(agents)
+        if self._eviction_tasks:
+            await asyncio.gather(*self._eviction_tasks, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def get_stats(self) -> Dict:
+        """Gets pool statistics.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        return {
+            "agents": len(self._agents),
+            "leased_agents": len(self._leases),
+            "warm_agents": {model: len(a) for model, a in self._warm.items()},
+            "max_agents": self.max_agents,
+            "estimated_memory_bytes": sum(
+                self.estimate_memory(a) for a in self._agents.values()
+            ),
+            "max_memory_bytes": self.max_memory_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "warm_hits": self.warm_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -1,6 +1,7 @@
 import asyncio
 import json
-from typing import Any, List, Optional, Union
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
 
 from pydantic import Field
 
@@ -8,7 +9,14 @@ from app.agent.react import ReActAgent
 from app.exceptions import TokenLimitExceeded
 from app.logger import logger
 from app.prompt.toolcall import NEXT_STEP_PROMPT, SYSTEM_PROMPT
-from app.schema import TOOL_CHOICE_TYPE, AgentState, Message, ToolCall, ToolChoice
+from app.schema import (
+    TOOL_CHOICE_TYPE,
+    AgentState,
+    Message,
+    StreamDelta,
+    ToolCall,
+    ToolChoice,
+)
 from app.tool import CreateChatCompletion, Terminate, ToolCollection
 
 
@@ -32,9 +40,15 @@ class ToolCallAgent(ReActAgent):
 
     tool_calls: List[ToolCall] = Field(default_factory=list)
     _current_base64_image: Optional[str] = None
+    _stream_queue: Optional[asyncio.Queue] = None
 
     max_steps: int = 30
     max_observe: Optional[Union[int, bool]] = None
+    # Run consecutive calls to tools with max_concurrency > 1 concurrently
+    parallel_tool_calls: bool = True
+    # LLM instances are shared per config, so their pooled connections are
+    # closed on process shutdown; set for an agent that owns a private LLM
+    close_llm_on_cleanup: bool = False
 
     async def think(self) -> bool:
         """Process current state and decide next actions using tools"""
@@ -42,27 +56,34 @@ class ToolCallAgent(ReActAgent):
             user_msg = Message.user_message(self.next_step_prompt)
             self.messages += [user_msg]
 
+        system_msgs = (
+            [Message.system_message(self.system_prompt)] if self.system_prompt else None
+        )
+        tools = self.available_tools.to_params()
+        if self.llm.max_context_tokens:
+            self._compact_memory(system_msgs, tools)
+
+        self.memory.record_request()
         try:
             # Get response with tool options
-            response = await self.llm.ask_tool(
+            response = await self._ask_tool(
                 messages=self.messages,
-                system_msgs=(
-                    [Message.system_message(self.system_prompt)]
-                    if self.system_prompt
-                    else None
-                ),
-                tools=self.available_tools.to_params(),
+                system_msgs=system_msgs,
+                tools=tools,
                 tool_choice=self.tool_choices,
             )
         except ValueError:
             raise
         except Exception as e:
-            # Check if this is a RetryError containing TokenLimitExceeded
-            if hasattr(e, "__cause__") and isinstance(e.__cause__, TokenLimitExceeded):
-                token_limit_error = e.__cause__
-                logger.error(
-                    f"🚨 Token limit error (from RetryError): {token_limit_error}"
-                )
+            # Check if this is a RetryError containing TokenLimitExceeded, or a
+            # TokenLimitExceeded raised directly by the (unretried) streaming call
+            token_limit_error = (
+                e
+                if isinstance(e, TokenLimitExceeded)
+                else getattr(e, "__cause__", None)
+            )
+            if isinstance(token_limit_error, TokenLimitExceeded):
+                logger.error(f"🚨 Token limit error: {token_limit_error}")
                 self.memory.add_message(
                     Message.assistant_message(
                         f"Maximum token limit reached, cannot continue execution: {str(token_limit_error)}"
@@ -128,6 +149,19 @@ class ToolCallAgent(ReActAgent):
             )
             return False
 
+    async def _ask_tool(self, **kwargs):
+        """Ask the LLM for tool calls, forwarding deltas when run via run_stream"""
+        if self._stream_queue is None:
+            return await self.llm.ask_tool(**kwargs)
+
+        response = None
+        async for delta in self.llm.ask_tool_stream(**kwargs):
+            if delta.message is not None or delta.finish_reason:
+                response = delta.message
+            else:
+                self._stream_queue.put_nowait(delta)
+        return response
+
     async def act(self) -> str:
         """Execute tool calls and handle their results"""
         if not self.tool_calls:
@@ -138,30 +172,82 @@ class ToolCallAgent(ReActAgent):
             return self.messages[-1].content or "No content or commands to execute"
 
         results = []
+        for batch in self._batch_tool_calls():
+            if len(batch) == 1:
+                outputs = [await self._run_tool_call(batch[0])]
+            else:
+                # Cap concurrent calls to each tool at its declared limit
+                semaphores = {
+                    name: asyncio.Semaphore(
+                        self.available_tools.get_tool(name).max_concurrency
+                    )
+                    for name in {command.function.name for command in batch}
+                }
+                outputs = await asyncio.gather(
+                    *(
+                        self._run_tool_call(command, semaphores[command.function.name])
+                        for command in batch
+                    )
+                )
+
+            # Add tool responses to memory in the order the calls were issued
+            for command, (result, base64_image) in zip(batch, outputs):
+                logger.info(
+                    f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
+                )
+
+                tool_msg = Message.tool_message(
+                    content=result,
+                    tool_call_id=command.id,
+                    name=command.function.name,
+                    base64_image=base64_image,
+                )
+                self.memory.add_message(tool_msg)
+                results.append(result)
+
+        return "\n\n".join(results)
+
+    def _batch_tool_calls(self) -> List[List[ToolCall]]:
+        """Group consecutive calls to concurrent tools; any other call runs alone"""
+        batches: List[List[ToolCall]] = []
+        batch_is_concurrent = False
         for command in self.tool_calls:
+            tool = (
+                self.available_tools.get_tool(command.function.name)
+                if command.function
+                else None
+            )
+            concurrent = (
+                self.parallel_tool_calls
+                and tool is not None
+                and tool.max_concurrency > 1
+            )
+            if concurrent and batch_is_concurrent:
+                batches[-1].append(command)
+            else:
+                batches.append([command])
+            batch_is_concurrent = concurrent
+        return batches
+
+    async def _run_tool_call(
+        self, command: ToolCall, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Execute one tool call, returning its observation and captured image"""
+        async with semaphore or nullcontext():
             # Reset base64_image for each tool call
             self._current_base64_image = None
 
             result = await self.execute_tool(command)
 
-            if self.max_observe:
-                result = result[: self.max_observe]
+            # Take the image before yielding to the loop, so calls running
+            # concurrently can't see each other's
+            base64_image = self._current_base64_image
+            self._current_base64_image = None
 
-            logger.info(
-                f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
-            )
+        if self.max_observe:
+            result = result[: self.max_observe]
 
-            # Add tool response to memory
-            tool_msg = Message.tool_message(
-                content=result,
-                tool_call_id=command.id,
-                name=command.function.name,
-                base64_image=self._current_base64_image,
-            )
-            self.memory.add_message(tool_msg)
-            results.append(result)
-
-        return "\n\n".join(results)
+        return result, base64_image
 
     async def execute_tool(self, command: ToolCall) -> str:
         """Execute a single tool call with robust error handling"""
@@ -248,11 +334,69 @@ class ToolCallAgent(ReActAgent):
                     logger.error(
                         f"🚨 Error cleaning up tool '{tool_name}': {e}", exc_info=True
                     )
+        if self.close_llm_on_cleanup:
+            try:
+                await self.llm.close()
+            except Exception as e:
+                logger.error(f"🚨 Error closing LLM client connections: {e}")
         logger.info(f"✨ Cleanup complete for agent '{self.name}'.")
 
+    def _compact_memory(
+        self, system_msgs: Optional[List[Message]], tools: List[dict]
+    ) -> None:
+        """Compact memory so the next request fits llm.max_context_tokens"""
+        reserved = self.llm.count_tools_tokens(tools)
+        if system_msgs:
+            reserved += self.llm.count_message_tokens(
+                [msg.to_dict() for msg in system_msgs]
+            )
+
+        before = self.memory.compaction_stats["tokens_removed"]
+        total = self.memory.compact(
+            self.llm.count_message_tokens, self.llm.max_context_tokens - reserved
+        )
+        removed = self.memory.compaction_stats["tokens_removed"] - before
+        if removed:
+            logger.info(
+                f"🗜️ Compacted memory by {removed} tokens to {total} tokens "
+                f"to fit the context budget"
+            )
+
     async def run(self, request: Optional[str] = None) -> str:
         """Run the agent with cleanup when done."""
         try:
             return await super().run(request)
         finally:
+            stats = self.memory.image_stats
+            if stats["images_elided"]:
+                logger.info(
+                    f"🖼️ Image retention elided {stats['images_elided']} images, saving "
+                    f"{stats['bytes_saved'] / 1e6:.1f} MB and {stats['tokens_saved']} "
+                    f"image tokens across {stats['requests']} requests"
+                )
+            stats = self.memory.compaction_stats
+            if stats["compactions"]:
+                logger.info(
+                    f"🗜️ Memory compaction ran {stats['compactions']} times, "
+                    f"digesting {stats['tool_outputs_digested']} tool outputs, "
+                    f"dropping {stats['messages_dropped']} messages and removing "
+                    f"{stats['tokens_removed']} tokens"
+                )
             await self.cleanup()
+
+    async def run_stream(
+        self, request: Optional[str] = None
+    ) -> AsyncIterator[StreamDelta]:
+        """Run the agent, yielding LLM output deltas as each step generates them."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._stream_queue = queue
+        task = asyncio.create_task(self.run(request))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (delta := await queue.get()) is not None:
+                yield delta
+            await task  # Surface errors raised by the run
+        finally:
+            self._stream_queue = None
+            if not task.done():
+                task.cancel()
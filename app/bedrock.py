@@ -1,12 +1,17 @@
+import asyncio
+import functools
 import json
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Literal, Optional, Union, AsyncIterator
+from typing import AsyncIterator, Dict, List, Literal, Optional, Union
 
-import boto3
 import aiohttp
+import boto3
+from botocore.config import Config
 from openai.types.chat import ChatCompletionChunk
 
 
@@ -38,11 +43,20 @@ class OpenAIResponse:
 
 # Main client class for interacting with Amazon Bedrock
 class BedrockClient:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 10, **client_kwargs):
         # Initialize Bedrock client, you need to configure AWS env first
         try:
-            self.client = boto3.client("bedrock-runtime")
-            self.chat = Chat(self.client)
+            # boto3 clients are thread-safe; size the HTTP pool to the worker count
+            self.client = boto3.client(
+                "bedrock-runtime",
+                config=Config(max_pool_connections=max_concurrency),
+                **client_kwargs,
+            )
+            # Blocking boto3 calls run here so they never stall the event loop
+            self.executor = ThreadPoolExecutor(
+                max_workers=max_concurrency, thread_name_prefix="bedrock"
+            )
+            self.chat = Chat(self.client, self.executor)
         except Exception as e:
             print(f"Error initializing Bedrock client: {e}")
             sys.exit(1)
@@ -50,11 +64,22 @@ class BedrockClient:
 
 # Main client class for interacting with OpenRouter
 class OpenRouterClient:
-    def __init__(self):
+    def __init__(
+        self,
+        max_connections: int = 100,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+    ):
         # Initialize OpenRouter client
         try:
             self.api_key = None  # Will be set from LLMSettings
             self.base_url = "https://openrouter.ai/api/v1"
+            self.max_connections = max_connections
+            self.keepalive_timeout = keepalive_timeout
+            self.dns_cache_ttl = dns_cache_ttl
+            # One pooled session per event loop, since aiohttp sessions are loop-bound
+            self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+            self._in_flight: Dict[asyncio.AbstractEventLoop, int] = {}
             self.chat = OpenRouterChat(self)
         except Exception as e:
             print(f"Error initializing OpenRouter client: {e}")
@@ -63,11 +88,50 @@ class OpenRouterClient:
     def set_api_key(self, api_key):
         self.api_key = api_key
 
+    def _get_session(self, loop: asyncio.AbstractEventLoop) -> aiohttp.ClientSession:
+        # Forget sessions whose loop has gone away; they can no longer be awaited
+        for stale_loop in [l for l in self._sessions if l.is_closed()]:
+            self._sessions.pop(stale_loop)
+            self._in_flight.pop(stale_loop, None)
+
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    @asynccontextmanager
+    async def session(self):
+        """Yield the pooled session for the running loop, tracking in-flight use"""
+        loop = asyncio.get_running_loop()
+        session = self._get_session(loop)
+        self._in_flight[loop] = self._in_flight.get(loop, 0) + 1
+        try:
+            yield session
+        finally:
+            self._in_flight[loop] -= 1
+
+    async def close(self):
+        """Close the running loop's session unless other requests are still using it"""
+        loop = asyncio.get_running_loop()
+        if self._in_flight.get(loop, 0) > 0:
+            return
+        session = self._sessions.pop(loop, None)
+        self._in_flight.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
 
 # Chat interface class for Bedrock
 class Chat:
-    def __init__(self, client):
-        self.completions = ChatCompletions(client)
+    def __init__(self, client, executor=None):
+        self.completions = ChatCompletions(client, executor)
 
 
 # Chat interface class for OpenRouter
@@ -84,16 +148,18 @@ class OpenRouterChatCompletions:
     def _create_headers(self):
         return {
             "Authorization": f"Bearer {self.client.api_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
         }
 
-    def _create_payload(self, model, messages, max_tokens, temperature, stream, **kwargs):
+    def _create_payload(
+        self, model, messages, max_tokens, temperature, stream, **kwargs
+    ):
         payload = {
             "model": model,
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
-            "stream": stream
+            "stream": stream,
         }
 
         # Add optional parameters
@@ -110,9 +176,9 @@ class OpenRouterChatCompletions:
         if not chunk.strip():
             return None
 
-        if chunk.startswith('data: '):
+        if chunk.startswith("data: "):
             data = chunk[6:].strip()
-            if data == '[DONE]':
+            if data == "[DONE]":
                 return None
 
             try:
@@ -123,72 +189,92 @@ class OpenRouterChatCompletions:
                 return None
         return None
 
-    async def create(self, **kwargs) -> Union[OpenAIResponse, AsyncIterator[OpenAIResponse]]:
-        model = kwargs.get("model")
-        messages = kwargs.get("messages")
-        max_tokens = kwargs.get("max_tokens", 1024)
-        temperature = kwargs.get("temperature", 0.7)
-        stream = kwargs.get("stream", False)
+    async def create(
+        self, **kwargs
+    ) -> Union[OpenAIResponse, AsyncIterator[OpenAIResponse]]:
+        model = kwargs.pop("model", None)
+        messages = kwargs.pop("messages", None)
+        max_tokens = kwargs.pop("max_tokens", 1024)
+        temperature = kwargs.pop("temperature", 0.7)
+        stream = kwargs.pop("stream", False)
 
         if stream:
-            return self._create_streaming_response(model, messages, max_tokens, temperature, **kwargs)
+            return self._create_streaming_response(
+                model, messages, max_tokens, temperature, **kwargs
+            )
         else:
-            return await self._create_non_streaming_response(model, messages, max_tokens, temperature, **kwargs)
+            return await self._create_non_streaming_response(
+                model, messages, max_tokens, temperature, **kwargs
+            )
 
-    async def _create_non_streaming_response(self, model, messages, max_tokens, temperature, **kwargs):
+    async def _create_non_streaming_response(
+        self, model, messages, max_tokens, temperature, **kwargs
+    ):
         """Send a non-streaming request to OpenRouter"""
         url = f"{self.client.base_url}/chat/completions"
         headers = self._create_headers()
-        payload = self._create_payload(model, messages, max_tokens, temperature, False, **kwargs)
+        payload = self._create_payload(
+            model, messages, max_tokens, temperature, False, **kwargs
+        )
 
-        async with aiohttp.ClientSession() as session:
+        async with self.client.session() as session:
             async with session.post(url, headers=headers, json=payload) as response:
                 if response.status != 200:
                     error_text = await response.text()
-                    raise Exception(f"OpenRouter API error: {response.status} - {error_text}")
+                    raise Exception(
+                        f"OpenRouter API error: {response.status} - {error_text}"
+                    )
 
                 data = await response.json()
                 return OpenAIResponse(data)
 
-    async def _create_streaming_response(self, model, messages, max_tokens, temperature, **kwargs):
+    async def _create_streaming_response(
+        self, model, messages, max_tokens, temperature, **kwargs
+    ):
         """Generator function for streaming responses from OpenRouter"""
         url = f"{self.client.base_url}/chat/completions"
         headers = self._create_headers()
-        payload = self._create_payload(model, messages, max_tokens, temperature, True, **kwargs)
+        payload = self._create_payload(
+            model, messages, max_tokens, temperature, True, **kwargs
+        )
 
         buffer = ""
-        async with aiohttp.ClientSession() as session:
+        async with self.client.session() as session:
             async with session.post(url, headers=headers, json=payload) as response:
                 if response.status != 200:
                     error_text = await response.text()
-                    raise Exception(f"OpenRouter API error: {response.status} - {error_text}")
+                    raise Exception(
+                        f"OpenRouter API error: {response.status} - {error_text}"
+                    )
 
                 async for chunk_bytes in response.content.iter_any():
-                    chunk_text = chunk_bytes.decode('utf-8')
+                    chunk_text = chunk_bytes.decode("utf-8")
                     buffer += chunk_text
 
                     while True:
-                        line_end = buffer.find('\n')
+                        line_end = buffer.find("\n")
                         if line_end == -1:
                             break
 
                         line = buffer[:line_end].strip()
-                        buffer = buffer[line_end + 1:]
+                        buffer = buffer[line_end + 1 :]
 
-                        if line.startswith('data: '):
+                        if line.startswith("data: "):
                             data = line[6:]
-                            if data == '[DONE]':
+                            if data == "[DONE]":
                                 break
 
                             try:
                                 data_obj = json.loads(data)
                                 # Create OpenAI-compatible chunk response
                                 chunk_data = {
-                                    "id": data_obj.get("id", f"chatcmpl-{uuid.uuid4()}"),
+                                    "id": data_obj.get(
+                                        "id", f"chatcmpl-{uuid.uuid4()}"
+                                    ),
                                     "object": "chat.completion.chunk",
                                     "created": int(time.time()),
                                     "model": model,
-                                    "choices": data_obj.get("choices", [])
+                                    "choices": data_obj.get("choices", []),
                                 }
                                 yield OpenAIResponse(chunk_data)
                             except json.JSONDecodeError:
@@ -197,8 +283,31 @@ class OpenRouterChatCompletions:
 
 # Core class handling chat completions functionality for Bedrock
 class ChatCompletions:
-    def __init__(self, client):
+    def __init__(self, client, executor: Optional[ThreadPoolExecutor] = None):
         self.client = client
+        self.executor = executor
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        # Offload a blocking boto3 call to the bounded Bedrock thread pool
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _build_converse_kwargs(
+        model, system_prompt, bedrock_messages, max_tokens, temperature, tools
+    ):
+        converse_kwargs = {
+            "modelId": model,
+            "system": system_prompt,
+            "messages": bedrock_messages,
+            "inferenceConfig": {"temperature": temperature, "maxTokens": max_tokens},
+        }
+        # botocore rejects an explicit None, so only send toolConfig when needed
+        if tools:
+            converse_kwargs["toolConfig"] = {"tools": tools}
+        return converse_kwargs
 
     def _convert_openai_tools_to_bedrock_format(self, tools):
         # Convert OpenAI function calling format to Bedrock tool format
@@ -350,38 +459,19 @@ class ChatCompletions:
             system_prompt,
             bedrock_messages,
         ) = self._convert_openai_messages_to_bedrock_format(messages)
-        response = self.client.converse(
-            modelId=model,
-            system=system_prompt,
-            messages=bedrock_messages,
-            inferenceConfig={"temperature": temperature, "maxTokens": max_tokens},
-            toolConfig={"tools": tools} if tools else None,
+        response = await self._run_blocking(
+            self.client.converse,
+            **self._build_converse_kwargs(
+                model, system_prompt, bedrock_messages, max_tokens, temperature, tools
+            ),
         )
         openai_response = self._convert_bedrock_response_to_openai_format(response)
         return openai_response
 
-    async def _invoke_bedrock_stream(
-        self,
-        model: str,
-        messages: List[Dict[str, str]],
-        max_tokens: int,
-        temperature: float,
-        tools: Optional[List[dict]] = None,
-        tool_choice: Literal["none", "auto", "required"] = "auto",
-        **kwargs,
-    ) -> OpenAIResponse:
-        # Streaming invocation of Bedrock model
-        (
-            system_prompt,
-            bedrock_messages,
-        ) = self._convert_openai_messages_to_bedrock_format(messages)
-        response = self.client.converse_stream(
-            modelId=model,
-            system=system_prompt,
-            messages=bedrock_messages,
-            inferenceConfig={"temperature": temperature, "maxTokens": max_tokens},
-            toolConfig={"tools": tools} if tools else None,
-        )
+    def _converse_stream(self, converse_kwargs: dict) -> dict:
+        # Runs in the Bedrock thread pool: both the request and reading the event
+        # stream block on network I/O
+        response = self.client.converse_stream(**converse_kwargs)
 
         # Initialize response structure
         bedrock_response = {
@@ -435,6 +525,29 @@ class ChatCompletions:
                         "input"
                     ] = json.loads(bedrock_response_tool_input)
         print()
+        return bedrock_response
+
+    async def _invoke_bedrock_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        tools: Optional[List[dict]] = None,
+        tool_choice: Literal["none", "auto", "required"] = "auto",
+        **kwargs,
+    ) -> OpenAIResponse:
+        # Streaming invocation of Bedrock model
+        (
+            system_prompt,
+            bedrock_messages,
+        ) = self._convert_openai_messages_to_bedrock_format(messages)
+        bedrock_response = await self._run_blocking(
+            self._converse_stream,
+            self._build_converse_kwargs(
+                model, system_prompt, bedrock_messages, max_tokens, temperature, tools
+            ),
+        )
         openai_response = self._convert_bedrock_response_to_openai_format(
             bedrock_response
         )
@@ -24,9 +24,27 @@ class LLMSettings(BaseModel):
         None,
         description="Maximum input tokens to use across all requests (None for unlimited)",
     )
+    max_context_tokens: Optional[int] = Field(
+        None,
+        description="Token budget of the history sent per request; older tool outputs are compacted to fit (None for unlimited)",
+    )
     temperature: float = Field(1.0, description="Sampling temperature")
     api_type: str = Field(..., description="Azure, Openai, or Ollama")
     api_version: str = Field(..., description="Azure Openai version if AzureOpenai")
+    max_connections: int = Field(
+        100,
+        description="Maximum concurrent connections for the OpenRouter and Bedrock clients",
+    )
+    requests_per_minute: Optional[int] = Field(
+        None, description="Client-side request rate limit (None for unlimited)"
+    )
+    tokens_per_minute: Optional[int] = Field(
+        None, description="Client-side token rate limit (None for unlimited)"
+    )
+    max_concurrent_requests: Optional[int] = Field(
+        None,
+        description="Maximum in-flight requests per event loop (None for unlimited)",
+    )
 
 
 class ProxySettings(BaseModel):
@@ -49,6 +67,40 @@ class SearchSettings(BaseModel):
         default=3,
         description="Maximum number of times to retry all engines when all fail",
     )
+    hedged_search: bool = Field(
+        default=False,
+        description="Query further engines in parallel when one is slow or fails, instead of one at a time",
+    )
+    hedge_delay: float = Field(
+        default=2.0,
+        description="Seconds to wait for an engine before also querying the next one",
+    )
+    merge_results: bool = Field(
+        default=False,
+        description="Merge and deduplicate the results of engines that answer together instead of taking the first",
+    )
+    adaptive_engine_order: bool = Field(
+        default=True,
+        description="Try engines with lower observed latency and failure rate first",
+    )
+    cache_enabled: bool = Field(
+        default=True,
+        description="Reuse search results and fetched page text for repeated queries and URLs",
+    )
+    cache_ttl: int = Field(
+        default=3600, description="Seconds before cached search results expire"
+    )
+    page_cache_ttl: int = Field(
+        default=86400, description="Seconds before cached page text expires"
+    )
+    cache_max_entries: int = Field(
+        default=1024,
+        description="Maximum number of cached result lists and of cached pages (LRU eviction)",
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for a cache shared across runs and processes (None for memory only)",
+    )
     lang: str = Field(
         default="en",
         description="Language code for search results (e.g., en, zh, fr)",
@@ -59,6 +111,22 @@ class SearchSettings(BaseModel):
     )
 
 
+class ScreenshotSettings(BaseModel):
+    full_page: bool = Field(
+        False, description="Capture the whole page instead of the viewport"
+    )
+    quality: int = Field(75, description="Initial JPEG quality of screenshots")
+    min_quality: int = Field(
+        40, description="Lowest JPEG quality used to stay within max_bytes"
+    )
+    max_bytes: int = Field(
+        200_000, description="Target size in bytes of an encoded screenshot"
+    )
+    skip_unchanged: bool = Field(
+        True, description="Skip the screenshot when the page is unchanged"
+    )
+
+
 class BrowserSettings(BaseModel):
     headless: bool = Field(False, description="Whether to run browser in headless mode")
     disable_security: bool = Field(
@@ -82,6 +150,19 @@ class BrowserSettings(BaseModel):
     max_content_length: int = Field(
         2000, description="Maximum length for content retrieval operations"
     )
+    max_browsers: int = Field(
+        2, description="Maximum number of browsers shared by all agents"
+    )
+    max_contexts_per_browser: int = Field(
+        8, description="Maximum number of agent contexts open in one browser"
+    )
+    max_pages_per_browser: int = Field(
+        500, description="Pages a browser may open before it is restarted"
+    )
+    screenshot: ScreenshotSettings = Field(
+        default_factory=ScreenshotSettings,
+        description="Screenshot policy for the browser state",
+    )
 
 
 class SandboxSettings(BaseModel):
@@ -98,6 +179,20 @@ class SandboxSettings(BaseModel):
     )
 
 
+class ResponseCacheSettings(BaseModel):
+    """Configuration for the opt-in LLM response cache"""
+
+    enabled: bool = Field(False, description="Whether to cache LLM responses")
+    ttl: int = Field(3600, description="Seconds before a cached response expires")
+    max_entries: int = Field(
+        1024, description="Maximum number of cached responses (LRU eviction)"
+    )
+    path: Optional[str] = Field(
+        None,
+        description="SQLite file for a cache shared across runs (None for memory only)",
+    )
+
+
 class MCPSettings(BaseModel):
     """Configuration for MCP (Model Context Protocol)"""
 
@@ -118,6 +213,9 @@ class AppConfig(BaseModel):
         None, description="Search configuration"
     )
     mcp_config: Optional[MCPSettings] = Field(None, description="MCP configuration")
+    response_cache_config: Optional[ResponseCacheSettings] = Field(
+        None, description="LLM response cache configuration"
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -172,9 +270,14 @@ class Config:
             "api_key": base_llm.get("api_key"),
             "max_tokens": base_llm.get("max_tokens", 4096),
             "max_input_tokens": base_llm.get("max_input_tokens"),
+            "max_context_tokens": base_llm.get("max_context_tokens"),
             "temperature": base_llm.get("temperature", 1.0),
             "api_type": base_llm.get("api_type", ""),
             "api_version": base_llm.get("api_version", ""),
+            "max_connections": base_llm.get("max_connections", 100),
+            "requests_per_minute": base_llm.get("requests_per_minute"),
+            "tokens_per_minute": base_llm.get("tokens_per_minute"),
+            "max_concurrent_requests": base_llm.get("max_concurrent_requests"),
         }
 
         # handle browser config.
@@ -227,6 +330,9 @@ class Config:
         else:
             mcp_settings = MCPSettings()
 
+        response_cache_config = raw_config.get("response_cache", {})
+        response_cache_settings = ResponseCacheSettings(**response_cache_config)
+
         config_dict = {
             "llm": {
                 "default": default_settings,
@@ -239,6 +345,7 @@ class Config:
             "browser_config": browser_settings,
             "search_config": search_settings,
             "mcp_config": mcp_settings,
+            "response_cache_config": response_cache_settings,
         }
 
         self._config = AppConfig(**config_dict)
@@ -264,6 +371,11 @@ class Config:
         """Get the MCP configuration"""
         return self._config.mcp_config
 
+    @property
+    def response_cache_config(self) -> ResponseCacheSettings:
+        """Get the LLM response cache configuration"""
+        return self._config.response_cache_config
+
     @property
     def workspace_root(self) -> Path:
         """Get the workspace root directory"""
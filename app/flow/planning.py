@@ -155,6 +155,7 @@ class PlanningFlow(BaseFlow):
             system_msgs=[system_message],
             tools=[self.planning_tool.to_param()],
             tool_choice=ToolChoice.AUTO,
+            use_cache=True,
         )
 
         # Process tool calls if present
@@ -1,5 +1,7 @@
 import math
-from typing import Dict, List, Optional, Union
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import tiktoken
 from openai import (
@@ -22,11 +24,15 @@ from app.bedrock import BedrockClient, OpenRouterClient
 from app.config import LLMSettings, config
 from app.exceptions import TokenLimitExceeded
 from app.logger import logger  # Assuming a logger is set up in your app
+from app.rate_limiter import RateLimiter
+from app.response_cache import ResponseCache
 from app.schema import (
     ROLE_VALUES,
     TOOL_CHOICE_TYPE,
     TOOL_CHOICE_VALUES,
     Message,
+    MessageTokenCache,
+    StreamDelta,
     ToolChoice,
 )
 
@@ -55,8 +61,9 @@ class TokenCounter:
     HIGH_DETAIL_TARGET_SHORT_SIDE = 768
     TILE_SIZE = 512
 
-    def __init__(self, tokenizer):
+    def __init__(self, tokenizer, cache_size: int = 1024):
         self.tokenizer = tokenizer
+        self.message_cache = MessageTokenCache(max_size=cache_size)
 
     def count_text(self, text: str) -> int:
         """Calculate tokens for a text string"""
@@ -100,28 +107,31 @@ class TokenCounter:
             # For unknown detail levels, use medium as default
             return 1024
 
-    def _calculate_high_detail_tokens(self, width: int, height: int) -> int:
-        """Calculate tokens for high detail images based on dimensions"""
+    @classmethod
+    def _high_detail_size(cls, width: int, height: int) -> Tuple[int, int]:
+        """Dimensions an image is resized to before high detail tiling"""
         # Step 1: Scale to fit in MAX_SIZE x MAX_SIZE square
-        if width > self.MAX_SIZE or height > self.MAX_SIZE:
-            scale = self.MAX_SIZE / max(width, height)
+        if width > cls.MAX_SIZE or height > cls.MAX_SIZE:
+            scale = cls.MAX_SIZE / max(width, height)
             width = int(width * scale)
             height = int(height * scale)
 
         # Step 2: Scale so shortest side is HIGH_DETAIL_TARGET_SHORT_SIDE
-        scale = self.HIGH_DETAIL_TARGET_SHORT_SIDE / min(width, height)
-        scaled_width = int(width * scale)
-        scaled_height = int(height * scale)
+        scale = cls.HIGH_DETAIL_TARGET_SHORT_SIDE / min(width, height)
+        return int(width * scale), int(height * scale)
+
+    @classmethod
+    def _calculate_high_detail_tokens(cls, width: int, height: int) -> int:
+        """Calculate tokens for high detail images based on dimensions"""
+        scaled_width, scaled_height = cls._high_detail_size(width, height)
 
         # Step 3: Count number of 512px tiles
-        tiles_x = math.ceil(scaled_width / self.TILE_SIZE)
-        tiles_y = math.ceil(scaled_height / self.TILE_SIZE)
+        tiles_x = math.ceil(scaled_width / cls.TILE_SIZE)
+        tiles_y = math.ceil(scaled_height / cls.TILE_SIZE)
         total_tiles = tiles_x * tiles_y
 
         # Step 4: Calculate final token count
-        return (
-            total_tiles * self.HIGH_DETAIL_TILE_TOKENS
-        ) + self.LOW_DETAIL_IMAGE_TOKENS
+        return (total_tiles * cls.HIGH_DETAIL_TILE_TOKENS) + cls.LOW_DETAIL_IMAGE_TOKENS
 
     def count_content(self, content: Union[str, List[Union[str, dict]]]) -> int:
         """Calculate tokens for message content"""
@@ -152,28 +162,41 @@ class TokenCounter:
                 token_count += self.count_text(function.get("arguments", ""))
         return token_count
 
-    def count_message_tokens(self, messages: List[dict]) -> int:
-        """Calculate the total number of tokens in a message list"""
-        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+    def count_single_message(self, message: dict) -> int:
+        """Calculate the tokens of one message, including per-message overhead"""
+        tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
 
-        for message in messages:
-            tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+        # Add role tokens
+        tokens += self.count_text(message.get("role", ""))
 
-            # Add role tokens
-            tokens += self.count_text(message.get("role", ""))
+        # Add content tokens
+        if "content" in message:
+            tokens += self.count_content(message["content"])
 
-            # Add content tokens
-            if "content" in message:
-                tokens += self.count_content(message["content"])
+        # Add tool calls tokens
+        if "tool_calls" in message:
+            tokens += self.count_tool_calls(message["tool_calls"])
 
-            # Add tool calls tokens
-            if "tool_calls" in message:
-                tokens += self.count_tool_calls(message["tool_calls"])
+        # Add name and tool_call_id tokens
+        tokens += self.count_text(message.get("name", ""))
+        tokens += self.count_text(message.get("tool_call_id", ""))
 
-            # Add name and tool_call_id tokens
-            tokens += self.count_text(message.get("name", ""))
-            tokens += self.count_text(message.get("tool_call_id", ""))
+        return tokens
 
+    def count_message_tokens(self, messages: List[dict]) -> int:
+        """Calculate the total number of tokens in a message list
+
+        Per-message counts are cached, so repeated calls over a growing history
+        only encode the messages appended since the previous call.
+        """
+        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+
+        for message in messages:
+            key = self.message_cache.key(message)
+            tokens = self.message_cache.get(key)
+            if tokens is None:
+                tokens = self.count_single_message(message)
+                self.message_cache.put(key, tokens)
             total_tokens += tokens
 
         return total_tokens
@@ -182,6 +205,9 @@ class TokenCounter:
 class LLM:
     _instances: Dict[str, "LLM"] = {}
 
+    # Number of distinct tool lists whose token counts are kept per instance
+    TOOL_TOKENS_CACHE_SIZE = 32
+
     def __new__(
         cls, config_name: str = "default", llm_config: Optional[LLMSettings] = None
     ):
@@ -204,6 +230,7 @@ class LLM:
             self.api_key = llm_config.api_key
             self.api_version = llm_config.api_version
             self.base_url = llm_config.base_url
+            self.max_connections = llm_config.max_connections
 
             # Add token counting related attributes
             self.total_input_tokens = 0
@@ -213,6 +240,7 @@ class LLM:
                 if hasattr(llm_config, "max_input_tokens")
                 else None
             )
+            self.max_context_tokens = getattr(llm_config, "max_context_tokens", None)
 
             # Initialize tokenizer
             try:
@@ -228,14 +256,42 @@ class LLM:
                     api_version=self.api_version,
                 )
             elif self.api_type == "aws":
-                self.client = BedrockClient()
+                self.client = BedrockClient(max_concurrency=self.max_connections)
             elif self.api_type == "openrouter":
-                self.client = OpenRouterClient()
+                self.client = OpenRouterClient(max_connections=self.max_connections)
                 self.client.set_api_key(self.api_key)
             else:
                 self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
 
             self.token_counter = TokenCounter(self.tokenizer)
+            # Shared by every caller of this config, since instances are per config_name
+            self.rate_limiter = RateLimiter(
+                requests_per_minute=llm_config.requests_per_minute,
+                tokens_per_minute=llm_config.tokens_per_minute,
+                max_concurrent_requests=llm_config.max_concurrent_requests,
+            )
+            self.response_cache = (
+                ResponseCache.from_settings(config.response_cache_config)
+                if config.response_cache_config and config.response_cache_config.enabled
+                else None
+            )
+            self._tool_tokens_cache: "OrderedDict[int, Tuple[List[dict], int, int]]" = (
+                OrderedDict()
+            )
+
+    async def close(self) -> None:
+        """Release pooled connections held for the running event loop"""
+        if isinstance(self.client, OpenRouterClient):
+            await self.client.close()
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Release the pooled connections of every LLM instance on shutdown"""
+        for llm in list(cls._instances.values()):
+            try:
+                await llm.close()
+            except Exception as e:
+                logger.error(f"Error closing LLM client connections: {e}")
 
     def count_tokens(self, text: str) -> int:
         """Calculate the number of tokens in a text"""
@@ -246,6 +302,27 @@ class LLM:
     def count_message_tokens(self, messages: List[dict]) -> int:
         return self.token_counter.count_message_tokens(messages)
 
+    def count_tools_tokens(self, tools: List[dict]) -> int:
+        """Calculate the tokens of tool definitions, cached per tool list
+
+        ``ToolCollection.to_params`` returns the same list object until the
+        collection changes, so the cache is keyed on list identity and the
+        definitions are only tokenized once per agent rather than every step.
+        """
+        cached = self._tool_tokens_cache.get(id(tools))
+        if cached is not None and cached[0] is tools and cached[1] == len(tools):
+            self._tool_tokens_cache.move_to_end(id(tools))
+            return cached[2]
+
+        tools_tokens = sum(self.count_tokens(str(tool)) for tool in tools)
+
+        # Keep a reference to the list so its id cannot be reused while cached
+        self._tool_tokens_cache[id(tools)] = (tools, len(tools), tools_tokens)
+        self._tool_tokens_cache.move_to_end(id(tools))
+        while len(self._tool_tokens_cache) > self.TOOL_TOKENS_CACHE_SIZE:
+            self._tool_tokens_cache.popitem(last=False)
+        return tools_tokens
+
     def update_token_count(self, input_tokens: int, completion_tokens: int = 0) -> None:
         """Update token counts"""
         # Only track tokens if max_input_tokens is set
@@ -362,6 +439,325 @@ class LLM:
 
         return formatted_messages
 
+    def _response_cache_key(self, params: dict) -> str:
+        """Hash the request parameters that determine the model's response"""
+        return self.response_cache.make_key(
+            {k: v for k, v in params.items() if k not in ("timeout", "stream")}
+        )
+
+    @staticmethod
+    def _dump_completion_message(message) -> dict:
+        """Convert a completion message from any client into a cacheable dict"""
+        tool_calls = [
+            {
+                "id": tool_call.id,
+                "type": "function",
+                "function": {
+                    "name": tool_call.function.name,
+                    "arguments": tool_call.function.arguments,
+                },
+            }
+            for tool_call in message.tool_calls or []
+        ]
+        return {
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": tool_calls or None,
+        }
+
+    @asynccontextmanager
+    async def _rate_limited(self, input_tokens: int) -> AsyncIterator[None]:
+        """Hold a rate limiter slot for one request; back off on a rate limit error"""
+        try:
+            async with self.rate_limiter.limit(input_tokens):
+                yield
+        except RateLimitError:
+            self.rate_limiter.on_rate_limited()
+            raise
+
+    async def _create_text_completion(self, params: dict, input_tokens: int) -> str:
+        """Send a non-streaming completion request and return its text"""
+        async with self._rate_limited(input_tokens):
+            response = await self.client.chat.completions.create(**params, stream=False)
+
+        if not response.choices or not response.choices[0].message.content:
+            raise ValueError("Empty or invalid response from LLM")
+
+        # Update token counts
+        self.update_token_count(
+            response.usage.prompt_tokens, response.usage.completion_tokens
+        )
+        self.rate_limiter.record_usage(response.usage.completion_tokens)
+
+        return response.choices[0].message.content
+
+    async def _create_tool_completion(
+        self, params: dict, input_tokens: int
+    ) -> ChatCompletionMessage | None:
+        """Send a tool-calling completion request and return the message"""
+        async with self._rate_limited(input_tokens):
+            response: ChatCompletion = await self.client.chat.completions.create(
+                **params
+            )
+
+        # Check if response is valid
+        if not response.choices or not response.choices[0].message:
+            print(response)
+            # raise ValueError("Invalid or empty response from LLM")
+            return None
+
+        # Update token counts
+        self.update_token_count(
+            response.usage.prompt_tokens, response.usage.completion_tokens
+        )
+        self.rate_limiter.record_usage(response.usage.completion_tokens)
+
+        return response.choices[0].message
+
+    def _completion_params(
+        self, messages: List[dict], temperature: Optional[float] = None
+    ) -> dict:
+        """Build the model-specific parameters shared by every completion request"""
+        params = {"model": self.model, "messages": messages}
+        if self.model in REASONING_MODELS:
+            params["max_completion_tokens"] = self.max_tokens
+        else:
+            params["max_tokens"] = self.max_tokens
+            params["temperature"] = (
+                temperature if temperature is not None else self.temperature
+            )
+        return params
+
+    def _prepare_messages(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+    ) -> Tuple[List[dict], int]:
+        """Format messages, count their tokens and enforce the input token limit"""
+        supports_images = self.model in MULTIMODAL_MODELS
+        formatted = self.format_messages(messages, supports_images)
+        if system_msgs:
+            formatted = self.format_messages(system_msgs, supports_images) + formatted
+
+        input_tokens = self.count_message_tokens(formatted)
+        if not self.check_token_limit(input_tokens):
+            raise TokenLimitExceeded(self.get_limit_error_message(input_tokens))
+        return formatted, input_tokens
+
+    def _tool_params(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]],
+        timeout: int,
+        tools: Optional[List[dict]],
+        tool_choice: TOOL_CHOICE_TYPE,  # type: ignore
+        temperature: Optional[float],
+        kwargs: dict,
+    ) -> Tuple[dict, int]:
+        """Validate a tool-calling request; return its parameters and input tokens"""
+        if tool_choice not in TOOL_CHOICE_VALUES:
+            raise ValueError(f"Invalid tool_choice: {tool_choice}")
+        if tools:
+            for tool in tools:
+                if not isinstance(tool, dict) or "type" not in tool:
+                    raise ValueError("Each tool must be a dict with 'type' field")
+
+        messages, input_tokens = self._prepare_messages(messages, system_msgs)
+        input_tokens += self.count_tools_tokens(tools) if tools else 0
+        if not self.check_token_limit(input_tokens):
+            raise TokenLimitExceeded(self.get_limit_error_message(input_tokens))
+
+        params = {
+            **self._completion_params(messages, temperature),
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "timeout": timeout,
+            **kwargs,
+        }
+        return params, input_tokens
+
+    async def _stream_text(self, params: dict, input_tokens: int) -> AsyncIterator[str]:
+        """Yield the content deltas of a streaming completion as they arrive"""
+        # For streaming, update estimated token count before making the request
+        self.update_token_count(input_tokens)
+
+        completion_parts = []
+        async with self._rate_limited(input_tokens):
+            if isinstance(self.client, BedrockClient):
+                # The Bedrock adapter assembles the stream itself; emit it whole
+                response = await self.client.chat.completions.create(
+                    **params, stream=False
+                )
+                content = response.choices[0].message.content or ""
+                completion_parts.append(content)
+                yield content
+            else:
+                response = await self.client.chat.completions.create(
+                    **params, stream=True
+                )
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    content = getattr(chunk.choices[0].delta, "content", None)
+                    if content:
+                        completion_parts.append(content)
+                        yield content
+
+        # estimate completion tokens for streaming response
+        completion_tokens = self.count_tokens("".join(completion_parts))
+        logger.info(
+            f"Estimated completion tokens for streaming response: {completion_tokens}"
+        )
+        self.total_completion_tokens += completion_tokens
+        self.rate_limiter.record_usage(completion_tokens)
+
+    async def ask_stream(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Send a prompt to the LLM and yield response text as it is generated.
+
+        Unlike ``ask``, failures are not retried: a retry after partial output
+        would duplicate text the caller has already forwarded.
+
+        Args:
+            messages: List of conversation messages
+            system_msgs: Optional system messages to prepend
+            temperature (float): Sampling temperature for the response
+
+        Yields:
+            str: Content deltas in arrival order
+
+        Raises:
+            TokenLimitExceeded: If token limits are exceeded
+            OpenAIError: If the API call fails
+        """
+        messages, input_tokens = self._prepare_messages(messages, system_msgs)
+        params = self._completion_params(messages, temperature)
+        async for delta in self._stream_text(params, input_tokens):
+            yield delta
+
+    async def ask_tool_stream(
+        self,
+        messages: List[Union[dict, Message]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        timeout: int = 300,
+        tools: Optional[List[dict]] = None,
+        tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
+        temperature: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Ask LLM using functions/tools and yield the response as it is generated.
+
+        Content arrives as ``StreamDelta.content`` and tool calls as
+        ``tool_call_index``/``tool_name``/``arguments`` fragments. The last delta
+        carries the ``finish_reason`` and the assembled ``ChatCompletionMessage``.
+
+        Args:
+            messages: List of conversation messages
+            system_msgs: Optional system messages to prepend
+            timeout: Request timeout in seconds
+            tools: List of tools to use
+            tool_choice: Tool choice strategy
+            temperature: Sampling temperature for the response
+            **kwargs: Additional completion arguments
+
+        Raises:
+            TokenLimitExceeded: If token limits are exceeded
+            ValueError: If tools or tool_choice are invalid
+            OpenAIError: If the API call fails
+        """
+        params, input_tokens = self._tool_params(
+            messages, system_msgs, timeout, tools, tool_choice, temperature, kwargs
+        )
+
+        if isinstance(self.client, BedrockClient):
+            # The Bedrock adapter has no incremental tool-call events
+            params["stream"] = False
+            message = await self._create_tool_completion(params, input_tokens)
+            if message and message.content:
+                yield StreamDelta(content=message.content)
+            for index, tool_call in enumerate(
+                (message.tool_calls if message else None) or []
+            ):
+                yield StreamDelta(
+                    tool_call_index=index,
+                    tool_call_id=tool_call.id,
+                    tool_name=tool_call.function.name,
+                    arguments=tool_call.function.arguments,
+                )
+            yield StreamDelta(finish_reason="stop", message=message)
+            return
+
+        self.update_token_count(input_tokens)
+        content_parts: List[str] = []
+        tool_calls: Dict[int, dict] = {}
+        finish_reason = None
+        async with self._rate_limited(input_tokens):
+            params["stream"] = True
+            response = await self.client.chat.completions.create(**params)
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = getattr(choice, "finish_reason", None) or finish_reason
+                delta = choice.delta
+
+                content = getattr(delta, "content", None)
+                if content:
+                    content_parts.append(content)
+                    yield StreamDelta(content=content)
+
+                for call_delta in getattr(delta, "tool_calls", None) or []:
+                    function = getattr(call_delta, "function", None)
+                    name = getattr(function, "name", None)
+                    arguments = getattr(function, "arguments", None)
+                    call = tool_calls.setdefault(
+                        call_delta.index, {"id": None, "name": "", "arguments": ""}
+                    )
+                    call["id"] = getattr(call_delta, "id", None) or call["id"]
+                    call["name"] += name or ""
+                    call["arguments"] += arguments or ""
+                    yield StreamDelta(
+                        tool_call_index=call_delta.index,
+                        tool_call_id=getattr(call_delta, "id", None),
+                        tool_name=name,
+                        arguments=arguments,
+                    )
+
+        message = ChatCompletionMessage.model_validate(
+            {
+                "role": "assistant",
+                "content": "".join(content_parts) or None,
+                "tool_calls": [
+                    {
+                        "id": call["id"],
+                        "type": "function",
+                        "function": {
+                            "name": call["name"],
+                            "arguments": call["arguments"],
+                        },
+                    }
+                    for _, call in sorted(tool_calls.items())
+                ]
+                or None,
+            }
+        )
+
+        completion_tokens = self.count_tokens("".join(content_parts))
+        completion_tokens += sum(
+            self.count_tokens(call["name"]) + self.count_tokens(call["arguments"])
+            for call in tool_calls.values()
+        )
+        self.total_completion_tokens += completion_tokens
+        self.rate_limiter.record_usage(completion_tokens)
+
+        yield StreamDelta(finish_reason=finish_reason or "stop", message=message)
+
     @retry(
         wait=wait_random_exponential(min=1, max=60),
         stop=stop_after_attempt(6),
@@ -375,6 +771,7 @@ class LLM:
         system_msgs: Optional[List[Union[dict, Message]]] = None,
         stream: bool = True,
         temperature: Optional[float] = None,
+        use_cache: bool = False,
     ) -> str:
         """
         Send a prompt to the LLM and get the response.
@@ -384,6 +781,8 @@ class LLM:
             system_msgs: Optional system messages to prepend
             stream (bool): Whether to stream the response
             temperature (float): Sampling temperature for the response
+            use_cache (bool): Serve identical requests from the response cache
+                (if enabled); cached requests are never streamed
 
         Returns:
             str: The generated response
@@ -395,65 +794,24 @@ class LLM:
             Exception: For unexpected errors
         """
         try:
-            # Check if the model supports images
-            supports_images = self.model in MULTIMODAL_MODELS
-
-            # Format system and user messages with image support check
-            if system_msgs:
-                system_msgs = self.format_messages(system_msgs, supports_images)
-                messages = system_msgs + self.format_messages(messages, supports_images)
-            else:
-                messages = self.format_messages(messages, supports_images)
-
-            # Calculate input token count
-            input_tokens = self.count_message_tokens(messages)
-
-            # Check if token limits are exceeded
-            if not self.check_token_limit(input_tokens):
-                error_message = self.get_limit_error_message(input_tokens)
-                # Raise a special exception that won't be retried
-                raise TokenLimitExceeded(error_message)
-
-            params = {
-                "model": self.model,
-                "messages": messages,
-            }
-
-            if self.model in REASONING_MODELS:
-                params["max_completion_tokens"] = self.max_tokens
-            else:
-                params["max_tokens"] = self.max_tokens
-                params["temperature"] = (
-                    temperature if temperature is not None else self.temperature
+            # Raises TokenLimitExceeded, which is not retried
+            messages, input_tokens = self._prepare_messages(messages, system_msgs)
+            params = self._completion_params(messages, temperature)
+
+            if use_cache and self.response_cache is not None:
+                return await self.response_cache.get_or_create(
+                    self._response_cache_key(params),
+                    lambda: self._create_text_completion(params, input_tokens),
                 )
 
             if not stream:
                 # Non-streaming request
-                response = await self.client.chat.completions.create(
-                    **params, stream=False
-                )
-
-                if not response.choices or not response.choices[0].message.content:
-                    raise ValueError("Empty or invalid response from LLM")
-
-                # Update token counts
-                self.update_token_count(
-                    response.usage.prompt_tokens, response.usage.completion_tokens
-                )
-
-                return response.choices[0].message.content
-
-            # Streaming request, For streaming, update estimated token count before making the request
-            self.update_token_count(input_tokens)
-
-            response = await self.client.chat.completions.create(**params, stream=True)
+                return await self._create_text_completion(params, input_tokens)
 
+            # Streaming request
             collected_messages = []
-            completion_text = ""
-            async for chunk in response:
-                chunk_message = chunk.choices[0].delta.content or ""
+            async for chunk_message in self._stream_text(params, input_tokens):
                 collected_messages.append(chunk_message)
-                completion_text += chunk_message
                 print(chunk_message, end="", flush=True)
 
             print()  # Newline after streaming
@@ -461,13 +819,6 @@ class LLM:
             if not full_response:
                 raise ValueError("Empty response from streaming LLM")
 
-            # estimate completion tokens for streaming response
-            completion_tokens = self.count_tokens(completion_text)
-            logger.info(
-                f"Estimated completion tokens for streaming response: {completion_tokens}"
-            )
-            self.total_completion_tokens += completion_tokens
-
             return full_response
 
         except TokenLimitExceeded:
@@ -585,39 +936,33 @@ class LLM:
 
             # Set up API parameters
             params = {
-                "model": self.model,
-                "messages": all_messages,
+                **self._completion_params(all_messages, temperature),
                 "stream": stream,
             }
 
-            # Add model-specific parameters
-            if self.model in REASONING_MODELS:
-                params["max_completion_tokens"] = self.max_tokens
-            else:
-                params["max_tokens"] = self.max_tokens
-                params["temperature"] = (
-                    temperature if temperature is not None else self.temperature
-                )
-
             # Handle non-streaming request
             if not stream:
-                response = await self.client.chat.completions.create(**params)
+                async with self._rate_limited(input_tokens):
+                    response = await self.client.chat.completions.create(**params)
 
                 if not response.choices or not response.choices[0].message.content:
                     raise ValueError("Empty or invalid response from LLM")
 
                 self.update_token_count(response.usage.prompt_tokens)
+                self.rate_limiter.record_usage(response.usage.completion_tokens)
                 return response.choices[0].message.content
 
             # Handle streaming request
             self.update_token_count(input_tokens)
-            response = await self.client.chat.completions.create(**params)
 
             collected_messages = []
-            async for chunk in response:
-                chunk_message = chunk.choices[0].delta.content or ""
-                collected_messages.append(chunk_message)
-                print(chunk_message, end="", flush=True)
+            async with self._rate_limited(input_tokens):
+                response = await self.client.chat.completions.create(**params)
+
+                async for chunk in response:
+                    chunk_message = chunk.choices[0].delta.content or ""
+                    collected_messages.append(chunk_message)
+                    print(chunk_message, end="", flush=True)
 
             print()  # Newline after streaming
             full_response = "".join(collected_messages).strip()
@@ -660,6 +1005,7 @@ class LLM:
         tools: Optional[List[dict]] = None,
         tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
         temperature: Optional[float] = None,
+        use_cache: bool = False,
         **kwargs,
     ) -> ChatCompletionMessage | None:
         """
@@ -672,6 +1018,7 @@ class LLM:
             tools: List of tools to use
             tool_choice: Tool choice strategy
             temperature: Sampling temperature for the response
+            use_cache: Serve identical requests from the response cache (if enabled)
             **kwargs: Additional completion arguments
 
         Returns:
@@ -684,78 +1031,24 @@ class LLM:
             Exception: For unexpected errors
         """
         try:
-            # Validate tool_choice
-            if tool_choice not in TOOL_CHOICE_VALUES:
-                raise ValueError(f"Invalid tool_choice: {tool_choice}")
-
-            # Check if the model supports images
-            supports_images = self.model in MULTIMODAL_MODELS
-
-            # Format messages
-            if system_msgs:
-                system_msgs = self.format_messages(system_msgs, supports_images)
-                messages = system_msgs + self.format_messages(messages, supports_images)
-            else:
-                messages = self.format_messages(messages, supports_images)
-
-            # Calculate input token count
-            input_tokens = self.count_message_tokens(messages)
-
-            # If there are tools, calculate token count for tool descriptions
-            tools_tokens = 0
-            if tools:
-                for tool in tools:
-                    tools_tokens += self.count_tokens(str(tool))
-
-            input_tokens += tools_tokens
-
-            # Check if token limits are exceeded
-            if not self.check_token_limit(input_tokens):
-                error_message = self.get_limit_error_message(input_tokens)
-                # Raise a special exception that won't be retried
-                raise TokenLimitExceeded(error_message)
+            # Raises TokenLimitExceeded, which is not retried
+            params, input_tokens = self._tool_params(
+                messages, system_msgs, timeout, tools, tool_choice, temperature, kwargs
+            )
+            params["stream"] = False  # Always use non-streaming for tool requests
 
-            # Validate tools if provided
-            if tools:
-                for tool in tools:
-                    if not isinstance(tool, dict) or "type" not in tool:
-                        raise ValueError("Each tool must be a dict with 'type' field")
+            if use_cache and self.response_cache is not None:
 
-            # Set up the completion request
-            params = {
-                "model": self.model,
-                "messages": messages,
-                "tools": tools,
-                "tool_choice": tool_choice,
-                "timeout": timeout,
-                **kwargs,
-            }
+                async def fetch() -> Optional[dict]:
+                    message = await self._create_tool_completion(params, input_tokens)
+                    return self._dump_completion_message(message) if message else None
 
-            if self.model in REASONING_MODELS:
-                params["max_completion_tokens"] = self.max_tokens
-            else:
-                params["max_tokens"] = self.max_tokens
-                params["temperature"] = (
-                    temperature if temperature is not None else self.temperature
+                cached = await self.response_cache.get_or_create(
+                    self._response_cache_key(params), fetch
                 )
+                return ChatCompletionMessage.model_validate(cached) if cached else None
 
-            params["stream"] = False  # Always use non-streaming for tool requests
-            response: ChatCompletion = await self.client.chat.completions.create(
-                **params
-            )
-
-            # Check if response is valid
-            if not response.choices or not response.choices[0].message:
-                print(response)
-                # raise ValueError("Invalid or empty response from LLM")
-                return None
-
-            # Update token counts
-            self.update_token_count(
-                response.usage.prompt_tokens, response.usage.completion_tokens
-            )
-
-            return response.choices[0].message
+            return await self._create_tool_completion(params, input_tokens)
 
         except TokenLimitExceeded:
             # Re-raise token limit errors without logging
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.logger import logger
+
+
+class TokenBucket:
+    """Reservation-based token bucket refilled continuously at a fixed rate.
+
+    Callers reserve capacity up front and are told how long to wait before using
+    it, so concurrent callers queue in reservation order. Only a thread lock is
+    held while reserving, which keeps the bucket usable from any event loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # refill per second
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take capacity from the bucket and return the seconds to wait before use"""
+        with self._lock:
+            self._refill()
+            # A single request larger than the bucket must still be able to run
+            self._level -= min(amount, self.capacity)
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Charge (or refund, if negative) capacity without waiting"""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+
+    def drain(self) -> None:
+        """Empty the bucket, keeping any debt, so new reservations wait for refill
+
+        Unlike a fresh bucket, no burst capacity is left: each new reservation
+        waits until its own amount has refilled after those already queued.
+        """
+        with self._lock:
+            self._refill()
+            self._level = min(self._level, 0.0)
+
+
+class RateLimiter:
+    """Client-side request, token and concurrency governor for one LLM config.
+
+    Calls are queued before they reach the provider instead of relying on
+    retries after a rate limit error has already happened.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrent_requests: Optional[int] = None,
+    ):
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self.max_concurrent_requests = max_concurrent_requests
+        # asyncio semaphores are bound to the loop they are first used on
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        self.total_requests = 0
+        self.throttled_requests = 0
+        self.total_wait_seconds = 0.0
+
+    def _get_semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.max_concurrent_requests:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until the request and its input tokens fit within the limits"""
+        self.total_requests += 1
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket and tokens:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+
+        if wait > 0:
+            self.throttled_requests += 1
+            self.total_wait_seconds += wait
+            logger.debug(f"Rate limiter delaying request by {wait:.2f}s")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # The request will never be sent; return its reservation
+                if self.request_bucket:
+                    self.request_bucket.consume(-1)
+                if self.token_bucket and tokens:
+                    self.token_bucket.consume(-tokens)
+                raise
+
+    @asynccontextmanager
+    async def limit(self, tokens: int = 0):
+        """Hold a rate-limited slot for the duration of one provider call"""
+        await self.acquire(tokens)
+        semaphore = self._get_semaphore()
+        if semaphore is None:
+            yield
+            return
+        async with semaphore:
+            yield
+
+    def record_usage(self, tokens: int) -> None:
+        """Charge tokens learned after the call, e.g. the completion tokens"""
+        if self.token_bucket and tokens:
+            self.token_bucket.consume(tokens)
+
+    def on_rate_limited(self) -> None:
+        """Back off every queued caller after the provider reports a rate limit"""
+        for bucket in (self.request_bucket, self.token_bucket):
+            if bucket:
+                bucket.drain()
+
+    def get_stats(self) -> dict:
+        return {
+            "total_requests": self.total_requests,
+            "throttled_requests": self.throttled_requests,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+        }
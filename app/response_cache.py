@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from app.config import PROJECT_ROOT, ResponseCacheSettings
+from app.logger import logger
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Waiters receive the error; don't warn if nobody was waiting
+    if not task.cancelled():
+        task.exception()
+
+
+class SQLiteResponseStore:
+    """On-disk store for cached responses, shareable across runs and processes"""
+
+    def __init__(self, path: Path, max_entries: int, table: str = "responses"):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per call keeps the store safe to use from threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now),
+            )
+            conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            # Evict least recently used rows beyond the size bound
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+class ResponseCache:
+    """Response cache with LRU+TTL eviction and in-flight deduplication.
+
+    Values must be JSON-serializable. Concurrent requests for the same key share
+    a single upstream call instead of each reaching the provider. Caches stored
+    in the same SQLite file must use different tables.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_entries: int = 1024,
+        path: Optional[Path] = None,
+        table: str = "responses",
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.store = SQLiteResponseStore(path, max_entries, table) if path else None
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_settings(cls, settings: ResponseCacheSettings) -> "ResponseCache":
+        path = None
+        if settings.path:
+            path = Path(settings.path)
+            if not path.is_absolute():
+                path = PROJECT_ROOT / path
+        return cls(ttl=settings.ttl, max_entries=settings.max_entries, path=path)
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Canonical hash of the request parameters that determine the response"""
+        canonical = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _get_memory(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.time() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._get_memory(key)
+        if value is None and self.store is not None:
+            try:
+                value = await asyncio.to_thread(self.store.get, key)
+            except sqlite3.Error as e:
+                # e.g. "database is locked" with other processes sharing the file
+                logger.warning(
+                    f"Failed to read cached response from {self.store.table}: {e}"
+                )
+                return None
+            if value is not None:
+                self._set_memory(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._set_memory(key, value)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.set, key, value, self.ttl)
+            except sqlite3.Error as e:
+                logger.warning(
+                    f"Failed to persist cached response in {self.store.table}: {e}"
+                )
+
+    async def get_or_create(
+        self, key: str, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, calling factory at most once per key"""
+        value = await self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        loop = asyncio.get_running_loop()
+        pending = self._in_flight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        # The factory runs in its own task, so cancelling the caller that started
+        # it does not cancel the callers waiting on the same key
+        task = loop.create_task(self._create(key, factory))
+        task.add_done_callback(_retrieve_exception)
+        self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await factory()
+            if value is not None:
+                await self.set(key, value)
+            return value
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+
+    def get_stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._entries),
+        }
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Protocol
+from typing import Dict, List, Optional, Protocol, Tuple
 
 from app.config import SandboxSettings
 from app.sandbox.core.sandbox import DockerSandbox
@@ -46,6 +46,52 @@ class SandboxFileOperations(Protocol):
         """
         ...
 
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads several files from container in one round-trip.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            Dict[str, str]: File contents keyed by path.
+        """
+        ...
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to container in one round-trip.
+
+        Args:
+            files: Contents keyed by file path in container.
+        """
+        ...
+
+    async def stat_many(self, paths: List[str]) -> Dict[str, Dict[str, bool]]:
+        """Checks whether paths exist and are directories.
+
+        Args:
+            paths: Paths in container.
+
+        Returns:
+            Dict[str, Dict[str, bool]]: ``exists``/``is_dir`` flags keyed by path.
+        """
+        ...
+
+    async def read_lines(
+        self, path: str, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Reads a range of lines from a file in container.
+
+        Args:
+            path: File path in container.
+            start: First line, starting at 1.
+            end: Last line, inclusive, or -1 for the end of the file.
+            max_bytes: Maximum bytes of the range to read.
+
+        Returns:
+            Tuple[str, int]: The lines, and the number of lines in the file.
+        """
+        ...
+
 
 class BaseSandboxClient(ABC):
     """Base sandbox client interface."""
@@ -78,6 +124,24 @@ class BaseSandboxClient(ABC):
     async def write_file(self, path: str, content: str) -> None:
         """Writes file."""
 
+    @abstractmethod
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads files in one batch."""
+
+    @abstractmethod
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes files in one batch."""
+
+    @abstractmethod
+    async def stat_many(self, paths: List[str]) -> Dict[str, Dict[str, bool]]:
+        """Checks existence and type of paths in one batch."""
+
+    @abstractmethod
+    async def read_lines(
+        self, path: str, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Reads a range of lines."""
+
     @abstractmethod
     async def cleanup(self) -> None:
         """Cleans up resources."""
@@ -182,6 +246,72 @@ class LocalSandboxClient(BaseSandboxClient):
             raise RuntimeError("Sandbox not initialized")
         await self.sandbox.write_file(path, content)
 
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads several files from container with a single archive.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            File contents keyed by path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        return await self.sandbox.read_files(paths)
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to container with a single archive.
+
+        Args:
+            files: Contents keyed by file path in container.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        await self.sandbox.write_files(files)
+
+    async def stat_many(self, paths: List[str]) -> Dict[str, Dict[str, bool]]:
+        """Checks existence and type of several paths with one command.
+
+        Args:
+            paths: Paths in container.
+
+        Returns:
+            ``exists``/``is_dir`` flags keyed by path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        return await self.sandbox.stat_many(paths)
+
+    async def read_lines(
+        self, path: str, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Reads a range of lines using the sandbox's line offset index.
+
+        Args:
+            path: File path in container.
+            start: First line, starting at 1.
+            end: Last line, inclusive, or -1 for the end of the file.
+            max_bytes: Maximum bytes of the range to read.
+
+        Returns:
+            The lines, and the number of lines in the file.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        return await self.sandbox.read_lines(path, start, end, max_bytes)
+
     async def cleanup(self) -> None:
         """Cleans up resources."""
         if self.sandbox:
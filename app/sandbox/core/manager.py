@@ -1,7 +1,8 @@
 import asyncio
 import uuid
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import Dict, Optional, Set
+from typing import Callable, Deque, Dict, List, Optional, Set
 
 import docker
 from docker.errors import APIError, ImageNotFound
@@ -18,12 +19,20 @@ class SandboxManager:
     monitoring, and cleanup. Provides concurrent access control and automatic
     cleanup mechanisms for sandbox resources.
 
+    Optionally keeps a warm pool of started containers per sandbox
+    configuration. Sandboxes handed out from the pool skip container creation,
+    and released sandboxes are reset and returned to the pool instead of being
+    destroyed.
+
     Attributes:
         max_sandboxes: Maximum allowed number of sandboxes.
         idle_timeout: Sandbox idle timeout in seconds.
         cleanup_interval: Cleanup check interval in seconds.
+        min_idle: Warm sandboxes kept ready per configuration.
+        max_idle: Maximum warm sandboxes kept per configuration.
         _sandboxes: Active sandbox instance mapping.
         _last_used: Last used time record for sandboxes.
+        _idle: Warm sandboxes per configuration key.
     """
 
     def __init__(
@@ -31,6 +40,10 @@ class SandboxManager:
         max_sandboxes: int = 100,
         idle_timeout: int = 3600,
         cleanup_interval: int = 300,
+        min_idle: int = 0,
+        max_idle: int = 0,
+        client: Optional[docker.DockerClient] = None,
+        sandbox_factory: Callable[..., DockerSandbox] = DockerSandbox,
     ):
         """Initializes sandbox manager.
 
@@ -38,18 +51,38 @@ class SandboxManager:
             max_sandboxes: Maximum sandbox count limit.
             idle_timeout: Idle timeout in seconds.
             cleanup_interval: Cleanup check interval in seconds.
+            min_idle: Warm sandboxes to keep ready per configuration.
+            max_idle: Maximum warm sandboxes per configuration; 0 disables
+                the pool unless min_idle is set.
+            client: Docker client. Created from the environment if None.
+            sandbox_factory: Creates a sandbox from (config, volume_bindings).
         """
         self.max_sandboxes = max_sandboxes
         self.idle_timeout = idle_timeout
         self.cleanup_interval = cleanup_interval
+        self.min_idle = min_idle
+        self.max_idle = max(max_idle, min_idle)
 
         # Docker client
-        self._client = docker.from_env()
+        self._client = client or docker.from_env()
+        self._sandbox_factory = sandbox_factory
 
         # Resource mappings
         self._sandboxes: Dict[str, DockerSandbox] = {}
         self._last_used: Dict[str, float] = {}
 
+        # Warm pool, keyed by serialized sandbox configuration
+        self._idle: Dict[str, List[DockerSandbox]] = {}
+        self._pool_configs: Dict[str, SandboxSettings] = {}
+        self._pool_keys: Dict[str, str] = {}
+        self._replenish_tasks: Dict[str, asyncio.Task] = {}
+        self._warming: Dict[str, int] = {}
+
+        # Pool statistics
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._acquire_latencies: Deque[float] = deque(maxlen=1000)
+
         # Concurrency control
         self._locks: Dict[str, asyncio.Lock] = {}
         self._global_lock = asyncio.Lock()
@@ -118,6 +151,9 @@ class SandboxManager:
     ) -> str:
         """Creates a new sandbox instance.
 
+        A warm sandbox for the same configuration is used when available.
+        Sandboxes with volume bindings are always created fresh.
+
         Args:
             config: Sandbox configuration.
             volume_bindings: Volume mapping configuration.
@@ -128,6 +164,7 @@ class SandboxManager:
         Raises:
             RuntimeError: If max sandbox count reached or creation fails.
         """
+        started = asyncio.get_event_loop().time()
         async with self._global_lock:
             if len(self._sandboxes) >= self.max_sandboxes:
                 raise RuntimeError(
@@ -135,18 +172,40 @@ class SandboxManager:
                 )
 
             config = config or SandboxSettings()
-            if not await self.ensure_image(config.image):
-                raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
+            pool_key = (
+                self._pool_key(config)
+                if self.max_idle > 0 and not volume_bindings
+                else None
+            )
+
+            sandbox = None
+            if pool_key and self._idle.get(pool_key):
+                sandbox = self._idle[pool_key].pop()
+                self._pool_hits += 1
+            else:
+                if self.max_idle > 0:
+                    # Only acquisitions the warm pool could have served count
+                    self._pool_misses += 1
+                if not await self.ensure_image(config.image):
+                    raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
 
             sandbox_id = str(uuid.uuid4())
             try:
-                sandbox = DockerSandbox(config, volume_bindings)
-                await sandbox.create()
+                if sandbox is None:
+                    sandbox = self._sandbox_factory(config, volume_bindings)
+                    await sandbox.create()
 
                 self._sandboxes[sandbox_id] = sandbox
                 self._last_used[sandbox_id] = asyncio.get_event_loop().time()
                 self._locks[sandbox_id] = asyncio.Lock()
+                if pool_key:
+                    self._pool_keys[sandbox_id] = pool_key
+                    self._pool_configs[pool_key] = config
+                    self._schedule_replenish(pool_key)
 
+                self._acquire_latencies.append(
+                    asyncio.get_event_loop().time() - started
+                )
                 logger.info(f"Created sandbox {sandbox_id}")
                 return sandbox_id
 
@@ -156,6 +215,65 @@ class SandboxManager:
                     await self.delete_sandbox(sandbox_id)
                 raise RuntimeError(f"Failed to create sandbox: {e}")
 
+    @staticmethod
+    def _pool_key(config: SandboxSettings) -> str:
+        return config.model_dump_json()
+
+    async def prewarm(self, config: Optional[SandboxSettings] = None) -> None:
+        """Fills the warm pool for a configuration up to min_idle.
+
+        Args:
+            config: Sandbox configuration. Default configuration used if None.
+        """
+        config = config or SandboxSettings()
+        pool_key = self._pool_key(config)
+        self._pool_configs[pool_key] = config
+        await self._replenish(pool_key)
+
+    def _schedule_replenish(self, pool_key: str) -> None:
+        """Starts topping up a warm pool in the background if needed."""
+        task = self._replenish_tasks.get(pool_key)
+        if task and not task.done():
+            return
+        if len(self._idle.get(pool_key, [])) < self.min_idle:
+            self._replenish_tasks[pool_key] = asyncio.create_task(
+                self._replenish(pool_key)
+            )
+
+    async def _replenish(self, pool_key: str) -> None:
+        """Creates warm sandboxes until the pool reaches min_idle."""
+        config = self._pool_configs[pool_key]
+        idle = self._idle.setdefault(pool_key, [])
+        while (
+            not self._is_shutting_down
+            and len(idle) + self._warming.get(pool_key, 0) < self.min_idle
+            and self._total_sandboxes() < self.max_sandboxes
+        ):
+            self._warming[pool_key] = self._warming.get(pool_key, 0) + 1
+            try:
+                if not await self.ensure_image(config.image):
+                    return
+                sandbox = self._sandbox_factory(config, None)
+                await sandbox.create()
+            except Exception as e:
+                logger.error(f"Failed to pre-warm sandbox: {e}")
+                return
+            finally:
+                self._warming[pool_key] -= 1
+
+            if self._is_shutting_down:
+                await sandbox.cleanup()
+                return
+            idle.append(sandbox)
+
+    def _total_sandboxes(self) -> int:
+        """Counts active, warm and warming sandboxes."""
+        return (
+            len(self._sandboxes)
+            + sum(len(idle) for idle in self._idle.values())
+            + sum(self._warming.values())
+        )
+
     async def get_sandbox(self, sandbox_id: str) -> DockerSandbox:
         """Gets a sandbox instance.
 
@@ -185,7 +303,7 @@ class SandboxManager:
         self._cleanup_task = asyncio.create_task(cleanup_loop())
 
     async def _cleanup_idle_sandboxes(self) -> None:
-        """Cleans up idle sandboxes."""
+        """Cleans up idle sandboxes, recycling them into the warm pool."""
         current_time = asyncio.get_event_loop().time()
         to_cleanup = []
 
@@ -199,7 +317,7 @@ class SandboxManager:
 
         for sandbox_id in to_cleanup:
             try:
-                await self.delete_sandbox(sandbox_id)
+                await self.release_sandbox(sandbox_id)
             except Exception as e:
                 logger.error(f"Error cleaning up sandbox {sandbox_id}: {e}")
 
@@ -216,6 +334,16 @@ class SandboxManager:
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
 
+        # Stop filling warm pools, then destroy the warm sandboxes
+        for task in self._replenish_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._replenish_tasks.values(), return_exceptions=True)
+        idle_sandboxes = [sandbox for idle in self._idle.values() for sandbox in idle]
+        self._idle.clear()
+        await asyncio.gather(
+            *(sandbox.cleanup() for sandbox in idle_sandboxes), return_exceptions=True
+        )
+
         # Get all sandbox IDs to clean up
         async with self._global_lock:
             sandbox_ids = list(self._sandboxes.keys())
@@ -238,6 +366,8 @@ class SandboxManager:
         self._last_used.clear()
         self._locks.clear()
         self._active_operations.clear()
+        self._pool_keys.clear()
+        self._replenish_tasks.clear()
 
         logger.info("Manager cleanup completed")
 
@@ -271,6 +401,7 @@ class SandboxManager:
                     self._sandboxes.pop(sandbox_id, None)
                     self._last_used.pop(sandbox_id, None)
                     self._locks.pop(sandbox_id, None)
+                    self._pool_keys.pop(sandbox_id, None)
                     logger.info(f"Deleted sandbox {sandbox_id}")
         except Exception as e:
             logger.error(f"Error during cleanup of sandbox {sandbox_id}: {e}")
@@ -289,6 +420,51 @@ class SandboxManager:
         except Exception as e:
             logger.error(f"Failed to delete sandbox {sandbox_id}: {e}")
 
+    async def release_sandbox(self, sandbox_id: str) -> None:
+        """Returns a sandbox to the warm pool, deleting it if it can't be reused.
+
+        The sandbox is reset (processes killed, working directory wiped) before
+        it is handed out again.
+
+        Args:
+            sandbox_id: Sandbox ID.
+        """
+        pool_key = self._pool_keys.get(sandbox_id)
+        if (
+            pool_key is None
+            or self._is_shutting_down
+            or len(self._idle.get(pool_key, [])) >= self.max_idle
+        ):
+            await self.delete_sandbox(sandbox_id)
+            return
+
+        lock = self._locks.get(sandbox_id)
+        if lock is None:
+            return
+        # Wait for in-flight operations before taking the sandbox out of service
+        async with lock:
+            async with self._global_lock:
+                sandbox = self._sandboxes.pop(sandbox_id, None)
+                self._last_used.pop(sandbox_id, None)
+                self._locks.pop(sandbox_id, None)
+                self._pool_keys.pop(sandbox_id, None)
+        if sandbox is None:
+            return
+
+        try:
+            await sandbox.reset()
+        except Exception as e:
+            logger.error(f"Failed to reset sandbox {sandbox_id}, deleting it: {e}")
+            await sandbox.cleanup()
+            return
+
+        idle = self._idle.setdefault(pool_key, [])
+        if self._is_shutting_down or len(idle) >= self.max_idle:
+            await sandbox.cleanup()
+        else:
+            idle.append(sandbox)
+            logger.info(f"Returned sandbox {sandbox_id} to the warm pool")
+
     async def __aenter__(self) -> "SandboxManager":
         """Async context manager entry."""
         return self
@@ -303,6 +479,8 @@ class SandboxManager:
         Returns:
             Dict: Statistics information.
         """
+        acquisitions = self._pool_hits + self._pool_misses
+        latencies = sorted(self._acquire_latencies)
         return {
             "total_sandboxes": len(self._sandboxes),
             "active_operations": len(self._active_operations),
@@ -310,4 +488,16 @@ class SandboxManager:
             "idle_timeout": self.idle_timeout,
             "cleanup_interval": self.cleanup_interval,
             "is_shutting_down": self._is_shutting_down,
+            "warm_sandboxes": sum(len(idle) for idle in self._idle.values()),
+            "min_idle": self.min_idle,
+            "max_idle": self.max_idle,
+            "pool_hits": self._pool_hits,
+            "pool_misses": self._pool_misses,
+            "pool_hit_rate": self._pool_hits / acquisitions if acquisitions else 0.0,
+            "acquire_latency_avg": (
+                sum(latencies) / len(latencies) if latencies else 0.0
+            ),
+            "acquire_latency_p95": (
+                latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+            ),
         }
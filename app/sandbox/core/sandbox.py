@@ -1,10 +1,13 @@
 import asyncio
+import codecs
 import io
 import os
+import shlex
+import shutil
 import tarfile
 import tempfile
 import uuid
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import docker
 from docker.errors import NotFound
@@ -15,6 +18,48 @@ from app.sandbox.core.exceptions import SandboxTimeoutError
 from app.sandbox.core.terminal import AsyncDockerizedTerminal
 
 
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks.
+
+    Lets tarfile consume a Docker archive stream as it is downloaded.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+_STAT_SCRIPT = "stat -c '%i %Y %s' \"$1\" || exit 2"
+
+# Prints the byte offset of every step-th line, then the line and byte totals
+_LINE_INDEX_SCRIPT = (
+    _STAT_SCRIPT
+    + '\nLC_ALL=C awk -v step="$2" \'(NR - 1) % step == 0 { print offset + 0 }'
+    + ' { offset += length($0) + 1 } END { print "end", NR, offset + 0 }\' "$1"'
+)
+
+# Prints the lines selected by a sed program, starting from a byte offset
+_READ_LINES_SCRIPT = (
+    _STAT_SCRIPT
+    + '\ntail -c +"$2" "$1" | sed -n "$3"'
+    + ' | if [ -n "$4" ]; then head -c "$4"; else cat; fi'
+)
+
+
 class DockerSandbox:
     """Docker sandbox environment.
 
@@ -45,6 +90,8 @@ class DockerSandbox:
         self.client = docker.from_env()
         self.container: Optional[Container] = None
         self.terminal: Optional[AsyncDockerizedTerminal] = None
+        # Line offset indexes for read_lines: path -> (stat, checkpoints, lines)
+        self._line_indexes: Dict[str, Tuple[str, List[int], int]] = {}
 
     async def create(self) -> "DockerSandbox":
         """Creates and starts the sandbox container.
@@ -187,7 +234,7 @@ class DockerSandbox:
             )
 
             # Read file content from tar stream
-            content = await self._read_from_tar(tar_stream)
+            content = await asyncio.to_thread(self._read_from_tar, tar_stream)
             return content.decode("utf-8")
 
         except NotFound:
@@ -229,6 +276,232 @@ class DockerSandbox:
         except Exception as e:
             raise RuntimeError(f"Failed to write file: {e}")
 
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads several files from the container in a single round-trip.
+
+        Args:
+            paths: File paths.
+
+        Returns:
+            Mapping of each requested path to its contents.
+
+        Raises:
+            FileNotFoundError: If any file does not exist.
+            RuntimeError: If read operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+        if not paths:
+            return {}
+
+        try:
+            names = {
+                path: os.path.normpath(self._safe_resolve_path(path)).lstrip("/")
+                for path in paths
+            }
+            # One tar of all files; -h archives symlink targets like get_archive
+            _, (stdout, _) = await asyncio.to_thread(
+                self.container.exec_run,
+                ["tar", "-chf", "-", "-C", "/", "--", *set(names.values())],
+                demux=True,
+            )
+            contents = (
+                await asyncio.to_thread(
+                    self._read_members_from_tar, [stdout], set(names.values())
+                )
+                if stdout
+                else {}
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to read files: {e}")
+
+        missing = [path for path, name in names.items() if name not in contents]
+        if missing:
+            raise FileNotFoundError(f"Files not found: {', '.join(missing)}")
+        try:
+            return {
+                path: contents[name].decode("utf-8") for path, name in names.items()
+            }
+        except UnicodeDecodeError as e:
+            raise RuntimeError(f"Failed to read files: {e}")
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to the container in a single archive upload.
+
+        Args:
+            files: Mapping of target path to file content.
+
+        Raises:
+            RuntimeError: If write operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+        if not files:
+            return
+
+        try:
+            resolved = {
+                os.path.normpath(self._safe_resolve_path(path)): content.encode("utf-8")
+                for path, content in files.items()
+            }
+
+            # Create all parent directories at once
+            parent_dirs = {os.path.dirname(path) for path in resolved} - {"", "/"}
+            if parent_dirs:
+                await self.run_command(
+                    "mkdir -p " + " ".join(shlex.quote(d) for d in sorted(parent_dirs))
+                )
+
+            tar_stream = await asyncio.to_thread(
+                self._create_tar_archive,
+                {path.lstrip("/"): content for path, content in resolved.items()},
+            )
+            await asyncio.to_thread(self.container.put_archive, "/", tar_stream)
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to write files: {e}")
+
+    async def stat_many(self, paths: List[str]) -> Dict[str, Dict[str, bool]]:
+        """Checks the existence and type of several paths in one command.
+
+        Args:
+            paths: Paths to check.
+
+        Returns:
+            Mapping of each path to its ``exists`` and ``is_dir`` flags.
+
+        Raises:
+            RuntimeError: If the check fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+        if not paths:
+            return {}
+
+        script = (
+            'for p do if [ -d "$p" ]; then echo d; '
+            'elif [ -e "$p" ]; then echo f; else echo -; fi; done'
+        )
+        try:
+            resolved = [self._safe_resolve_path(path) for path in paths]
+            exit_code, output = await asyncio.to_thread(
+                self.container.exec_run, ["sh", "-c", script, "sh", *resolved]
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to stat paths: {e}")
+
+        kinds = output.decode("utf-8").split()
+        if exit_code != 0 or len(kinds) != len(paths):
+            raise RuntimeError(f"Failed to stat paths: {output.decode('utf-8')}")
+        return {
+            path: {"exists": kind != "-", "is_dir": kind == "d"}
+            for path, kind in zip(paths, kinds)
+        }
+
+    # Lines between two byte offsets recorded by the line index
+    LINE_INDEX_STEP = 1000
+
+    async def read_lines(
+        self, path: str, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Reads a range of lines without transferring the whole file.
+
+        The first read of a file indexes it with a single awk pass that records
+        the byte offset of every LINE_INDEX_STEP-th line. Each read then seeks
+        to the nearest indexed line with tail and prints the range with sed,
+        so it costs the size of the range rather than of the file. The index is
+        rebuilt when the file's inode, mtime or size changes.
+
+        Args:
+            path: File path.
+            start: First line to read, starting at 1.
+            end: Last line to read, inclusive, or -1 for the end of the file.
+            max_bytes: Stop after reading this many bytes of the range.
+
+        Returns:
+            The lines joined by newlines, and the number of lines in the file as
+            counted by ``str.split("\\n")``.
+
+        Raises:
+            FileNotFoundError: If file does not exist.
+            RuntimeError: If read operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        resolved = self._safe_resolve_path(path)
+        for _ in range(2):
+            index = self._line_indexes.get(resolved)
+            if index is None:
+                index = self._line_indexes[resolved] = await self._index_lines(resolved)
+            stamp, checkpoints, total = index
+
+            last = total if end == -1 else min(end, total)
+            if start > last or not checkpoints:
+                return "", total
+
+            step = min((start - 1) // self.LINE_INDEX_STEP, len(checkpoints) - 1)
+            base = step * self.LINE_INDEX_STEP + 1
+            first, stop = start - base + 1, last - base + 1
+            # Quitting early would also add a newline the last line may not have
+            program = f"{first},{stop}p;{stop}q" if last < total else f"{first},$p"
+            current, output = await self._exec_stat_script(
+                _READ_LINES_SCRIPT,
+                resolved,
+                str(checkpoints[step] + 1),
+                program,
+                str(max_bytes or ""),
+            )
+            if current != stamp:
+                # Changed since it was indexed
+                self._line_indexes.pop(resolved, None)
+                continue
+
+            clipped = max_bytes is not None and len(output) >= max_bytes
+            if not clipped and last < total and output.endswith(b"\n"):
+                output = output[:-1]
+            try:
+                # A clipped range may end inside a multi-byte character
+                return codecs.getincrementaldecoder("utf-8")().decode(output), total
+            except UnicodeDecodeError as e:
+                raise RuntimeError(f"Failed to read lines: {e}")
+
+        raise RuntimeError(f"Failed to read lines: {path} changed while reading")
+
+    async def _index_lines(self, path: str) -> Tuple[str, List[int], int]:
+        """Indexes line offsets of a file with a single awk pass."""
+        stamp, output = await self._exec_stat_script(
+            _LINE_INDEX_SCRIPT, path, str(self.LINE_INDEX_STEP)
+        )
+        fields = output.decode("utf-8").split()
+        records, counted = int(fields[-2]), int(fields[-1])
+        # awk counts a newline after the last line even when the file has none
+        total = records + 1 if counted == int(stamp.split()[2]) else records
+        return stamp, [int(offset) for offset in fields[:-3]], total
+
+    async def _exec_stat_script(
+        self, script: str, path: str, *args: str
+    ) -> Tuple[str, bytes]:
+        """Runs a script that prints the file's stat line before its output."""
+        try:
+            result = await asyncio.to_thread(
+                self.container.exec_run,
+                ["sh", "-c", script, "sh", path, *args],
+                demux=True,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to read lines: {e}")
+
+        stdout, stderr = result.output
+        if result.exit_code == 2:
+            raise FileNotFoundError(f"File not found: {path}")
+        if result.exit_code != 0:
+            raise RuntimeError(
+                f"Failed to read lines: {(stderr or b'').decode('utf-8', 'replace')}"
+            )
+        stamp, _, output = (stdout or b"").partition(b"\n")
+        return stamp.decode("utf-8"), output
+
     def _safe_resolve_path(self, path: str) -> str:
         """Safely resolves container path, preventing path traversal.
 
@@ -275,37 +548,8 @@ class DockerSandbox:
                 self.container.get_archive, resolved_src
             )
 
-            # Create temporary directory to extract file
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                # Write stream to temporary file
-                tar_path = os.path.join(tmp_dir, "temp.tar")
-                with open(tar_path, "wb") as f:
-                    for chunk in stream:
-                        f.write(chunk)
-
-                # Extract file
-                with tarfile.open(tar_path) as tar:
-                    members = tar.getmembers()
-                    if not members:
-                        raise FileNotFoundError(f"Source file is empty: {src_path}")
-
-                    # If destination is a directory, we should preserve relative path structure
-                    if os.path.isdir(dst_path):
-                        tar.extractall(dst_path)
-                    else:
-                        # If destination is a file, we only extract the source file's content
-                        if len(members) > 1:
-                            raise RuntimeError(
-                                f"Source path is a directory but destination is a file: {src_path}"
-                            )
-
-                        with open(dst_path, "wb") as dst:
-                            src_file = tar.extractfile(members[0])
-                            if src_file is None:
-                                raise RuntimeError(
-                                    f"Failed to extract file: {src_path}"
-                                )
-                            dst.write(src_file.read())
+            # Extract while the archive downloads, without spooling it to disk
+            await asyncio.to_thread(self._extract_archive, stream, src_path, dst_path)
 
         except docker.errors.NotFound:
             raise FileNotFoundError(f"Source file not found: {src_path}")
@@ -333,41 +577,18 @@ class DockerSandbox:
             if container_dir:
                 await self.run_command(f"mkdir -p {container_dir}")
 
-            # Create tar file to upload
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                tar_path = os.path.join(tmp_dir, "temp.tar")
-                with tarfile.open(tar_path, "w") as tar:
-                    # Handle directory source path
-                    if os.path.isdir(src_path):
-                        os.path.basename(src_path.rstrip("/"))
-                        for root, _, files in os.walk(src_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                arcname = os.path.join(
-                                    os.path.basename(dst_path),
-                                    os.path.relpath(file_path, src_path),
-                                )
-                                tar.add(file_path, arcname=arcname)
-                    else:
-                        # Add single file to tar
-                        tar.add(src_path, arcname=os.path.basename(dst_path))
-
-                # Read tar file content
-                with open(tar_path, "rb") as f:
-                    data = f.read()
-
-                # Upload to container
-                await asyncio.to_thread(
-                    self.container.put_archive,
-                    os.path.dirname(resolved_dst) or "/",
-                    data,
-                )
+            # Upload a tar archive generated on the fly as the request body
+            await asyncio.to_thread(
+                self.container.put_archive,
+                os.path.dirname(resolved_dst) or "/",
+                self._iter_tar(src_path, os.path.basename(dst_path)),
+            )
 
-                # Verify file was created successfully
-                try:
-                    await self.run_command(f"test -e {resolved_dst}")
-                except Exception:
-                    raise RuntimeError(f"Failed to verify file creation: {dst_path}")
+            # Verify file was created successfully
+            try:
+                await self.run_command(f"test -e {resolved_dst}")
+            except Exception:
+                raise RuntimeError(f"Failed to verify file creation: {dst_path}")
 
         except FileNotFoundError:
             raise
@@ -382,19 +603,146 @@ class DockerSandbox:
             name: Filename.
             content: File content.
 
+        Returns:
+            Tar file stream.
+        """
+        return DockerSandbox._create_tar_archive({name: content})
+
+    @staticmethod
+    def _create_tar_archive(files: Dict[str, bytes]) -> io.BytesIO:
+        """Creates a tar archive holding several files.
+
+        Args:
+            files: Mapping of archive member name to file content.
+
         Returns:
             Tar file stream.
         """
         tar_stream = io.BytesIO()
         with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            tarinfo = tarfile.TarInfo(name=name)
-            tarinfo.size = len(content)
-            tar.addfile(tarinfo, io.BytesIO(content))
+            for name, content in files.items():
+                tarinfo = tarfile.TarInfo(name=name)
+                tarinfo.size = len(content)
+                tar.addfile(tarinfo, io.BytesIO(content))
         tar_stream.seek(0)
         return tar_stream
 
     @staticmethod
-    async def _read_from_tar(tar_stream) -> bytes:
+    def _iter_tar(
+        src_path: str, arcname: str, chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        """Generates a tar archive of a host file or directory chunk by chunk.
+
+        At most one chunk of file data is held in memory at a time.
+
+        Args:
+            src_path: Source file or directory path (host).
+            arcname: Name of the source in the archive.
+            chunk_size: Maximum bytes of file data per chunk.
+
+        Yields:
+            Consecutive pieces of the tar archive.
+
+        Raises:
+            RuntimeError: If a file changes size while it is archived.
+        """
+        if os.path.isdir(src_path):
+            entries = (
+                (
+                    os.path.join(root, file),
+                    os.path.join(
+                        arcname, os.path.relpath(os.path.join(root, file), src_path)
+                    ),
+                )
+                for root, _, files in os.walk(src_path)
+                for file in files
+            )
+        else:
+            entries = [(src_path, arcname)]
+
+        # Only used to build member headers; nothing is written to it
+        headers = tarfile.TarFile(fileobj=io.BytesIO(), mode="w")
+        for path, name in entries:
+            info = headers.gettarinfo(path, arcname=name)
+            yield info.tobuf(headers.format, headers.encoding, headers.errors)
+            if not info.isreg():
+                continue
+
+            remaining = info.size
+            with open(path, "rb") as f:
+                while remaining:
+                    chunk = f.read(min(chunk_size, remaining))
+                    if not chunk:
+                        raise RuntimeError(f"File changed while copying: {path}")
+                    remaining -= len(chunk)
+                    yield chunk
+
+            padding = -info.size % tarfile.BLOCKSIZE
+            if padding:
+                yield tarfile.NUL * padding
+
+        yield tarfile.NUL * (tarfile.BLOCKSIZE * 2)
+
+    @staticmethod
+    def _extract_archive(
+        tar_stream: Iterable[bytes], src_path: str, dst_path: str
+    ) -> None:
+        """Extracts a tar stream to a host path as it is read.
+
+        Args:
+            tar_stream: Tar archive chunks.
+            src_path: Source path (container), used in error messages.
+            dst_path: Destination path (host).
+
+        Raises:
+            FileNotFoundError: If the archive is empty.
+            RuntimeError: If a directory is copied onto a file path.
+        """
+        with tarfile.open(fileobj=_ChunkReader(tar_stream), mode="r|") as tar:
+            # If destination is a directory, we should preserve relative path structure
+            if os.path.isdir(dst_path):
+                extracted = False
+                for member in tar:
+                    tar.extract(member, dst_path, filter="data")
+                    extracted = True
+                if not extracted:
+                    raise FileNotFoundError(f"Source file is empty: {src_path}")
+                return
+
+            # If destination is a file, we only extract the source file's content
+            member = tar.next()
+            if member is None:
+                raise FileNotFoundError(f"Source file is empty: {src_path}")
+            src_file = tar.extractfile(member) if member.isfile() else None
+            if src_file is None:
+                raise RuntimeError(
+                    f"Source path is a directory but destination is a file: {src_path}"
+                )
+            with open(dst_path, "wb") as dst:
+                shutil.copyfileobj(src_file, dst)
+
+    @staticmethod
+    def _read_members_from_tar(
+        tar_stream: Iterable[bytes], names: Set[str]
+    ) -> Dict[str, bytes]:
+        """Reads the named regular files from a tar stream.
+
+        Args:
+            tar_stream: Tar archive chunks.
+            names: Member names to read.
+
+        Returns:
+            Mapping of member name to content for the members found.
+        """
+        contents = {}
+        with tarfile.open(fileobj=_ChunkReader(tar_stream), mode="r|") as tar:
+            for member in tar:
+                if member.name in names and member.isfile():
+                    contents[member.name] = tar.extractfile(member).read()
+        return contents
+
+    @staticmethod
+    def _read_from_tar(tar_stream: Iterable[bytes]) -> bytes:
         """Reads file content from a tar stream.
 
         Args:
@@ -406,21 +754,55 @@ class DockerSandbox:
         Raises:
             RuntimeError: If read operation fails.
         """
-        with tempfile.NamedTemporaryFile() as tmp:
-            for chunk in tar_stream:
-                tmp.write(chunk)
-            tmp.seek(0)
+        with tarfile.open(fileobj=_ChunkReader(tar_stream), mode="r|") as tar:
+            member = tar.next()
+            if not member:
+                raise RuntimeError("Empty tar archive")
+
+            file_content = tar.extractfile(member)
+            if not file_content:
+                raise RuntimeError("Failed to extract file content")
+
+            return file_content.read()
+
+    async def reset(self) -> None:
+        """Restores the sandbox to a fresh state so it can be reused.
 
-            with tarfile.open(fileobj=tmp) as tar:
-                member = tar.next()
-                if not member:
-                    raise RuntimeError("Empty tar archive")
+        Kills every process except the container's init process, empties the
+        working directory and starts a new terminal session.
 
-                file_content = tar.extractfile(member)
-                if not file_content:
-                    raise RuntimeError("Failed to extract file content")
+        Raises:
+            RuntimeError: If sandbox not initialized or reset fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
 
-                return file_content.read()
+        if self.terminal:
+            await self.terminal.close()
+            self.terminal = None
+
+        work_dir = shlex.quote(self.config.work_dir)
+        result = await asyncio.to_thread(
+            self.container.exec_run,
+            [
+                "sh",
+                "-c",
+                f"kill -9 -1 2>/dev/null; find {work_dir} -mindepth 1 -delete",
+            ],
+            user="root",
+        )
+        if result.exit_code != 0:
+            raise RuntimeError(
+                f"Failed to reset sandbox: {result.output.decode('utf-8', 'replace')}"
+            )
+        self._line_indexes.clear()
+
+        self.terminal = AsyncDockerizedTerminal(
+            self.container.id,
+            self.config.work_dir,
+            env_vars={"PYTHONUNBUFFERED": "1"},
+        )
+        await self.terminal.init()
 
     async def cleanup(self) -> None:
         """Cleans up sandbox resources."""
@@ -8,7 +8,7 @@ allowing interactive command execution with timeout control.
 import asyncio
 import re
 import socket
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import docker
 from docker import APIClient
@@ -16,6 +16,36 @@ from docker.errors import APIError
 from docker.models.containers import Container
 
 
+class _LineBuffer:
+    """Splits a byte stream into lines without rescanning consumed data."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Adds data and returns the lines it completed, without newlines.
+
+        Args:
+            data: Bytes received from the stream.
+
+        Returns:
+            Complete lines, in order.
+        """
+        start = len(self._buffer)
+        self._buffer += data
+        end = self._buffer.rfind(b"\n", start)
+        if end == -1:
+            return []
+        lines = bytes(self._buffer[:end]).split(b"\n")
+        del self._buffer[: end + 1]
+        return lines
+
+    @property
+    def pending(self) -> bytearray:
+        """Bytes after the last newline, e.g. a prompt awaiting input."""
+        return self._buffer
+
+
 class DockerSession:
     def __init__(self, container_id: str) -> None:
         """Initializes a Docker session.
@@ -47,7 +77,8 @@ class DockerSession:
             "exec bash --norc --noprofile",
         ]
 
-        exec_data = self.api.exec_create(
+        exec_data = await asyncio.to_thread(
+            self.api.exec_create,
             self.container_id,
             startup_command,
             stdin=True,
@@ -60,12 +91,18 @@ class DockerSession:
         )
         self.exec_id = exec_data["Id"]
 
-        socket_data = self.api.exec_start(
-            self.exec_id, socket=True, tty=True, stream=True, demux=True
+        socket_data = await asyncio.to_thread(
+            self.api.exec_start,
+            self.exec_id,
+            socket=True,
+            tty=True,
+            stream=True,
+            demux=True,
         )
 
         if hasattr(socket_data, "_sock"):
             self.socket = socket_data._sock
+            # Non-blocking so the event loop can wait on it with sock_recv
             self.socket.setblocking(False)
         else:
             raise RuntimeError("Failed to get socket connection")
@@ -83,7 +120,9 @@ class DockerSession:
             if self.socket:
                 # Send exit command to close bash session
                 try:
-                    self.socket.sendall(b"exit\n")
+                    await asyncio.get_running_loop().sock_sendall(
+                        self.socket, b"exit\n"
+                    )
                     # Allow time for command execution
                     await asyncio.sleep(0.1)
                 except:
@@ -114,6 +153,20 @@ class DockerSession:
             # Log error but don't raise, ensure cleanup continues
             print(f"Warning: Error during session cleanup: {e}")
 
+    async def _recv(self) -> bytes:
+        """Receives the next chunk once the event loop sees the socket readable.
+
+        Returns:
+            Received bytes.
+
+        Raises:
+            ConnectionError: If the session's socket has been closed.
+        """
+        chunk = await asyncio.get_running_loop().sock_recv(self.socket, 4096)
+        if not chunk:
+            raise ConnectionError("Session socket closed")
+        return chunk
+
     async def _read_until_prompt(self) -> str:
         """Reads output until prompt is found.
 
@@ -121,20 +174,15 @@ class DockerSession:
             String containing output up to the prompt.
 
         Raises:
-            socket.error: If socket communication fails.
+            ConnectionError: If the socket closes before the prompt appears.
         """
-        buffer = b""
-        while b"$ " not in buffer:
-            try:
-                chunk = self.socket.recv(4096)
-                if chunk:
-                    buffer += chunk
-            except socket.error as e:
-                if e.errno == socket.EWOULDBLOCK:
-                    await asyncio.sleep(0.1)
-                    continue
-                raise
-        return buffer.decode("utf-8")
+        buffer = bytearray()
+        while True:
+            start = max(len(buffer) - 1, 0)
+            buffer += await self._recv()
+            # Only the new chunk and the byte before it can complete the prompt
+            if buffer.find(b"$ ", start) != -1:
+                return buffer.decode("utf-8")
 
     async def execute(self, command: str, timeout: Optional[int] = None) -> str:
         """Executes a command and returns cleaned output.
@@ -157,46 +205,35 @@ class DockerSession:
             # Sanitize command to prevent shell injection
             sanitized_command = self._sanitize_command(command)
             full_command = f"{sanitized_command}\necho $?\n"
-            self.socket.sendall(full_command.encode())
+            loop = asyncio.get_running_loop()
+            await loop.sock_sendall(self.socket, full_command.encode())
 
             async def read_output() -> str:
-                buffer = b""
+                lines = _LineBuffer()
                 result_lines = []
                 command_sent = False
 
                 while True:
                     try:
-                        chunk = self.socket.recv(4096)
-                        if not chunk:
-                            break
+                        chunk = await self._recv()
+                    except ConnectionError:
+                        break
 
-                        buffer += chunk
-                        lines = buffer.split(b"\n")
+                    for line in lines.feed(chunk):
+                        line = line.rstrip(b"\r")
 
-                        buffer = lines[-1]
-                        lines = lines[:-1]
-
-                        for line in lines:
-                            line = line.rstrip(b"\r")
-
-                            if not command_sent:
-                                command_sent = True
-                                continue
-
-                            if line.strip() == b"echo $?" or line.strip().isdigit():
-                                continue
+                        if not command_sent:
+                            command_sent = True
+                            continue
 
-                            if line.strip():
-                                result_lines.append(line)
+                        if line.strip() == b"echo $?" or line.strip().isdigit():
+                            continue
 
-                        if buffer.endswith(b"$ "):
-                            break
+                        if line.strip():
+                            result_lines.append(line)
 
-                    except socket.error as e:
-                        if e.errno == socket.EWOULDBLOCK:
-                            await asyncio.sleep(0.1)
-                            continue
-                        raise
+                    if lines.pending.endswith(b"$ "):
+                        break
 
                 output = b"\n".join(result_lines).decode("utf-8")
                 output = re.sub(r"\n\$ echo \$\$?.*$", "", output)
@@ -1,5 +1,8 @@
+import base64
+import io
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, List, Literal, Optional, Union
+from typing import Any, Callable, Dict, Hashable, List, Literal, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -156,27 +159,341 @@ class Message(BaseModel):
         )
 
 
+class StreamDelta(BaseModel):
+    """An incremental piece of a streamed LLM response"""
+
+    content: Optional[str] = Field(default=None)
+    tool_call_index: Optional[int] = Field(default=None)
+    tool_call_id: Optional[str] = Field(default=None)
+    tool_name: Optional[str] = Field(default=None)
+    arguments: Optional[str] = Field(default=None)  # Fragment of the JSON arguments
+    finish_reason: Optional[str] = Field(default=None)
+    message: Optional[Any] = Field(default=None)  # Assembled message on the final delta
+
+
+class MessageTokenCache:
+    """Bounded LRU cache of per-message token counts.
+
+    Entries are keyed on message content rather than on the formatted dict, so a
+    count survives ``LLM.format_messages`` rebuilding the dicts on every call and
+    only messages that were never seen before need to go through the tokenizer.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    @staticmethod
+    def key(message: dict) -> Hashable:
+        """Build a hashable key from the token-relevant fields of a message dict"""
+        content = message.get("content")
+        if isinstance(content, list):
+            items = []
+            for item in content:
+                if isinstance(item, str):
+                    items.append(item)
+                elif isinstance(item, dict) and "text" in item:
+                    items.append(("text", item["text"]))
+                elif isinstance(item, dict) and "image_url" in item:
+                    # Image tokens only depend on detail and size, not on the payload
+                    items.append(
+                        (
+                            "image",
+                            item.get("detail"),
+                            tuple(item.get("dimensions", ())),
+                        )
+                    )
+            content = tuple(items)
+
+        tool_calls = tuple(
+            (
+                tool_call.get("function", {}).get("name"),
+                tool_call.get("function", {}).get("arguments"),
+            )
+            for tool_call in message.get("tool_calls") or ()
+        )
+
+        return (
+            message.get("role"),
+            content,
+            tool_calls,
+            message.get("name"),
+            message.get("tool_call_id"),
+        )
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Return the cached token count for a key, if any"""
+        count = self._counts.get(key)
+        if count is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._counts.move_to_end(key)
+        return count
+
+    def put(self, key: Hashable, count: int) -> None:
+        """Store a token count, evicting the least recently used entry if full"""
+        if self.max_size <= 0:
+            return
+        self._counts[key] = count
+        self._counts.move_to_end(key)
+        while len(self._counts) > self.max_size:
+            self._counts.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached counts"""
+        self._counts.clear()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+IMAGE_PLACEHOLDER = "[Earlier screenshot removed to save context]"
+
+
+def _image_cost(base64_image: str) -> Tuple[int, int]:
+    """Payload bytes and estimated model tokens of an inline image"""
+    from PIL import Image
+
+    from app.llm import TokenCounter
+
+    try:
+        with Image.open(io.BytesIO(base64.b64decode(base64_image))) as image:
+            width, height = image.size
+    except Exception:
+        width, height = 1024, 1024
+    return len(base64_image), TokenCounter._calculate_high_detail_tokens(width, height)
+
+
+# Characters of an old tool output kept when it is compacted into a digest
+TOOL_OUTPUT_DIGEST_CHARS = 300
+
+
+def _digest_tool_output(content: str) -> str:
+    """Keep the head of a tool output and note how much of it was elided"""
+    elided = len(content) - TOOL_OUTPUT_DIGEST_CHARS
+    return (
+        f"{content[:TOOL_OUTPUT_DIGEST_CHARS]}\n"
+        f"... [{elided} characters of earlier tool output elided]"
+    )
+
+
 class Memory(BaseModel):
     messages: List[Message] = Field(default_factory=list)
     max_messages: int = Field(default=100)
+    # Images kept inline; older ones are replaced by a placeholder (None keeps all)
+    max_images: Optional[int] = Field(default=3)
+    image_stats: Dict[str, int] = Field(
+        default_factory=lambda: dict.fromkeys(
+            ["requests", "images_elided", "bytes_saved", "tokens_saved"], 0
+        )
+    )
+    # Trailing messages that compact() keeps verbatim
+    keep_recent_messages: int = Field(default=6)
+    compaction_stats: Dict[str, int] = Field(
+        default_factory=lambda: dict.fromkeys(
+            [
+                "compactions",
+                "tool_outputs_digested",
+                "messages_dropped",
+                "tokens_removed",
+            ],
+            0,
+        )
+    )
+
+    # Elided messages with the bytes and tokens their image would have cost
+    _elided: List[Tuple[Message, int, int]] = []
+    # Note standing in for the messages compact() dropped, and how many it covers
+    _dropped_note: Optional[Message] = None
+    _dropped: int = 0
 
     def add_message(self, message: Message) -> None:
         """Add a message to memory"""
         self.messages.append(message)
-        # Optional: Implement message limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        self._trim()
+        self._elide_old_images()
 
     def add_messages(self, messages: List[Message]) -> None:
         """Add multiple messages to memory"""
         self.messages.extend(messages)
-        # Optional: Implement message limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        self._trim()
+        self._elide_old_images()
+
+    def _trim(self) -> None:
+        """Apply max_messages without keeping tool results whose call was cut"""
+        if len(self.messages) <= self.max_messages:
+            return
+        start = len(self.messages) - self.max_messages
+        while start < len(self.messages) and self.messages[start].role == Role.TOOL:
+            start += 1
+        self.messages = self.messages[start:]
+
+    def _exchanges(self) -> List[Tuple[int, int]]:
+        """Split messages into [start, end) ranges that must be kept or dropped
+        together: an assistant message with the results of its tool calls, or a
+        single other message"""
+        exchanges = []
+        start = 0
+        while start < len(self.messages):
+            end = start + 1
+            if self.messages[start].tool_calls:
+                while end < len(self.messages) and self.messages[end].role == Role.TOOL:
+                    end += 1
+            exchanges.append((start, end))
+            start = end
+        return exchanges
+
+    @staticmethod
+    def _dropped_note_text(count: int) -> str:
+        return f"[{count} earlier messages were removed to fit the context budget]"
+
+    def compact(
+        self, count_tokens: Callable[[List[dict]], int], max_tokens: int
+    ) -> int:
+        """Shrink the messages to fit a token budget.
+
+        System messages, the first user message (the task) and the last
+        keep_recent_messages messages stay verbatim. Older tool outputs are cut
+        down to a digest first. If that is not enough, the oldest exchanges are
+        dropped whole, so a tool result never outlives the assistant message
+        that called it, and a note records how many messages were removed. As a
+        last resort, recent tool outputs other than the newest exchange's are
+        digested too.
+
+        Args:
+            count_tokens: Counts the tokens of a list of message dicts.
+            max_tokens: Token budget for all messages in memory.
+
+        Returns:
+            int: Token count of the messages after compaction.
+        """
+        total = count_tokens(self.to_dict_list())
+        if total <= max_tokens:
+            return total
+
+        initial = total
+        # Tokens of each message on its own, without the per-request overhead
+        overhead = count_tokens([])
+        sizes = [
+            count_tokens([message.to_dict()]) - overhead for message in self.messages
+        ]
+        exchanges = self._exchanges()
+        protected = len(self.messages)
+        for start, _ in reversed(exchanges):
+            if len(self.messages) - protected >= self.keep_recent_messages:
+                break
+            protected = start
+
+        def digest(index: int) -> None:
+            nonlocal total
+            message = self.messages[index]
+            if (
+                message.role != Role.TOOL
+                or not message.content
+                or len(message.content) <= 2 * TOOL_OUTPUT_DIGEST_CHARS
+            ):
+                return
+            message.content = _digest_tool_output(message.content)
+            size = count_tokens([message.to_dict()]) - overhead
+            total -= sizes[index] - size
+            sizes[index] = size
+            self.compaction_stats["tool_outputs_digested"] += 1
+
+        for index in range(protected):
+            if total <= max_tokens:
+                break
+            digest(index)
+
+        first_user = next(
+            (i for i, m in enumerate(self.messages) if m.role == Role.USER), None
+        )
+        has_note = any(message is self._dropped_note for message in self.messages)
+        note = Message.user_message(
+            self._dropped_note_text(self._dropped + len(self.messages))
+        )
+        dropped = set()
+        for start, end in exchanges:
+            if total <= max_tokens or end > protected:
+                break
+            message = self.messages[start]
+            if (
+                message.role == Role.SYSTEM
+                or start == first_user
+                or message is self._dropped_note
+            ):
+                continue
+            if not dropped and not has_note:
+                total += count_tokens([note.to_dict()]) - overhead
+            dropped.update(range(start, end))
+            total -= sum(sizes[start:end])
+
+        newest = exchanges[-1][0] if exchanges else 0
+        for index in range(protected, newest):
+            if total <= max_tokens:
+                break
+            digest(index)
+
+        if dropped:
+            kept = [m for i, m in enumerate(self.messages) if i not in dropped]
+            self._dropped += len(dropped)
+            self.compaction_stats["messages_dropped"] += len(dropped)
+            if not has_note:
+                self._dropped_note = note
+                kept.insert(min(dropped), note)
+            self._dropped_note.content = self._dropped_note_text(self._dropped)
+            self.messages = kept
+
+        total = count_tokens(self.to_dict_list())
+        self.compaction_stats["compactions"] += 1
+        self.compaction_stats["tokens_removed"] += max(initial - total, 0)
+        return total
+
+    def _elide_old_images(self) -> None:
+        """Replace all but the newest max_images images with a placeholder"""
+        if self.max_images is None:
+            return
+
+        kept = 0
+        for message in reversed(self.messages):
+            if not message.base64_image:
+                continue
+            kept += 1
+            if kept <= self.max_images:
+                continue
+
+            size, tokens = _image_cost(message.base64_image)
+            message.base64_image = None
+            message.content = (
+                f"{message.content}\n{IMAGE_PLACEHOLDER}"
+                if message.content
+                else IMAGE_PLACEHOLDER
+            )
+            self._elided.append((message, size, tokens))
+            self.image_stats["images_elided"] += 1
+
+    def record_request(self) -> None:
+        """Account for one LLM request sent with the current messages.
+
+        Every elided image still in memory would otherwise have been resent with
+        the request, so its bytes and tokens count as saved.
+        """
+        present = {id(message) for message in self.messages}
+        self._elided = [entry for entry in self._elided if id(entry[0]) in present]
+
+        self.image_stats["requests"] += 1
+        for _, size, tokens in self._elided:
+            self.image_stats["bytes_saved"] += size
+            self.image_stats["tokens_saved"] += tokens
 
     def clear(self) -> None:
         """Clear all messages"""
         self.messages.clear()
+        self._elided.clear()
+        self._dropped_note = None
+        self._dropped = 0
 
     def get_recent_messages(self, n: int) -> List[Message]:
         """Get n most recent messages"""
@@ -8,6 +8,10 @@ class BaseTool(ABC, BaseModel):
     name: str
     description: str
     parameters: Optional[dict] = None
+    # How many calls to this tool may run at once within one agent step. Tools
+    # with side effects keep the default of 1 and run alone, in issue order;
+    # side-effect-free tools raise it to run alongside each other.
+    max_concurrency: int = 1
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,6 +1,7 @@
 import asyncio
+import codecs
 import os
-from typing import Optional
+from typing import Callable, Optional
 
 from app.exceptions import ToolError
 from app.tool.base import BaseTool, CLIResult
@@ -13,6 +14,39 @@ _BASH_DESCRIPTION = """Execute a bash command in the terminal.
 """
 
 
+class _OutputBuffer:
+    """Accumulates stream output, keeping only its head and tail past a limit."""
+
+    def __init__(self, limit: int):
+        self._head_limit = limit // 2
+        self._tail_limit = limit - self._head_limit
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._dropped = 0
+
+    def append(self, data: bytes):
+        room = self._head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self._tail += data
+        excess = len(self._tail) - self._tail_limit
+        if excess > 0:
+            del self._tail[:excess]
+            self._dropped += excess
+
+    def decode(self) -> str:
+        if not self._dropped:
+            return (self._head + self._tail).decode(errors="replace")
+        return (
+            self._head.decode(errors="replace")
+            + f"\n... [{self._dropped} bytes truncated] ...\n"
+            + self._tail.decode(errors="replace")
+        )
+
+
 class _BashSession:
     """A session of a bash shell."""
 
@@ -20,9 +54,10 @@ class _BashSession:
     _process: asyncio.subprocess.Process
 
     command: str = "/bin/bash"
-    _output_delay: float = 0.2  # seconds
     _timeout: float = 120.0  # seconds
     _sentinel: str = "<<exit>>"
+    _read_size: int = 64 * 1024  # bytes
+    _max_output: int = 1024 * 1024  # bytes retained per stream
 
     def __init__(self):
         self._started = False
@@ -52,8 +87,64 @@ class _BashSession:
             return
         self._process.terminate()
 
-    async def run(self, command: str):
-        """Execute a command in the bash shell."""
+    async def _read_until_sentinel(
+        self,
+        stream: asyncio.StreamReader,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Read a stream as data arrives until the sentinel, keeping a bounded copy."""
+        # echo terminates the sentinel with a newline; consume it too
+        sentinel = f"{self._sentinel}\n".encode()
+        buffer = _OutputBuffer(self._max_output)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # bytes that may be the start of a sentinel split across reads
+        pending = b""
+
+        while True:
+            chunk = await stream.read(self._read_size)
+            if not chunk:
+                raise ToolError("bash has exited before the command completed")
+
+            window = pending + chunk
+            index = window.find(sentinel)
+            if index != -1:
+                data, pending = window[:index], b""
+            else:
+                # hold back only a tail that could be the start of the sentinel
+                keep = next(
+                    (
+                        k
+                        for k in range(min(len(sentinel) - 1, len(window)), 0, -1)
+                        if window.endswith(sentinel[:k])
+                    ),
+                    0,
+                )
+                data, pending = (
+                    window[: len(window) - keep],
+                    window[len(window) - keep :],
+                )
+
+            buffer.append(data)
+            if on_output and data:
+                on_output(decoder.decode(data))
+            if index != -1:
+                break
+
+        output = buffer.decode()
+        if output.endswith("\n"):
+            output = output[:-1]
+        return output
+
+    async def run(
+        self, command: str, on_output: Optional[Callable[[str], None]] = None
+    ):
+        """Execute a command in the bash shell.
+
+        Output is consumed as it arrives rather than polled, so short commands
+        return as soon as they finish. Each stream keeps at most `_max_output`
+        bytes, dropping the middle of larger outputs. If given, `on_output` is
+        called with each piece of stdout as it is read.
+        """
         if not self._started:
             raise ToolError("Session has not started.")
         if self._process.returncode is not None:
@@ -71,45 +162,27 @@ class _BashSession:
         assert self._process.stdout
         assert self._process.stderr
 
-        # send command to the process
+        # send command to the process; the sentinel is echoed to both streams
+        # so each can be read up to exactly the end of this command's output
         self._process.stdin.write(
-            command.encode() + f"; echo '{self._sentinel}'\n".encode()
+            command.encode()
+            + f"; echo '{self._sentinel}'; echo '{self._sentinel}' >&2\n".encode()
         )
         await self._process.stdin.drain()
 
-        # read output from the process, until the sentinel is found
+        # read both streams concurrently so neither pipe fills up and blocks bash
         try:
             async with asyncio.timeout(self._timeout):
-                while True:
-                    await asyncio.sleep(self._output_delay)
-                    # if we read directly from stdout/stderr, it will wait forever for
-                    # EOF. use the StreamReader buffer directly instead.
-                    output = (
-                        self._process.stdout._buffer.decode()
-                    )  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
-                        # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
-                        break
+                output, error = await asyncio.gather(
+                    self._read_until_sentinel(self._process.stdout, on_output),
+                    self._read_until_sentinel(self._process.stderr),
+                )
         except asyncio.TimeoutError:
             self._timed_out = True
             raise ToolError(
                 f"timed out: bash has not returned in {self._timeout} seconds and must be restarted",
             ) from None
 
-        if output.endswith("\n"):
-            output = output[:-1]
-
-        error = (
-            self._process.stderr._buffer.decode()
-        )  # pyright: ignore[reportAttributeAccessIssue]
-        if error.endswith("\n"):
-            error = error[:-1]
-
-        # clear the buffers so that the next output can be read correctly
-        self._process.stdout._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-        self._process.stderr._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-
         return CLIResult(output=output, error=error)
 
 
@@ -0,0 +1,242 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from browser_use import Browser as BrowserUseBrowser
+from browser_use import BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+from app.config import BrowserSettings, config
+from app.logger import logger
+
+
+def create_browser() -> BrowserUseBrowser:
+    """Creates a browser from the [browser] section of the config."""
+    browser_config_kwargs = {"headless": False, "disable_security": True}
+
+    if config.browser_config:
+        from browser_use.browser.browser import ProxySettings
+
+        # handle proxy settings.
+        if config.browser_config.proxy and config.browser_config.proxy.server:
+            browser_config_kwargs["proxy"] = ProxySettings(
+                server=config.browser_config.proxy.server,
+                username=config.browser_config.proxy.username,
+                password=config.browser_config.proxy.password,
+            )
+
+        browser_attrs = [
+            "headless",
+            "disable_security",
+            "extra_chromium_args",
+            "chrome_instance_path",
+            "wss_url",
+            "cdp_url",
+        ]
+
+        for attr in browser_attrs:
+            value = getattr(config.browser_config, attr, None)
+            if value is not None:
+                if not isinstance(value, list) or value:
+                    browser_config_kwargs[attr] = value
+
+    return BrowserUseBrowser(BrowserConfig(**browser_config_kwargs))
+
+
+class _PooledBrowser:
+    """A launched browser and the contexts it is currently serving."""
+
+    def __init__(self, browser: BrowserUseBrowser):
+        self.browser = browser
+        self.active_contexts = 0
+        self.pages_opened = 0
+        self.retired = False
+
+    def is_healthy(self) -> bool:
+        playwright_browser = self.browser.playwright_browser
+        return playwright_browser is not None and playwright_browser.is_connected()
+
+
+class BrowserPool:
+    """Process-wide pool of browsers that hands out isolated contexts.
+
+    Launching Chromium dominates browser tool startup, so browsers are shared
+    across agents and each agent gets its own BrowserContext (separate cookies,
+    storage and tabs). A browser serves at most max_contexts_per_browser
+    contexts at once. Once it has opened max_pages_per_browser pages, or stops
+    responding, it takes no new contexts and is closed when its last context is
+    released.
+
+    Attributes:
+        max_browsers: Maximum number of browsers running at once.
+        max_contexts_per_browser: Maximum concurrent contexts per browser.
+        max_pages_per_browser: Pages a browser may open before it is recycled.
+        browser_factory: Creates an unlaunched browser.
+    """
+
+    def __init__(
+        self,
+        max_browsers: Optional[int] = None,
+        max_contexts_per_browser: Optional[int] = None,
+        max_pages_per_browser: Optional[int] = None,
+        browser_factory: Callable[[], BrowserUseBrowser] = create_browser,
+    ):
+        settings = config.browser_config or BrowserSettings()
+        self.max_browsers = max_browsers or settings.max_browsers
+        self.max_contexts_per_browser = (
+            max_contexts_per_browser or settings.max_contexts_per_browser
+        )
+        self.max_pages_per_browser = (
+            max_pages_per_browser or settings.max_pages_per_browser
+        )
+        self.browser_factory = browser_factory
+
+        self._browsers: List[_PooledBrowser] = []
+        self._owners: Dict[BrowserContext, _PooledBrowser] = {}
+        self._condition = asyncio.Condition()
+
+        self.browsers_launched = 0
+        self.browsers_recycled = 0
+        self.contexts_created = 0
+
+    async def prewarm(self, count: int = 1) -> None:
+        """Launches browsers ahead of the first acquire."""
+        async with self._condition:
+            while len(self._browsers) < min(count, self.max_browsers):
+                await self._launch()
+
+    async def acquire(
+        self, context_config: Optional[BrowserContextConfig] = None
+    ) -> BrowserContext:
+        """Creates an isolated context on a pooled browser.
+
+        Waits for a context to be released when every browser is full.
+
+        Args:
+            context_config: Configuration for the new context.
+
+        Returns:
+            BrowserContext: A context with its session initialized.
+        """
+        async with self._condition:
+            while True:
+                self._retire_unhealthy()
+                pooled = self._least_loaded()
+                if pooled is None and len(self._browsers) < self.max_browsers:
+                    pooled = await self._launch()
+                if pooled is not None:
+                    break
+                await self._condition.wait()
+            pooled.active_contexts += 1
+
+        try:
+            context = await pooled.browser.new_context(context_config)
+            session = await context.get_session()
+        except Exception:
+            await self._release_slot(pooled)
+            raise
+
+        def count_page(_page) -> None:
+            pooled.pages_opened += 1
+            if pooled.pages_opened >= self.max_pages_per_browser:
+                pooled.retired = True
+
+        for page in session.context.pages:
+            count_page(page)
+        session.context.on("page", count_page)
+
+        self._owners[context] = pooled
+        self.contexts_created += 1
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """Closes a context and frees its slot on the browser."""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.error(f"Error closing browser context: {e}")
+
+        pooled = self._owners.pop(context, None)
+        if pooled is not None:
+            await self._release_slot(pooled)
+
+    def is_healthy(self, context: BrowserContext) -> bool:
+        """Whether the browser behind a pooled context is still connected."""
+        pooled = self._owners.get(context)
+        return pooled is not None and pooled.is_healthy()
+
+    def _least_loaded(self) -> Optional[_PooledBrowser]:
+        available = [
+            pooled
+            for pooled in self._browsers
+            if not pooled.retired
+            and pooled.active_contexts < self.max_contexts_per_browser
+        ]
+        return min(available, key=lambda p: p.active_contexts, default=None)
+
+    def _retire_unhealthy(self) -> None:
+        for pooled in list(self._browsers):
+            if not pooled.is_healthy():
+                if not pooled.retired:
+                    logger.warning("Pooled browser disconnected; replacing it")
+                    pooled.retired = True
+                if pooled.active_contexts == 0:
+                    self._browsers.remove(pooled)
+                    asyncio.create_task(self._close_browser(pooled))
+
+    async def _launch(self) -> _PooledBrowser:
+        browser = self.browser_factory()
+        await browser.get_playwright_browser()
+        pooled = _PooledBrowser(browser)
+        self._browsers.append(pooled)
+        self.browsers_launched += 1
+        return pooled
+
+    async def _release_slot(self, pooled: _PooledBrowser) -> None:
+        async with self._condition:
+            pooled.active_contexts -= 1
+            recycle = (
+                pooled.active_contexts == 0
+                and (pooled.retired or not pooled.is_healthy())
+                and pooled in self._browsers
+            )
+            if recycle:
+                self._browsers.remove(pooled)
+            self._condition.notify()
+
+        if recycle:
+            self.browsers_recycled += 1
+            await self._close_browser(pooled)
+
+    @staticmethod
+    async def _close_browser(pooled: _PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.error(f"Error closing pooled browser: {e}")
+
+    async def close(self) -> None:
+        """Closes all contexts and browsers."""
+        for context in list(self._owners):
+            await self.release(context)
+        browsers, self._browsers = self._browsers, []
+        for pooled in browsers:
+            await self._close_browser(pooled)
+
+    def get_stats(self) -> Dict:
+        """Gets pool statistics.
+
+        Returns:
+            Dict: Statistics information.
+        """
+        return {
+            "browsers": len(self._browsers),
+            "max_browsers": self.max_browsers,
+            "active_contexts": sum(p.active_contexts for p in self._browsers),
+            "max_contexts_per_browser": self.max_contexts_per_browser,
+            "browsers_launched": self.browsers_launched,
+            "browsers_recycled": self.browsers_recycled,
+            "contexts_created": self.contexts_created,
+        }
+
+
+BROWSER_POOL = BrowserPool()
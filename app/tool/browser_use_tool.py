@@ -1,18 +1,21 @@
 import asyncio
 import base64
+import io
 import json
-from typing import Generic, Optional, TypeVar
+import time
+from typing import Dict, Generic, Optional, Tuple, TypeVar
 
 from browser_use import Browser as BrowserUseBrowser
-from browser_use import BrowserConfig
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from browser_use.dom.service import DomService
+from PIL import Image
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
-from app.config import config
-from app.llm import LLM
+from app.config import BrowserSettings, ScreenshotSettings, config
+from app.llm import LLM, TokenCounter
 from app.tool.base import BaseTool, ToolResult
+from app.tool.browser_pool import BROWSER_POOL
 from app.tool.web_search import WebSearch
 
 
@@ -33,6 +36,45 @@ Key capabilities include:
 Note: When using element indices, refer to the numbered elements shown in the current browser state.
 """
 
+# Cheap page-side hash of the serialized DOM, scroll position and viewport
+_DOM_HASH_JS = """() => {
+    const html = document.documentElement.outerHTML;
+    let hash = 0;
+    for (let i = 0; i < html.length; i++) {
+        hash = (hash * 31 + html.charCodeAt(i)) | 0;
+    }
+    return `:${hash}:${html.length}:${scrollX}:${scrollY}:${innerWidth}x${innerHeight}`;
+}"""
+
+
+def _encode_screenshot(
+    raw: bytes, settings: ScreenshotSettings
+) -> Tuple[bytes, Tuple[int, int]]:
+    """Downscales a screenshot to what the model sees and encodes it as JPEG.
+
+    Vision models resize images for high detail tiling (see TokenCounter), so
+    pixels beyond that size only add bytes. JPEG quality is lowered in steps
+    until the image fits settings.max_bytes or reaches settings.min_quality.
+
+    Returns:
+        The JPEG bytes and the image dimensions.
+    """
+    image = Image.open(io.BytesIO(raw)).convert("RGB")
+    width, height = TokenCounter._high_detail_size(*image.size)
+    if width < image.width:
+        image = image.resize(
+            (width, height), Image.Resampling.BILINEAR, reducing_gap=2.0
+        )
+
+    quality = settings.quality
+    while True:
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+        if buffer.tell() <= settings.max_bytes or quality <= settings.min_quality:
+            return buffer.getvalue(), image.size
+        quality = max(settings.min_quality, quality - 10)
+
+
 Context = TypeVar("Context")
 
 
@@ -130,6 +172,15 @@ class BrowserUseTool(BaseTool, Generic[Context]):
     # Context for generic functionality
     tool_context: Optional[Context] = Field(default=None, exclude=True)
 
+    # DOM fingerprint of the last screenshot and capture measurements
+    last_dom_hash: Optional[str] = Field(default=None, exclude=True)
+    screenshot_stats: Dict[str, float] = Field(
+        default_factory=lambda: dict.fromkeys(
+            ["captured", "skipped", "bytes", "tokens", "capture_seconds"], 0
+        ),
+        exclude=True,
+    )
+
     llm: Optional[LLM] = Field(default_factory=LLM)
 
     @field_validator("parameters", mode="before")
@@ -139,37 +190,12 @@ class BrowserUseTool(BaseTool, Generic[Context]):
         return v
 
     async def _ensure_browser_initialized(self) -> BrowserContext:
-        """Ensure browser and context are initialized."""
-        if self.browser is None:
-            browser_config_kwargs = {"headless": False, "disable_security": True}
-
-            if config.browser_config:
-                from browser_use.browser.browser import ProxySettings
-
-                # handle proxy settings.
-                if config.browser_config.proxy and config.browser_config.proxy.server:
-                    browser_config_kwargs["proxy"] = ProxySettings(
-                        server=config.browser_config.proxy.server,
-                        username=config.browser_config.proxy.username,
-                        password=config.browser_config.proxy.password,
-                    )
-
-                browser_attrs = [
-                    "headless",
-                    "disable_security",
-                    "extra_chromium_args",
-                    "chrome_instance_path",
-                    "wss_url",
-                    "cdp_url",
-                ]
-
-                for attr in browser_attrs:
-                    value = getattr(config.browser_config, attr, None)
-                    if value is not None:
-                        if not isinstance(value, list) or value:
-                            browser_config_kwargs[attr] = value
-
-            self.browser = BrowserUseBrowser(BrowserConfig(**browser_config_kwargs))
+        """Ensure this tool holds an isolated context on a pooled browser."""
+        if self.context is not None and not BROWSER_POOL.is_healthy(self.context):
+            # The browser behind the context went away; move to a healthy one
+            await BROWSER_POOL.release(self.context)
+            self.context = None
+            self.dom_service = None
 
         if self.context is None:
             context_config = BrowserContextConfig()
@@ -182,7 +208,9 @@ class BrowserUseTool(BaseTool, Generic[Context]):
             ):
                 context_config = config.browser_config.new_context_config
 
-            self.context = await self.browser.new_context(context_config)
+            self.context = await BROWSER_POOL.acquire(context_config)
+            self.browser = self.context.browser
+            self.last_dom_hash = None
             self.dom_service = DomService(await self.context.get_current_page())
 
         return self.context
@@ -498,17 +526,9 @@ Page content:
             elif hasattr(ctx, "config") and hasattr(ctx.config, "browser_window_size"):
                 viewport_height = ctx.config.browser_window_size.get("height", 0)
 
-            # Take a screenshot for the state
+            # Take a screenshot for the state, unless the page is unchanged
             page = await ctx.get_current_page()
-
-            await page.bring_to_front()
-            await page.wait_for_load_state()
-
-            screenshot = await page.screenshot(
-                full_page=True, animations="disabled", type="jpeg", quality=100
-            )
-
-            screenshot = base64.b64encode(screenshot).decode("utf-8")
+            screenshot = await self._capture_screenshot(page, state)
 
             # Build the state info with all required fields
             state_info = {
@@ -538,20 +558,59 @@ Page content:
         except Exception as e:
             return ToolResult(error=f"Failed to get browser state: {str(e)}")
 
+    async def _dom_hash(self, page) -> Optional[str]:
+        """Fingerprint of the page's DOM, scroll position and viewport."""
+        try:
+            return page.url + await page.evaluate(_DOM_HASH_JS)
+        except Exception:
+            return None
+
+    async def _capture_screenshot(self, page, state) -> Optional[str]:
+        """Captures a screenshot according to the [browser.screenshot] policy.
+
+        Returns None when the page is unchanged since the previous capture, as
+        the model has already seen it.
+        """
+        settings = (config.browser_config or BrowserSettings()).screenshot
+
+        dom_hash = await self._dom_hash(page)
+        if settings.skip_unchanged and dom_hash and dom_hash == self.last_dom_hash:
+            self.screenshot_stats["skipped"] += 1
+            return None
+
+        start = time.perf_counter()
+        if not settings.full_page and getattr(state, "screenshot", None):
+            # browser_use already captured the viewport while building the state
+            raw = base64.b64decode(state.screenshot)
+        else:
+            await page.bring_to_front()
+            await page.wait_for_load_state()
+            raw = await page.screenshot(
+                full_page=settings.full_page, animations="disabled", type="png"
+            )
+
+        screenshot, size = await asyncio.to_thread(_encode_screenshot, raw, settings)
+        self.last_dom_hash = dom_hash
+
+        stats = self.screenshot_stats
+        stats["captured"] += 1
+        stats["bytes"] += len(screenshot)
+        stats["tokens"] += TokenCounter._calculate_high_detail_tokens(*size)
+        stats["capture_seconds"] += time.perf_counter() - start
+        return base64.b64encode(screenshot).decode("utf-8")
+
     async def cleanup(self):
-        """Clean up browser resources."""
+        """Return the browser context to the pool; the browser stays running."""
         async with self.lock:
             if self.context is not None:
-                await self.context.close()
+                await BROWSER_POOL.release(self.context)
                 self.context = None
                 self.dom_service = None
-            if self.browser is not None:
-                await self.browser.close()
-                self.browser = None
+            self.browser = None
 
     def __del__(self):
         """Ensure cleanup when object is destroyed."""
-        if self.browser is not None or self.context is not None:
+        if self.context is not None:
             try:
                 asyncio.run(self.cleanup())
             except RuntimeError:
@@ -190,6 +190,7 @@ class DeepResearch(BaseTool):
         },
         "required": ["query"],
     }
+    max_concurrency: int = 2
 
     # Dependency injection for easier testing
     search_tool: WebSearch = Field(default_factory=WebSearch)
@@ -261,6 +262,7 @@ class DeepResearch(BaseTool):
                 ],
                 tool_choice=ToolChoice.REQUIRED,
                 stream=False,
+                use_cache=True,
             )
 
             # Extract the query from the tool_call response
@@ -486,6 +488,7 @@ class DeepResearch(BaseTool):
             ],
             tool_choice=ToolChoice.REQUIRED,
             stream=False,
+            use_cache=True,
         )
 
         insights = []
@@ -1,8 +1,13 @@
 """File operation interfaces and implementations for local and sandbox environments."""
 
 import asyncio
+import bisect
+import codecs
+import mmap
+from array import array
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Protocol, Tuple, Union, runtime_checkable
+from typing import Dict, List, Optional, Protocol, Tuple, Union, runtime_checkable
 
 from app.config import SandboxSettings
 from app.exceptions import ToolError
@@ -24,6 +29,27 @@ class FileOperator(Protocol):
         """Write content to a file."""
         ...
 
+    async def read_files(self, paths: List[PathLike]) -> Dict[str, str]:
+        """Read several files, keyed by path."""
+        ...
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several files from a path to content mapping."""
+        ...
+
+    async def stat_many(self, paths: List[PathLike]) -> Dict[str, Dict[str, bool]]:
+        """Check whether each path exists and is a directory."""
+        ...
+
+    async def read_lines(
+        self, path: PathLike, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Read lines start..end (1-based, inclusive, -1 for the last line).
+
+        Returns the lines joined by newlines and the number of lines in the file.
+        """
+        ...
+
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory."""
         ...
@@ -39,10 +65,44 @@ class FileOperator(Protocol):
         ...
 
 
+class _LineIndex:
+    """Newline counts per fixed-size block of a file.
+
+    Locating a line only scans the one block it starts in, so reading a range
+    of lines does not depend on the size of the file once it is indexed.
+    """
+
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, data: mmap.mmap):
+        self.newlines_before = array("q")
+        newlines = 0
+        for offset in range(0, len(data), self.BLOCK_SIZE):
+            self.newlines_before.append(newlines)
+            newlines += data[offset : offset + self.BLOCK_SIZE].count(b"\n")
+        self.lines = newlines + 1
+
+    def offset(self, data: mmap.mmap, line: int) -> int:
+        """Byte offset at which a 1-based line starts."""
+        newlines = line - 1
+        if newlines == 0:
+            return 0
+        block = bisect.bisect_left(self.newlines_before, newlines) - 1
+        position = block * self.BLOCK_SIZE
+        for _ in range(newlines - self.newlines_before[block]):
+            position = data.find(b"\n", position) + 1
+        return position
+
+
 class LocalFileOperator(FileOperator):
     """File operations implementation for local filesystem."""
 
     encoding: str = "utf-8"
+    max_line_indexes: int = 32
+
+    def __init__(self):
+        # Path -> ((inode, mtime, size), index) for recently viewed files
+        self._line_indexes: OrderedDict = OrderedDict()
 
     async def read_file(self, path: PathLike) -> str:
         """Read content from a local file."""
@@ -58,6 +118,79 @@ class LocalFileOperator(FileOperator):
         except Exception as e:
             raise ToolError(f"Failed to write to {path}: {str(e)}") from None
 
+    async def read_files(self, paths: List[PathLike]) -> Dict[str, str]:
+        """Read several local files."""
+        return {str(path): await self.read_file(path) for path in paths}
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several local files."""
+        for path, content in files.items():
+            await self.write_file(path, content)
+
+    async def stat_many(self, paths: List[PathLike]) -> Dict[str, Dict[str, bool]]:
+        """Check existence and type of several local paths."""
+        return {
+            str(path): {"exists": Path(path).exists(), "is_dir": Path(path).is_dir()}
+            for path in paths
+        }
+
+    async def read_lines(
+        self, path: PathLike, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Read a range of lines from a memory-mapped local file."""
+        try:
+            return await asyncio.to_thread(
+                self._read_lines, Path(path), start, end, max_bytes
+            )
+        except Exception as e:
+            raise ToolError(f"Failed to read {path}: {str(e)}") from None
+
+    def _read_lines(
+        self, path: Path, start: int, end: int, max_bytes: Optional[int]
+    ) -> Tuple[str, int]:
+        stat = path.stat()
+        if stat.st_size == 0:
+            return "", 1
+
+        key, stamp = str(path), (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            cached = self._line_indexes.get(key)
+            if cached is not None and cached[0] == stamp:
+                index = cached[1]
+                self._line_indexes.move_to_end(key)
+            else:
+                index = _LineIndex(data)
+                self._line_indexes[key] = (stamp, index)
+                while len(self._line_indexes) > self.max_line_indexes:
+                    self._line_indexes.popitem(last=False)
+
+            last = index.lines if end == -1 else min(end, index.lines)
+            if start > last:
+                return "", index.lines
+
+            begin = index.offset(data, start)
+            if last < index.lines:
+                # Leave out the line ending of the last line in the range
+                stop = index.offset(data, last + 1) - 1
+                if stop > begin and data[stop - 1 : stop] == b"\r":
+                    stop -= 1
+            else:
+                stop = len(data)
+            clipped = max_bytes is not None and stop - begin > max_bytes
+            if clipped:
+                stop = begin + max_bytes
+            chunk = data[begin:stop]
+
+        if clipped:
+            # The cut may fall inside a multi-byte character
+            text = codecs.getincrementaldecoder(self.encoding)().decode(chunk)
+        else:
+            text = chunk.decode(self.encoding)
+        # Translate line endings like read_file does
+        return text.replace("\r\n", "\n"), index.lines
+
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory."""
         return Path(path).is_dir()
@@ -120,21 +253,48 @@ class SandboxFileOperator(FileOperator):
         except Exception as e:
             raise ToolError(f"Failed to write to {path} in sandbox: {str(e)}") from None
 
+    async def read_files(self, paths: List[PathLike]) -> Dict[str, str]:
+        """Read several files from sandbox with one archive download."""
+        await self._ensure_sandbox_initialized()
+        try:
+            return await self.sandbox_client.read_files([str(p) for p in paths])
+        except Exception as e:
+            raise ToolError(f"Failed to read files in sandbox: {str(e)}") from None
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several files to sandbox with one archive upload."""
+        await self._ensure_sandbox_initialized()
+        try:
+            await self.sandbox_client.write_files(
+                {str(path): content for path, content in files.items()}
+            )
+        except Exception as e:
+            raise ToolError(f"Failed to write files in sandbox: {str(e)}") from None
+
+    async def stat_many(self, paths: List[PathLike]) -> Dict[str, Dict[str, bool]]:
+        """Check existence and type of several paths in sandbox at once."""
+        await self._ensure_sandbox_initialized()
+        return await self.sandbox_client.stat_many([str(p) for p in paths])
+
+    async def read_lines(
+        self, path: PathLike, start: int, end: int, max_bytes: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Read a range of lines from a file in sandbox."""
+        await self._ensure_sandbox_initialized()
+        try:
+            return await self.sandbox_client.read_lines(
+                str(path), start, end, max_bytes
+            )
+        except Exception as e:
+            raise ToolError(f"Failed to read {path} in sandbox: {str(e)}") from None
+
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory in sandbox."""
-        await self._ensure_sandbox_initialized()
-        result = await self.sandbox_client.run_command(
-            f"test -d {path} && echo 'true' || echo 'false'"
-        )
-        return result.strip() == "true"
+        return (await self.stat_many([path]))[str(path)]["is_dir"]
 
     async def exists(self, path: PathLike) -> bool:
         """Check if path exists in sandbox."""
-        await self._ensure_sandbox_initialized()
-        result = await self.sandbox_client.run_command(
-            f"test -e {path} && echo 'true' || echo 'false'"
-        )
-        return result.strip() == "true"
+        return (await self.stat_many([path]))[str(path)]["exists"]
 
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
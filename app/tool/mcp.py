@@ -101,6 +101,7 @@ class MCPClients(ToolCollection):
             self.tool_map[tool.name] = server_tool
 
         self.tools = tuple(self.tool_map.values())
+        self.invalidate_params()
         logger.info(
             f"Connected to server with tools: {[tool.name for tool in response.tools]}"
         )
@@ -112,4 +113,5 @@ class MCPClients(ToolCollection):
             self.session = None
             self.tools = tuple()
             self.tool_map = {}
+            self.invalidate_params()
             logger.info("Disconnected from MCP server")
@@ -1,11 +1,299 @@
+import asyncio
+import atexit
 import multiprocessing
+import os
+import signal
 import sys
+import uuid
 from io import StringIO
-from typing import Dict
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional, Set, Tuple
 
 from app.tool.base import BaseTool
 
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _fresh_globals() -> dict:
+    if isinstance(__builtins__, dict):
+        return {"__builtins__": __builtins__.copy()}
+    return {"__builtins__": __builtins__.__dict__.copy()}
+
+
+def _run_code(code: str, safe_globals: dict) -> Dict:
+    original_stdout = sys.stdout
+    try:
+        output_buffer = StringIO()
+        sys.stdout = output_buffer
+        exec(code, safe_globals, safe_globals)
+        return {"observation": output_buffer.getvalue(), "success": True}
+    except Exception as e:
+        # Some errors, e.g. MemoryError from the rlimit, have no message
+        return {"observation": str(e) or type(e).__name__, "success": False}
+    finally:
+        sys.stdout = original_stdout
+
+
+def _restore_process_state(cwd: str, environ: Dict[str, str], path: List[str]) -> None:
+    os.chdir(cwd)
+    if os.environ != environ:
+        os.environ.clear()
+        os.environ.update(environ)
+    sys.path[:] = path
+
+
+def _worker_main(
+    conn: Connection, memory_limit: Optional[int], cpu_time_limit: Optional[int]
+) -> None:
+    """Worker process loop: runs snippets received over the pipe until EOF.
+
+    Each request is ``(code, session_id)``. Snippets without a session get fresh
+    globals; snippets of a session share that session's globals. A request with
+    ``code=None`` drops the session.
+
+    The working directory, environment variables and ``sys.path`` are restored
+    to the worker's initial state before each snippet without a session and
+    before the first snippet of a session. Other process-wide state, such as
+    imported modules and changes made to them, persists across snippets.
+    """
+    if resource is not None and memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    initial_state = (os.getcwd(), dict(os.environ), list(sys.path))
+    sessions: Dict[str, dict] = {}
+    while True:
+        try:
+            code, session_id = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+
+        if code is None:
+            sessions.pop(session_id, None)
+            continue
+
+        if session_id is None:
+            safe_globals = _fresh_globals()
+            _restore_process_state(*initial_state)
+        elif session_id in sessions:
+            safe_globals = sessions[session_id]
+        else:
+            safe_globals = sessions[session_id] = _fresh_globals()
+            _restore_process_state(*initial_state)
+
+        if resource is not None and cpu_time_limit:
+            # RLIMIT_CPU counts the worker's lifetime, so allow this call's budget
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            soft = int(usage.ru_utime + usage.ru_stime) + cpu_time_limit
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+        conn.send(_run_code(code, safe_globals))
+
+
+class _PythonWorker:
+    """A warm interpreter process that executes snippets sent over a pipe.
+
+    Workers are not daemonic, so snippets can start processes of their own;
+    the pool that owns a worker must kill it.
+    """
+
+    def __init__(self, memory_limit: Optional[int], cpu_time_limit: Optional[int]):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit, cpu_time_limit),
+        )
+        self.process.start()
+        child_conn.close()
+
+    async def run(
+        self, code: str, session_id: Optional[str], timeout: float
+    ) -> Optional[Dict]:
+        """Runs a snippet, returning None if it did not finish within timeout.
+
+        Raises:
+            EOFError: If the worker process died while running the snippet.
+        """
+        self.conn.send((code, session_id))
+        if not await asyncio.to_thread(self.conn.poll, timeout):
+            return None
+        return self.conn.recv()
+
+    def drop_session(self, session_id: str) -> None:
+        self.conn.send((None, session_id))
+
+    def exit_reason(self) -> str:
+        self.process.join(1)
+        if self.process.exitcode == -getattr(signal, "SIGXCPU", 0):
+            return "CPU time limit exceeded"
+        return f"Python worker exited unexpectedly (exit code {self.process.exitcode})"
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class _PythonWorkerPool:
+    """Pre-started Python workers reused across calls.
+
+    Calls without a session take any idle worker. A session is pinned to one
+    worker so its globals persist between calls. A worker that times out, dies
+    or whose caller is cancelled mid-run is killed and replaced; the rest of
+    the pool is unaffected.
+
+    Unlike a fresh process per call, a reused worker keeps modules imported by
+    earlier snippets, including any changes made to them; only the working
+    directory, environment variables and ``sys.path`` are reset between
+    unrelated calls.
+
+    Pools are shared by every PythonExecute with the same settings and live
+    for the whole process; see get_worker_pool.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        memory_limit: Optional[int] = None,
+        cpu_time_limit: Optional[int] = None,
+    ):
+        self.size = size
+        self.memory_limit = memory_limit
+        self.cpu_time_limit = cpu_time_limit
+        # Every live worker, including busy and overflow ones, so close() can kill them
+        self._workers: Set[_PythonWorker] = set()
+        self._idle: List[_PythonWorker] = [self._spawn() for _ in range(size)]
+        self._sessions: Dict[str, _PythonWorker] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+
+    def _spawn(self) -> _PythonWorker:
+        worker = _PythonWorker(self.memory_limit, self.cpu_time_limit)
+        self._workers.add(worker)
+        return worker
+
+    def _kill(self, worker: _PythonWorker) -> None:
+        self._workers.discard(worker)
+        worker.kill()
+
+    def _acquire(self) -> _PythonWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.is_alive():
+                return worker
+            self._kill(worker)
+        # All workers are busy; overflow workers are discarded on release
+        return self._spawn()
+
+    def _release(self, worker: _PythonWorker) -> None:
+        if len(self._idle) < self.size:
+            self._idle.append(worker)
+        else:
+            self._kill(worker)
+
+    def _replace(self, worker: _PythonWorker) -> None:
+        self._kill(worker)
+        if len(self._idle) < self.size:
+            self._idle.append(self._spawn())
+
+    async def run(
+        self, code: str, timeout: float, session_id: Optional[str] = None
+    ) -> Dict:
+        if session_id is None:
+            return await self._run_on(self._acquire(), code, timeout, None)
+
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            worker = self._sessions.get(session_id)
+            if worker is None:
+                worker = self._sessions[session_id] = self._acquire()
+            return await self._run_on(worker, code, timeout, session_id)
+
+    async def _run_on(
+        self,
+        worker: _PythonWorker,
+        code: str,
+        timeout: float,
+        session_id: Optional[str],
+    ) -> Dict:
+        try:
+            result = await worker.run(code, session_id, timeout)
+        except (EOFError, OSError):
+            result = {"observation": worker.exit_reason(), "success": False}
+        except BaseException:
+            # Cancelled mid-run: the snippet may still be running, so the worker
+            # can't be handed out again and would be unreachable if kept
+            if session_id is not None:
+                self._sessions.pop(session_id, None)
+            self._replace(worker)
+            raise
+        else:
+            if result is not None:
+                if session_id is None:
+                    self._release(worker)
+                return result
+            result = {
+                "observation": f"Execution timeout after {timeout} seconds",
+                "success": False,
+            }
+
+        # The worker is stuck or dead; the session's globals are lost with it
+        if session_id is not None:
+            self._sessions.pop(session_id, None)
+        self._replace(worker)
+        return result
+
+    def release_session(self, session_id: str) -> None:
+        """Drops a session's globals and returns its worker to the pool."""
+        self._session_locks.pop(session_id, None)
+        worker = self._sessions.pop(session_id, None)
+        if worker is None:
+            return
+        try:
+            worker.drop_session(session_id)
+        except OSError:
+            self._kill(worker)
+            return
+        self._release(worker)
+
+    def close(self) -> None:
+        """Kills every worker, including those still running a snippet."""
+        for worker in list(self._workers):
+            self._kill(worker)
+        self._idle.clear()
+        self._sessions.clear()
+        self._session_locks.clear()
+
+
+_POOLS: Dict[Tuple[int, Optional[int], Optional[int]], _PythonWorkerPool] = {}
+
+
+def get_worker_pool(
+    size: int, memory_limit: Optional[int], cpu_time_limit: Optional[int]
+) -> _PythonWorkerPool:
+    """Returns the process-wide worker pool for these settings, starting it if needed."""
+    key = (size, memory_limit, cpu_time_limit)
+    pool = _POOLS.get(key)
+    if pool is None:
+        pool = _POOLS[key] = _PythonWorkerPool(size, memory_limit, cpu_time_limit)
+        # Registered again after workers start, so that it runs before
+        # multiprocessing's exit handler, which waits for non-daemon children
+        atexit.unregister(close_worker_pools)
+        atexit.register(close_worker_pools)
+    return pool
+
+
+def close_worker_pools() -> None:
+    """Kills the workers of every pool; runs at interpreter exit."""
+    for pool in _POOLS.values():
+        pool.close()
+    _POOLS.clear()
+
+
 class PythonExecute(BaseTool):
     """A tool for executing Python code with timeout and safety restrictions."""
 
@@ -18,28 +306,31 @@ class PythonExecute(BaseTool):
                 "type": "string",
                 "description": "The Python code to execute.",
             },
+            "session_id": {
+                "type": "string",
+                "description": "Optional session name. Calls with the same session_id share global variables; calls without one start with fresh globals.",
+            },
         },
         "required": ["code"],
     }
 
-    def _run_code(self, code: str, result_dict: dict, safe_globals: dict) -> None:
-        original_stdout = sys.stdout
-        try:
-            output_buffer = StringIO()
-            sys.stdout = output_buffer
-            exec(code, safe_globals, safe_globals)
-            result_dict["observation"] = output_buffer.getvalue()
-            result_dict["success"] = True
-        except Exception as e:
-            result_dict["observation"] = str(e)
-            result_dict["success"] = False
-        finally:
-            sys.stdout = original_stdout
+    pool_size: int = 2
+    # Address space limit per worker in MiB and CPU seconds per call (POSIX only)
+    memory_limit_mb: Optional[int] = None
+    cpu_time_limit: Optional[int] = None
+    # Keep globals between calls from this tool instance
+    persistent_globals: bool = False
+
+    # Prefixes this instance's session ids so that agents sharing a pool never
+    # share globals
+    _namespace: str = ""
+    _sessions: Set[str] = set()
 
     async def execute(
         self,
         code: str,
         timeout: int = 5,
+        session_id: Optional[str] = None,
     ) -> Dict:
         """
         Executes the provided Python code with a timeout.
@@ -47,29 +338,41 @@ class PythonExecute(BaseTool):
         Args:
             code (str): The Python code to execute.
             timeout (int): Execution timeout in seconds.
+            session_id (str, optional): Session whose globals persist across calls.
+                Defaults to a shared session when persistent_globals is set.
 
         Returns:
             Dict: Contains 'output' with execution output or error message and 'success' status.
         """
+        if session_id is None and self.persistent_globals:
+            session_id = "default"
+        if session_id is not None:
+            session_id = self._scoped(session_id)
+            self._sessions.add(session_id)
+        return await self._get_pool().run(code, timeout, session_id)
+
+    def _get_pool(self) -> _PythonWorkerPool:
+        return get_worker_pool(
+            self.pool_size,
+            self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb else None,
+            self.cpu_time_limit,
+        )
+
+    def _scoped(self, session_id: str) -> str:
+        if not self._namespace:
+            self._namespace = uuid.uuid4().hex
+        return f"{self._namespace}:{session_id}"
+
+    def release_session(self, session_id: str) -> None:
+        """Discards a session's globals."""
+        session_id = self._scoped(session_id)
+        if session_id in self._sessions:
+            self._sessions.discard(session_id)
+            self._get_pool().release_session(session_id)
 
-        with multiprocessing.Manager() as manager:
-            result = manager.dict({"observation": "", "success": False})
-            if isinstance(__builtins__, dict):
-                safe_globals = {"__builtins__": __builtins__}
-            else:
-                safe_globals = {"__builtins__": __builtins__.__dict__.copy()}
-            proc = multiprocessing.Process(
-                target=self._run_code, args=(code, result, safe_globals)
-            )
-            proc.start()
-            proc.join(timeout)
-
-            # timeout process
-            if proc.is_alive():
-                proc.terminate()
-                proc.join(1)
-                return {
-                    "observation": f"Execution timeout after {timeout} seconds",
-                    "success": False,
-                }
-            return dict(result)
+    async def cleanup(self):
+        """Discard this tool's sessions; the shared worker pool keeps running."""
+        pool = self._get_pool() if self._sessions else None
+        for session_id in self._sessions:
+            pool.release_session(session_id)
+        self._sessions.clear()
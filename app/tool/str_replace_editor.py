@@ -1,8 +1,10 @@
 """File and directory manipulation tool with sandbox support."""
 
-from collections import defaultdict
+import io
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, DefaultDict, List, Literal, Optional, get_args
+from typing import Any, List, Literal, NamedTuple, Optional, Tuple, get_args
 
 from app.config import config
 from app.exceptions import ToolError
@@ -45,6 +47,7 @@ Notes for using the `str_replace` command:
 * The `old_str` parameter should match EXACTLY one or more consecutive lines from the original file. Be mindful of whitespaces!
 * If the `old_str` parameter is not unique in the file, the replacement will not be performed. Make sure to include enough context in `old_str` to make it unique
 * The `new_str` parameter should contain the edited lines that should replace the `old_str`
+* To make the same replacement in several files at once, list the other files in `paths`; no file is edited unless `old_str` is unique in each of them
 """
 
 
@@ -57,6 +60,86 @@ def maybe_truncate(
     return content[:truncate_after] + TRUNCATED_MESSAGE
 
 
+class _Patch(NamedTuple):
+    """Reverses one edit: replace ``length`` characters at ``offset`` with
+    ``removed``. ``checksum`` is the CRC32 of the file right after the edit,
+    or None for a patch that changes nothing."""
+
+    offset: int
+    length: int
+    removed: str
+    checksum: Optional[int]
+
+    @property
+    def size(self) -> int:
+        # Rough memory cost, counting one byte per character of removed text
+        return len(self.removed) + 64
+
+
+def _checksum(content: str) -> int:
+    return zlib.crc32(content.encode("utf-8"))
+
+
+class EditHistory:
+    """Undo history of several files, kept as reversible patches.
+
+    Each edit stores only the text it replaced and where, not a copy of the
+    file. Once the patches of all files exceed max_bytes, the oldest patches of
+    the least recently edited files are dropped first.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._patches: "OrderedDict[str, List[_Patch]]" = OrderedDict()
+
+    def record(
+        self, path: PathLike, content: str, offset: int, removed: str, inserted: str
+    ) -> None:
+        """Record an edit that replaced ``removed`` at ``offset`` with
+        ``inserted``, leaving the file with ``content``."""
+        self._push(
+            str(path), _Patch(offset, len(inserted), removed, _checksum(content))
+        )
+
+    def record_unchanged(self, path: PathLike) -> None:
+        """Record an edit that undo leaves as it is, e.g. file creation."""
+        self._push(str(path), _Patch(0, 0, "", None))
+
+    def _push(self, path: str, patch: _Patch) -> None:
+        self._patches.setdefault(path, []).append(patch)
+        self._patches.move_to_end(path)
+        self.size += patch.size
+
+        while self.size > self.max_bytes and self._patches:
+            oldest_path, patches = next(iter(self._patches.items()))
+            self.size -= patches.pop(0).size
+            if not patches:
+                del self._patches[oldest_path]
+
+    def __contains__(self, path: PathLike) -> bool:
+        return str(path) in self._patches
+
+    def undo(self, path: PathLike, content: str) -> str:
+        """Reverse the last recorded edit of a file given its current content."""
+        patches = self._patches[str(path)]
+        patch = patches[-1]
+        if patch.checksum is not None and patch.checksum != _checksum(content):
+            raise ToolError(
+                f"{path} has changed since it was last edited, so the edit cannot be undone."
+            )
+
+        patches.pop()
+        self.size -= patch.size
+        if not patches:
+            del self._patches[str(path)]
+        return (
+            content[: patch.offset]
+            + patch.removed
+            + content[patch.offset + patch.length :]
+        )
+
+
 class StrReplaceEditor(BaseTool):
     """A tool for viewing, creating, and editing files with sandbox support."""
 
@@ -86,6 +169,11 @@ class StrReplaceEditor(BaseTool):
                 "description": "Optional parameter of `str_replace` command containing the new string (if not given, no string will be added). Required parameter of `insert` command containing the string to insert.",
                 "type": "string",
             },
+            "paths": {
+                "description": "Optional parameter of `str_replace` command: further absolute file paths in which to make the same replacement as in `path`.",
+                "items": {"type": "string"},
+                "type": "array",
+            },
             "insert_line": {
                 "description": "Required parameter of `insert` command. The `new_str` will be inserted AFTER the line `insert_line` of `path`.",
                 "type": "integer",
@@ -98,10 +186,20 @@ class StrReplaceEditor(BaseTool):
         },
         "required": ["command", "path"],
     }
-    _file_history: DefaultDict[PathLike, List[str]] = defaultdict(list)
+    # Memory budget of the undo history across all files
+    max_history_bytes: int = 16 * 1024 * 1024
+
+    _file_history: Optional[EditHistory] = None
     _local_operator: LocalFileOperator = LocalFileOperator()
     _sandbox_operator: SandboxFileOperator = SandboxFileOperator()
 
+    @property
+    def file_history(self) -> EditHistory:
+        """Undo history of the files edited by this tool instance."""
+        if self._file_history is None:
+            self._file_history = EditHistory(self.max_history_bytes)
+        return self._file_history
+
     # def _get_operator(self, use_sandbox: bool) -> FileOperator:
     def _get_operator(self) -> FileOperator:
         """Get the appropriate file operator based on execution mode."""
@@ -121,6 +219,7 @@ class StrReplaceEditor(BaseTool):
         old_str: str | None = None,
         new_str: str | None = None,
         insert_line: int | None = None,
+        paths: list[str] | None = None,
         **kwargs: Any,
     ) -> str:
         """Execute a file operation command."""
@@ -137,14 +236,21 @@ class StrReplaceEditor(BaseTool):
             if file_text is None:
                 raise ToolError("Parameter `file_text` is required for command: create")
             await operator.write_file(path, file_text)
-            self._file_history[path].append(file_text)
+            self.file_history.record_unchanged(path)
             result = ToolResult(output=f"File created successfully at: {path}")
         elif command == "str_replace":
             if old_str is None:
                 raise ToolError(
                     "Parameter `old_str` is required for command: str_replace"
                 )
-            result = await self.str_replace(path, old_str, new_str, operator)
+            if paths:
+                for other in paths:
+                    await self.validate_path(command, Path(other), operator)
+                result = await self.str_replace_many(
+                    [path, *paths], old_str, new_str, operator
+                )
+            else:
+                result = await self.str_replace(path, old_str, new_str, operator)
         elif command == "insert":
             if insert_line is None:
                 raise ToolError(
@@ -171,24 +277,25 @@ class StrReplaceEditor(BaseTool):
         if not path.is_absolute():
             raise ToolError(f"The path {path} is not an absolute path")
 
+        # Existence and type in one round-trip
+        stat = (await operator.stat_many([path]))[str(path)]
+
         # Only check if path exists for non-create commands
         if command != "create":
-            if not await operator.exists(path):
+            if not stat["exists"]:
                 raise ToolError(
                     f"The path {path} does not exist. Please provide a valid path."
                 )
 
             # Check if path is a directory
-            is_dir = await operator.is_directory(path)
-            if is_dir and command != "view":
+            if stat["is_dir"] and command != "view":
                 raise ToolError(
                     f"The path {path} is a directory and only the `view` command can be used on directories"
                 )
 
         # Check if file exists for create command
         elif command == "create":
-            exists = await operator.exists(path)
-            if exists:
+            if stat["exists"]:
                 raise ToolError(
                     f"File already exists at: {path}. Cannot overwrite files using command `create`."
                 )
@@ -237,23 +344,29 @@ class StrReplaceEditor(BaseTool):
         operator: FileOperator,
         view_range: Optional[List[int]] = None,
     ) -> CLIResult:
-        """Display file content, optionally within a specified line range."""
-        # Read file content
-        file_content = await operator.read_file(path)
-        init_line = 1
+        """Display file content, optionally within a specified line range.
 
-        # Apply view range if specified
+        Only the requested lines are read, and no more of them than can be shown
+        before the output is clipped.
+        """
+        init_line, final_line = 1, -1
         if view_range:
             if len(view_range) != 2 or not all(isinstance(i, int) for i in view_range):
                 raise ToolError(
                     "Invalid `view_range`. It should be a list of two integers."
                 )
-
-            file_lines = file_content.split("\n")
-            n_lines_file = len(file_lines)
             init_line, final_line = view_range
 
-            # Validate view range
+        # At most 4 bytes per character, and one character more than is shown
+        file_content, n_lines_file = await operator.read_lines(
+            path,
+            max(init_line, 1),
+            final_line,
+            max_bytes=(MAX_RESPONSE_LEN + 1) * 4,
+        )
+
+        # Validate view range
+        if view_range:
             if init_line < 1 or init_line > n_lines_file:
                 raise ToolError(
                     f"Invalid `view_range`: {view_range}. Its first element `{init_line}` should be "
@@ -270,12 +383,6 @@ class StrReplaceEditor(BaseTool):
                     f"larger or equal than its first `{init_line}`"
                 )
 
-            # Apply range
-            if final_line == -1:
-                file_content = "\n".join(file_lines[init_line - 1 :])
-            else:
-                file_content = "\n".join(file_lines[init_line - 1 : final_line])
-
         # Format and return result
         return CLIResult(
             output=self._make_output(file_content, str(path), init_line=init_line)
@@ -294,36 +401,19 @@ class StrReplaceEditor(BaseTool):
         old_str = old_str.expandtabs()
         new_str = new_str.expandtabs() if new_str is not None else ""
 
-        # Check if old_str is unique in the file
-        occurrences = file_content.count(old_str)
-        if occurrences == 0:
-            raise ToolError(
-                f"No replacement was performed, old_str `{old_str}` did not appear verbatim in {path}."
-            )
-        elif occurrences > 1:
-            # Find line numbers of occurrences
-            file_content_lines = file_content.split("\n")
-            lines = [
-                idx + 1
-                for idx, line in enumerate(file_content_lines)
-                if old_str in line
-            ]
-            raise ToolError(
-                f"No replacement was performed. Multiple occurrences of old_str `{old_str}` "
-                f"in lines {lines}. Please ensure it is unique"
-            )
-
         # Replace old_str with new_str
-        new_file_content = file_content.replace(old_str, new_str)
+        offset, new_file_content = self._replace_unique(
+            path, file_content, old_str, new_str
+        )
 
         # Write the new content to the file
         await operator.write_file(path, new_file_content)
 
-        # Save the original content to history
-        self._file_history[path].append(file_content)
+        # Save the replaced text to history
+        self.file_history.record(path, new_file_content, offset, old_str, new_str)
 
         # Create a snippet of the edited section
-        replacement_line = file_content.split(old_str)[0].count("\n")
+        replacement_line = file_content.count("\n", 0, offset)
         start_line = max(0, replacement_line - SNIPPET_LINES)
         end_line = replacement_line + SNIPPET_LINES + new_str.count("\n")
         snippet = "\n".join(new_file_content.split("\n")[start_line : end_line + 1])
@@ -337,6 +427,71 @@ class StrReplaceEditor(BaseTool):
 
         return CLIResult(output=success_msg)
 
+    async def str_replace_many(
+        self,
+        paths: List[PathLike],
+        old_str: str,
+        new_str: Optional[str] = None,
+        operator: FileOperator = None,
+    ) -> CLIResult:
+        """Replace a unique string with a new string in each of several files.
+
+        The files are read and written in one batch, and none is written unless
+        the replacement applies to all of them.
+        """
+        paths = list(dict.fromkeys(str(path) for path in paths))
+        contents = await operator.read_files(paths)
+        old_str = old_str.expandtabs()
+        new_str = new_str.expandtabs() if new_str is not None else ""
+
+        edits = {
+            path: self._replace_unique(
+                path, contents[path].expandtabs(), old_str, new_str
+            )
+            for path in paths
+        }
+        await operator.write_files(
+            {path: new_content for path, (_, new_content) in edits.items()}
+        )
+        for path, (offset, new_content) in edits.items():
+            self.file_history.record(path, new_content, offset, old_str, new_str)
+
+        return CLIResult(
+            output=f"The files {', '.join(paths)} have been edited. "
+            "Review the changes with `view` and make sure they are as expected."
+        )
+
+    @staticmethod
+    def _replace_unique(
+        path: PathLike, file_content: str, old_str: str, new_str: str
+    ) -> Tuple[int, str]:
+        """Replace old_str, which must occur exactly once, in file_content.
+
+        Returns the offset of the replacement and the new content.
+        """
+        occurrences = file_content.count(old_str)
+        if occurrences == 0:
+            raise ToolError(
+                f"No replacement was performed, old_str `{old_str}` did not appear verbatim in {path}."
+            )
+        elif occurrences > 1:
+            # Find line numbers of occurrences
+            file_content_lines = file_content.split("\n")
+            lines = [
+                idx + 1
+                for idx, line in enumerate(file_content_lines)
+                if old_str in line
+            ]
+            raise ToolError(
+                f"No replacement was performed. Multiple occurrences of old_str `{old_str}` "
+                f"in lines {lines} of {path}. Please ensure it is unique"
+            )
+
+        offset = file_content.index(old_str)
+        return offset, (
+            file_content[:offset] + new_str + file_content[offset + len(old_str) :]
+        )
+
     async def insert(
         self,
         path: PathLike,
@@ -378,7 +533,12 @@ class StrReplaceEditor(BaseTool):
         snippet = "\n".join(snippet_lines)
 
         await operator.write_file(path, new_file_text)
-        self._file_history[path].append(file_text)
+        if insert_line == 0:
+            offset, inserted = 0, new_str + "\n"
+        else:
+            offset = sum(len(line) + 1 for line in file_text_lines[:insert_line]) - 1
+            inserted = "\n" + new_str
+        self.file_history.record(path, new_file_text, offset, "", inserted)
 
         # Prepare success message
         success_msg = f"The file {path} has been edited. "
@@ -395,10 +555,10 @@ class StrReplaceEditor(BaseTool):
         self, path: PathLike, operator: FileOperator = None
     ) -> CLIResult:
         """Revert the last edit made to a file."""
-        if not self._file_history[path]:
+        if path not in self.file_history:
             raise ToolError(f"No edit history found for {path}.")
 
-        old_text = self._file_history[path].pop()
+        old_text = self.file_history.undo(path, await operator.read_file(path))
         await operator.write_file(path, old_text)
 
         return CLIResult(
@@ -412,21 +572,25 @@ class StrReplaceEditor(BaseTool):
         init_line: int = 1,
         expand_tabs: bool = True,
     ) -> str:
-        """Format file content for display with line numbers."""
-        file_content = maybe_truncate(file_content)
-        if expand_tabs:
-            file_content = file_content.expandtabs()
-
-        # Add line numbers to each line
-        file_content = "\n".join(
-            [
-                f"{i + init_line:6}\t{line}"
-                for i, line in enumerate(file_content.split("\n"))
-            ]
-        )
-
-        return (
-            f"Here's the result of running `cat -n` on {file_descriptor}:\n"
-            + file_content
-            + "\n"
-        )
+        """Format file content for display with line numbers.
+
+        Lines are numbered and tab-expanded one at a time, and only up to
+        MAX_RESPONSE_LEN characters of file_content are looked at.
+        """
+        limit = min(len(file_content), MAX_RESPONSE_LEN)
+        truncated = len(file_content) > MAX_RESPONSE_LEN
+
+        output = io.StringIO()
+        output.write(f"Here's the result of running `cat -n` on {file_descriptor}:\n")
+        start, line_number = 0, init_line
+        while True:
+            end = file_content.find("\n", start, limit)
+            line = file_content[start : limit if end == -1 else end]
+            if end == -1 and truncated:
+                line += TRUNCATED_MESSAGE
+            if expand_tabs:
+                line = line.expandtabs()
+            output.write(f"{line_number:6}\t{line}\n")
+            if end == -1:
+                return output.getvalue()
+            start, line_number = end + 1, line_number + 1
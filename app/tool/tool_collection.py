@@ -1,5 +1,5 @@
 """Collection classes for managing multiple tools."""
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from app.exceptions import ToolError
 from app.tool.base import BaseTool, ToolFailure, ToolResult
@@ -14,12 +14,24 @@ class ToolCollection:
     def __init__(self, *tools: BaseTool):
         self.tools = tools
         self.tool_map = {tool.name: tool for tool in tools}
+        self._params: Optional[List[Dict[str, Any]]] = None
 
     def __iter__(self):
         return iter(self.tools)
 
     def to_params(self) -> List[Dict[str, Any]]:
-        return [tool.to_param() for tool in self.tools]
+        """Return the tool schemas, memoized until the collection changes.
+
+        The same list object is returned until a tool is added, which lets
+        callers such as ``LLM.ask_tool`` key work derived from it on identity.
+        """
+        if self._params is None:
+            self._params = [tool.to_param() for tool in self.tools]
+        return self._params
+
+    def invalidate_params(self) -> None:
+        """Drop the memoized schemas so the next call rebuilds them."""
+        self._params = None
 
     async def execute(
         self, *, name: str, tool_input: Dict[str, Any] = None
@@ -50,6 +62,7 @@ class ToolCollection:
     def add_tool(self, tool: BaseTool):
         self.tools += (tool,)
         self.tool_map[tool.name] = tool
+        self.invalidate_params()
         return self
 
     def add_tools(self, *tools: BaseTool):
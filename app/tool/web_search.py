@@ -1,13 +1,19 @@
 import asyncio
-from typing import Any, Dict, List, Optional
-
-import requests
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from app.config import config
+from app.config import PROJECT_ROOT, SearchSettings, config
 from app.logger import logger
+from app.response_cache import ResponseCache
 from app.tool.base import BaseTool, ToolResult
 from app.tool.search import (
     BaiduSearchEngine,
@@ -48,6 +54,15 @@ class SearchMetadata(BaseModel):
     total_results: int = Field(description="Total number of results found")
     language: str = Field(description="Language code used for the search")
     country: str = Field(description="Country code used for the search")
+    cache_hits: int = Field(
+        default=0, description="Results and pages of this search served from cache"
+    )
+    cache_misses: int = Field(
+        default=0, description="Results and pages of this search fetched anew"
+    )
+    cache_hit_rate: Optional[float] = Field(
+        default=None, description="Share of all cache lookups so far that hit"
+    )
 
 
 class SearchResponse(ToolResult):
@@ -98,16 +113,104 @@ class SearchResponse(ToolResult):
                     f"- Country: {self.metadata.country}",
                 ]
             )
+            if self.metadata.cache_hit_rate is not None:
+                result_text.append(
+                    f"- Cache: {self.metadata.cache_hits} hits, "
+                    f"{self.metadata.cache_misses} misses "
+                    f"(overall hit rate {self.metadata.cache_hit_rate:.0%})"
+                )
 
         self.output = "\n".join(result_text)
         return self
 
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+def _extract_text(
+    html: bytes, encoding: Optional[str], max_chars: int
+) -> Optional[str]:
+    """Extract the main text of an HTML page. Runs in a worker process."""
+    # Parse HTML with BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+
+    # Remove script and style elements
+    for script in soup(["script", "style", "header", "footer", "nav"]):
+        script.extract()
+
+    # Get text content
+    text = soup.get_text(separator="\n", strip=True)
+
+    # Clean up whitespace and limit size
+    text = " ".join(text.split())
+    return text[:max_chars] if text else None
+
+
 class WebContentFetcher:
-    """Utility class for fetching web content."""
+    """Utility class for fetching web content.
 
-    @staticmethod
-    async def fetch_content(url: str, timeout: int = 10) -> Optional[str]:
+    Requests share a pooled aiohttp session per event loop with a per-host
+    connection limit. Bodies are streamed and reading stops after max_bytes,
+    since only the first max_chars characters of text are kept. Pages served
+    with an ETag or Last-Modified header are cached and revalidated with a
+    conditional GET. Text extraction runs in a process pool so parsing large
+    pages does not block the event loop.
+
+    The shared instance, CONTENT_FETCHER, lives for the whole process; the
+    entry point closes it on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 8,
+        max_bytes: int = 1024 * 1024,
+        max_chars: int = 10000,
+        cache_size: int = 256,
+        extract_workers: Optional[int] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.cache_size = cache_size
+        self.extract_workers = extract_workers
+
+        # One pooled session per event loop, since aiohttp sessions are loop-bound
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._in_flight: Dict[asyncio.AbstractEventLoop, int] = {}
+        # URL -> (ETag, Last-Modified, extracted text)
+        self._cache: OrderedDict = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.fetches = 0
+        self.not_modified = 0
+        self.bytes_read = 0
+
+    def _get_session(self, loop: asyncio.AbstractEventLoop) -> aiohttp.ClientSession:
+        # Forget sessions whose loop has gone away; they can no longer be awaited
+        for stale_loop in [l for l in self._sessions if l.is_closed()]:
+            self._sessions.pop(stale_loop)
+            self._in_flight.pop(stale_loop, None)
+
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector, headers={"User-Agent": USER_AGENT}
+            )
+            self._sessions[loop] = session
+        return session
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.extract_workers)
+        return self._executor
+
+    async def fetch_content(self, url: str, timeout: int = 10) -> Optional[str]:
         """
         Fetch and extract the main content from a webpage.
 
@@ -118,39 +221,221 @@ class WebContentFetcher:
         Returns:
             Extracted text content or None if fetching fails
         """
-        headers = {
-            "WebSearch": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        loop = asyncio.get_running_loop()
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        self._in_flight[loop] = self._in_flight.get(loop, 0) + 1
+        try:
+            self.fetches += 1
+            async with self._get_session(loop).get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 304 and cached is not None:
+                    self.not_modified += 1
+                    self._cache.move_to_end(url)
+                    return cached[2]
+
+                if response.status != 200:
+                    logger.warning(
+                        f"Failed to fetch content from {url}: HTTP {response.status}"
+                    )
+                    return None
+
+                body = await self._read_body(response)
+                encoding = response.charset
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            executor = self._get_executor()
+            text = await loop.run_in_executor(
+                executor, _extract_text, body, encoding, self.max_chars
+            )
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); start a new pool next time
+            logger.warning(f"Text extraction pool broke while fetching {url}: {e}")
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            return None
+        except Exception as e:
+            logger.warning(f"Error fetching content from {url}: {e}")
+            return None
+        finally:
+            self._in_flight[loop] -= 1
+
+        if etag or last_modified:
+            self._cache[url] = (etag, last_modified, text)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """Read the response body, stopping after max_bytes."""
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                break
+        self.bytes_read += min(size, self.max_bytes)
+        return b"".join(chunks)[: self.max_bytes]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Fetch, revalidation and byte counters."""
+        return {
+            "fetches": self.fetches,
+            "not_modified": self.not_modified,
+            "bytes_read": self.bytes_read,
+            "cached_pages": len(self._cache),
         }
 
-        try:
-            # Use asyncio to run requests in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: requests.get(url, headers=headers, timeout=timeout)
+    async def close(self) -> None:
+        """Close the running loop's session unless fetches are still using it.
+
+        The extraction process pool is shut down once no session is left.
+        """
+        loop = asyncio.get_running_loop()
+        if self._in_flight.get(loop, 0) > 0:
+            return
+        session = self._sessions.pop(loop, None)
+        self._in_flight.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+        if not self._sessions and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+CONTENT_FETCHER = WebContentFetcher()
+
+
+class _EngineStats:
+    """Moving averages of a search engine's latency and failure rate."""
+
+    # Weight of the newest search in the moving averages
+    ALPHA = 0.3
+    # Seconds an expected failure is taken to cost when ranking engines
+    FAILURE_PENALTY = 10.0
+
+    def __init__(self):
+        self.searches = 0
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.failure_rate = 0.0
+
+    def record(self, latency: float, success: bool) -> None:
+        self.searches += 1
+        if success:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.ALPHA * latency + (1 - self.ALPHA) * self.latency
             )
+        else:
+            self.failures += 1
+        self.failure_rate = (
+            self.ALPHA * (not success) + (1 - self.ALPHA) * self.failure_rate
+        )
 
-            if response.status_code != 200:
-                logger.warning(
-                    f"Failed to fetch content from {url}: HTTP {response.status_code}"
-                )
-                return None
+    def record_cancelled(self, elapsed: float, default_latency: float) -> None:
+        """Account for a search cancelled after elapsed seconds, a lower bound
+        of its latency, so engines that always lose the race rank lower."""
+        latency = self.latency if self.latency is not None else default_latency
+        if elapsed > latency:
+            self.latency = self.ALPHA * elapsed + (1 - self.ALPHA) * latency
+
+    def expected_cost(self, default_latency: float) -> float:
+        latency = self.latency if self.latency is not None else default_latency
+        return latency + self.failure_rate * self.FAILURE_PENALTY
+
+
+# Shared by all WebSearch instances, since engine health is process-wide
+_ENGINE_STATS: Dict[str, _EngineStats] = {}
+
+
+class SearchCache:
+    """Search results by query and extracted page text by URL.
+
+    Both are kept in memory with LRU+TTL eviction and, when a path is set, in an
+    SQLite file shared across runs and processes. Concurrent lookups of the
+    same query or URL share one search or fetch.
+    """
+
+    def __init__(self, settings: SearchSettings):
+        path = None
+        if settings.cache_path:
+            path = Path(settings.cache_path)
+            if not path.is_absolute():
+                path = PROJECT_ROOT / path
+        self.results = ResponseCache(
+            ttl=settings.cache_ttl,
+            max_entries=settings.cache_max_entries,
+            path=path,
+            table="search_results",
+        )
+        self.pages = ResponseCache(
+            ttl=settings.page_cache_ttl,
+            max_entries=settings.cache_max_entries,
+            path=path,
+            table="page_contents",
+        )
 
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(response.text, "html.parser")
+    @staticmethod
+    async def lookup(
+        cache: ResponseCache,
+        request: Dict[str, Any],
+        factory: Callable[[], Awaitable[Any]],
+        usage: Optional[Dict[str, int]] = None,
+    ) -> Any:
+        """Get the value for request through cache, counting the hit or miss in usage."""
+        created = False
+
+        async def create():
+            nonlocal created
+            created = True
+            return await factory()
+
+        value = await cache.get_or_create(cache.make_key(request), create)
+        if usage is not None:
+            usage["misses" if created else "hits"] += 1
+        return value
+
+    def hit_rate(self) -> Optional[float]:
+        hits = misses = 0
+        for cache in (self.results, self.pages):
+            hits += cache.hits + cache.coalesced
+            misses += cache.misses
+        return hits / (hits + misses) if hits + misses else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "results": self.results.get_stats(),
+            "pages": self.pages.get_stats(),
+            "hit_rate": self.hit_rate(),
+        }
 
-            # Remove script and style elements
-            for script in soup(["script", "style", "header", "footer", "nav"]):
-                script.extract()
 
-            # Get text content
-            text = soup.get_text(separator="\n", strip=True)
+_SEARCH_CACHE: Optional[SearchCache] = None
 
-            # Clean up whitespace and limit size (100KB max)
-            text = " ".join(text.split())
-            return text[:10000] if text else None
 
-        except Exception as e:
-            logger.warning(f"Error fetching content from {url}: {e}")
-            return None
+def _get_search_cache() -> Optional[SearchCache]:
+    """The process-wide search cache, or None when caching is disabled."""
+    global _SEARCH_CACHE
+    settings = config.search_config or SearchSettings()
+    if not settings.cache_enabled:
+        return None
+    if _SEARCH_CACHE is None:
+        _SEARCH_CACHE = SearchCache(settings)
+    return _SEARCH_CACHE
 
 
 class WebSearch(BaseTool):
@@ -190,13 +475,14 @@ class WebSearch(BaseTool):
         },
         "required": ["query"],
     }
+    max_concurrency: int = 4
     _search_engine: dict[str, WebSearchEngine] = {
         "google": GoogleSearchEngine(),
         "baidu": BaiduSearchEngine(),
         "duckduckgo": DuckDuckGoSearchEngine(),
         "bing": BingSearchEngine(),
     }
-    content_fetcher: WebContentFetcher = WebContentFetcher()
+    content_fetcher: WebContentFetcher = CONTENT_FETCHER
 
     async def execute(
         self,
@@ -247,15 +533,21 @@ class WebSearch(BaseTool):
             )
 
         search_params = {"lang": lang, "country": country}
+        cache = _get_search_cache()
+        usage = {"hits": 0, "misses": 0}
 
         # Try searching with retries when all engines fail
         for retry_count in range(max_retries + 1):
-            results = await self._try_all_engines(query, num_results, search_params)
+            results = await self._search_cached(
+                query, num_results, search_params, cache, usage
+            )
 
             if results:
                 # Fetch content if requested
                 if fetch_content:
-                    results = await self._fetch_content_for_results(results)
+                    results = await self._fetch_content_for_results(
+                        results, cache, usage
+                    )
 
                 # Return a successful structured response
                 return SearchResponse(
@@ -266,6 +558,9 @@ class WebSearch(BaseTool):
                         total_results=len(results),
                         language=lang,
                         country=country,
+                        cache_hits=usage["hits"],
+                        cache_misses=usage["misses"],
+                        cache_hit_rate=cache.hit_rate() if cache else None,
                     ),
                 )
 
@@ -287,54 +582,205 @@ class WebSearch(BaseTool):
             results=[],
         )
 
+    async def _search_cached(
+        self,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+        cache: Optional[SearchCache],
+        usage: Dict[str, int],
+    ) -> List[SearchResult]:
+        """Search all engines, reusing the results of a recent identical search."""
+        if cache is None:
+            return await self._try_all_engines(query, num_results, search_params)
+
+        async def search():
+            results = await self._try_all_engines(query, num_results, search_params)
+            # None is not cached, so a failed search is retried next time
+            return [result.model_dump() for result in results] or None
+
+        request = {"query": query, "num_results": num_results, **search_params}
+        cached = await cache.lookup(cache.results, request, search, usage)
+        return [SearchResult(**result) for result in cached or []]
+
     async def _try_all_engines(
         self, query: str, num_results: int, search_params: Dict[str, Any]
     ) -> List[SearchResult]:
-        """Try all search engines in the configured order."""
-        engine_order = self._get_engine_order()
-        failed_engines = []
+        """Try the search engines in order, hedged or one at a time."""
+        settings = config.search_config or SearchSettings()
+        if settings.hedged_search:
+            return await self._search_hedged(
+                query, num_results, search_params, settings
+            )
 
-        for engine_name in engine_order:
-            engine = self._search_engine[engine_name]
+        failed_engines = []
+        for engine_name in self._get_engine_order():
             logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
-            search_items = await self._perform_search_with_engine(
-                engine, query, num_results, search_params
+            search_items = await self._timed_search(
+                engine_name, query, num_results, search_params, retry=True
             )
 
             if not search_items:
+                failed_engines.append(engine_name)
                 continue
 
             if failed_engines:
                 logger.info(
                     f"Search successful with {engine_name.capitalize()} after trying: {', '.join(failed_engines)}"
                 )
-
-            # Transform search items into structured results
-            return [
-                SearchResult(
-                    position=i + 1,
-                    url=item.url,
-                    title=item.title
-                    or f"Result {i+1}",  # Ensure we always have a title
-                    description=item.description or "",
-                    source=engine_name,
-                )
-                for i, item in enumerate(search_items)
-            ]
+            return self._to_results(engine_name, search_items)
 
         if failed_engines:
             logger.error(f"All search engines failed: {', '.join(failed_engines)}")
         return []
 
+    async def _search_hedged(
+        self,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+        settings: SearchSettings,
+    ) -> List[SearchResult]:
+        """Start with the first engine and add the next one whenever every
+        running engine has been silent for hedge_delay seconds or one fails.
+
+        The first engine to return results wins and the others are cancelled.
+        With merge_results, engines still running get up to hedge_delay more
+        seconds to answer and all results are merged. Cancelled searches stop
+        being awaited, but their worker threads finish in the background.
+        """
+        engine_order = iter(self._get_engine_order())
+        pending: Dict[asyncio.Task, str] = {}
+        answers: List[Tuple[str, List[SearchItem]]] = []
+
+        def launch_next() -> None:
+            engine_name = next(engine_order, None)
+            if engine_name is None:
+                return
+            logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
+            task = asyncio.create_task(
+                self._timed_search(engine_name, query, num_results, search_params)
+            )
+            pending[task] = engine_name
+
+        launch_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=settings.hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    launch_next()
+                    continue
+
+                for task in done:
+                    engine_name = pending.pop(task)
+                    search_items = task.result()
+                    if search_items:
+                        answers.append((engine_name, search_items))
+                    else:
+                        launch_next()
+                if answers:
+                    break
+
+            if answers and settings.merge_results and pending:
+                done, _ = await asyncio.wait(pending, timeout=settings.hedge_delay)
+                for task in done:
+                    engine_name = pending.pop(task)
+                    if search_items := task.result():
+                        answers.append((engine_name, search_items))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if not answers:
+            logger.error("All search engines failed")
+            return []
+        if len(answers) == 1:
+            return self._to_results(*answers[0])
+        return self._merge_results(answers, num_results)
+
+    async def _timed_search(
+        self,
+        engine_name: str,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+        retry: bool = False,
+    ) -> List[SearchItem]:
+        """Search with one engine and record its latency and outcome.
+
+        Returns an empty list if the engine fails.
+        """
+        engine = self._search_engine[engine_name]
+        stats = _ENGINE_STATS.setdefault(engine_name, _EngineStats())
+        search = self._perform_search_with_engine if retry else self._search_with_engine
+        start = time.monotonic()
+        try:
+            search_items = await search(engine, query, num_results, search_params)
+        except asyncio.CancelledError:
+            settings = config.search_config or SearchSettings()
+            stats.record_cancelled(time.monotonic() - start, settings.hedge_delay)
+            raise
+        except Exception as e:
+            logger.warning(f"Search with {engine_name.capitalize()} failed: {e}")
+            search_items = []
+
+        stats.record(time.monotonic() - start, bool(search_items))
+        return search_items
+
+    @staticmethod
+    def _to_results(
+        engine_name: str, search_items: List[SearchItem]
+    ) -> List[SearchResult]:
+        """Transform search items into structured results."""
+        return [
+            SearchResult(
+                position=i + 1,
+                url=item.url,
+                title=item.title or f"Result {i+1}",  # Ensure we always have a title
+                description=item.description or "",
+                source=engine_name,
+            )
+            for i, item in enumerate(search_items)
+        ]
+
+    def _merge_results(
+        self, answers: List[Tuple[str, List[SearchItem]]], num_results: int
+    ) -> List[SearchResult]:
+        """Interleave results of several engines by rank, dropping duplicate URLs."""
+        merged: List[SearchResult] = []
+        seen = set()
+        ranked = [self._to_results(*answer) for answer in answers]
+        for rank in range(max(len(results) for results in ranked)):
+            for results in ranked:
+                if rank >= len(results):
+                    continue
+                key = results[rank].url.rstrip("/").lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                results[rank].position = len(merged) + 1
+                merged.append(results[rank])
+        return merged[:num_results]
+
     async def _fetch_content_for_results(
-        self, results: List[SearchResult]
+        self,
+        results: List[SearchResult],
+        cache: Optional[SearchCache] = None,
+        usage: Optional[Dict[str, int]] = None,
     ) -> List[SearchResult]:
         """Fetch and add web content to search results."""
         if not results:
             return []
 
         # Create tasks for each result
-        tasks = [self._fetch_single_result_content(result) for result in results]
+        tasks = [
+            self._fetch_single_result_content(result, cache, usage)
+            for result in results
+        ]
 
         # Type annotation to help type checker
         fetched_results = await asyncio.gather(*tasks)
@@ -349,10 +795,23 @@ class WebSearch(BaseTool):
             for result in fetched_results
         ]
 
-    async def _fetch_single_result_content(self, result: SearchResult) -> SearchResult:
+    async def _fetch_single_result_content(
+        self,
+        result: SearchResult,
+        cache: Optional[SearchCache] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> SearchResult:
         """Fetch content for a single search result."""
         if result.url:
-            content = await self.content_fetcher.fetch_content(result.url)
+            if cache is None:
+                content = await self.content_fetcher.fetch_content(result.url)
+            else:
+                content = await cache.lookup(
+                    cache.pages,
+                    {"url": result.url},
+                    lambda: self.content_fetcher.fetch_content(result.url),
+                    usage,
+                )
             if content:
                 result.raw_content = content
         return result
@@ -382,8 +841,41 @@ class WebSearch(BaseTool):
         )
         engine_order.extend([e for e in self._search_engine if e not in engine_order])
 
+        settings = config.search_config or SearchSettings()
+        if settings.adaptive_engine_order:
+            # Engines without history follow the ranked ones in configured order
+            # (stable sort), so an untried engine never overtakes a known one
+            engine_order.sort(
+                key=lambda e: (
+                    (0, _ENGINE_STATS[e].expected_cost(settings.hedge_delay))
+                    if e in _ENGINE_STATS
+                    else (1, 0.0)
+                )
+            )
+
         return engine_order
 
+    @staticmethod
+    def get_engine_stats() -> Dict[str, Dict[str, Any]]:
+        """Latency and failure statistics of the engines searched so far."""
+        return {
+            name: {
+                "searches": stats.searches,
+                "failures": stats.failures,
+                "avg_latency": (
+                    round(stats.latency, 3) if stats.latency is not None else None
+                ),
+                "failure_rate": round(stats.failure_rate, 3),
+            }
+            for name, stats in _ENGINE_STATS.items()
+        }
+
+    @staticmethod
+    def get_cache_stats() -> Optional[Dict[str, Any]]:
+        """Hit and miss counters of the search cache, or None when disabled."""
+        cache = _get_search_cache()
+        return cache.get_stats() if cache else None
+
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10)
     )
@@ -395,6 +887,16 @@ class WebSearch(BaseTool):
         search_params: Dict[str, Any],
     ) -> List[SearchItem]:
         """Execute search with the given engine and parameters."""
+        return await self._search_with_engine(engine, query, num_results, search_params)
+
+    async def _search_with_engine(
+        self,
+        engine: WebSearchEngine,
+        query: str,
+        num_results: int,
+        search_params: Dict[str, Any],
+    ) -> List[SearchItem]:
+        """Execute search with the given engine once, without retries."""
         return await asyncio.get_event_loop().run_in_executor(
             None,
             lambda: list(
@@ -0,0 +1,63 @@
+"""
+Measure bash tool latency for many short commands and one very large output.
+
+Runs ``--calls`` ``echo`` commands through a single ``_BashSession`` and reports
+per-call latency, then runs one command producing ``--output-mb`` megabytes and
+reports its wall time and how much output was retained after head/tail
+truncation. With sleep-polling, every command cost at least one 0.2 s poll
+interval, so 1,000 echo calls took over 200 s.
+
+Usage:
+    python -m examples.benchmarks.bash_session --calls 1000 --output-mb 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.tool.bash import _BashSession
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--output-mb", type=int, default=50)
+    args = parser.parse_args()
+
+    session = _BashSession()
+    await session.start()
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(args.calls):
+        call_start = time.perf_counter()
+        result = await session.run(f"echo {i}")
+        latencies.append(time.perf_counter() - call_start)
+        assert result.output == str(i), result
+    total = time.perf_counter() - start
+    latencies.sort()
+
+    print(f"echo calls:          {args.calls}")
+    print(f"total:               {total:.2f} s")
+    print(f"mean latency:        {statistics.fmean(latencies) * 1000:.2f} ms")
+    print(
+        f"p99 latency:         {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms"
+    )
+
+    size = args.output_mb * 1000 * 1000
+    start = time.perf_counter()
+    result = await session.run(f"head -c {size} /dev/zero | tr '\\0' x")
+    elapsed = time.perf_counter() - start
+
+    print(f"large output:        {args.output_mb} MB")
+    print(f"wall time:           {elapsed:.2f} s ({args.output_mb / elapsed:.0f} MB/s)")
+    print(f"retained:            {len(result.output)} chars")
+
+    # bash exits once its stdin is closed
+    session._process.stdin.close()
+    await session._process.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Measure browser tool startup for a sequence of agents, pooled vs. fresh launch.
+
+Serves ``--pages`` static HTML pages from a local aiohttp server, then runs
+``--agents`` agents one after another. Each agent creates a ``BrowserUseTool``,
+visits one page and cleans up. With the pool, only the first agent launches
+Chromium and the rest get a new isolated context on the running browser.
+``--baseline`` closes the pool after every agent, so each agent pays a full
+browser launch as it did before the pool.
+
+Requires a Playwright Chromium install (``playwright install chromium``).
+
+Usage:
+    python -m examples.benchmarks.browser_pool --agents 20 --baseline
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from aiohttp import web
+from browser_use import Browser as BrowserUseBrowser
+from browser_use import BrowserConfig
+
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.browser_use_tool import BrowserUseTool
+
+
+def make_static_app(pages: int) -> web.Application:
+    async def page(request: web.Request) -> web.Response:
+        index = request.match_info["index"]
+        body = (
+            f"<html><head><title>Page {index}</title></head><body>"
+            f"<h1>Page {index}</h1><a href='/page/{(int(index) + 1) % pages}'>next</a>"
+            "</body></html>"
+        )
+        return web.Response(text=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/page/{index}", page)
+    return app
+
+
+async def run_agents(base_url: str, agents: int, fresh_browser: bool) -> List[float]:
+    latencies = []
+    for i in range(agents):
+        tool = BrowserUseTool()
+        start = time.perf_counter()
+        result = await tool.execute(action="go_to_url", url=f"{base_url}/page/{i}")
+        latencies.append(time.perf_counter() - start)
+        assert not result.error, result.error
+        await tool.cleanup()
+        if fresh_browser:
+            await BROWSER_POOL.close()
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    print(f"{label}:")
+    print(f"  first agent:      {latencies[0] * 1000:.0f} ms")
+    if len(latencies) > 1:
+        rest = latencies[1:]
+        print(f"  later agents avg: {statistics.fmean(rest) * 1000:.0f} ms")
+        print(f"  later agents max: {max(rest) * 1000:.0f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--port", type=int, default=18092)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    BROWSER_POOL.browser_factory = lambda: BrowserUseBrowser(
+        BrowserConfig(headless=True)
+    )
+
+    runner = web.AppRunner(make_static_app(args.pages), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        report("browser pool", await run_agents(base_url, args.agents, False))
+        print(f"  pool: {BROWSER_POOL.get_stats()}")
+        await BROWSER_POOL.close()
+
+        if args.baseline:
+            report("browser per agent", await run_agents(base_url, args.agents, True))
+    finally:
+        await BROWSER_POOL.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Measure screenshot bytes per step and capture latency of the browser state.
+
+Serves long static HTML pages from a local aiohttp server and walks a
+``BrowserUseTool`` through ``--steps`` steps that alternate between
+navigating, scrolling and idle steps that leave the page unchanged. After
+each step, ``get_current_state`` is called and its screenshot is measured,
+using the ``[browser.screenshot]`` policy. ``--baseline`` also captures the
+screenshot the previous way (full page, JPEG quality 100) on every step.
+
+Requires a Playwright Chromium install (``playwright install chromium``).
+
+Usage:
+    python -m examples.benchmarks.browser_screenshots --steps 30 --baseline
+"""
+
+import argparse
+import asyncio
+import base64
+import statistics
+import time
+
+from aiohttp import web
+from browser_use import Browser as BrowserUseBrowser
+from browser_use import BrowserConfig
+
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.browser_use_tool import BrowserUseTool
+
+
+def make_static_app(paragraphs: int) -> web.Application:
+    async def page(request: web.Request) -> web.Response:
+        index = request.match_info["index"]
+        body = "".join(
+            f"<p>Page {index}, paragraph {i}. <a href='/page/{i}'>link {i}</a></p>"
+            for i in range(paragraphs)
+        )
+        return web.Response(
+            text=f"<html><head><title>Page {index}</title></head><body>{body}</body></html>",
+            content_type="text/html",
+        )
+
+    app = web.Application()
+    app.router.add_get("/page/{index}", page)
+    return app
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--paragraphs", type=int, default=300)
+    parser.add_argument("--port", type=int, default=18093)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    BROWSER_POOL.browser_factory = lambda: BrowserUseBrowser(
+        BrowserConfig(headless=True)
+    )
+    runner = web.AppRunner(make_static_app(args.paragraphs), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    tool = BrowserUseTool()
+    state_latencies, sizes = [], []
+    baseline_latencies, baseline_sizes = [], []
+    try:
+        for step in range(args.steps):
+            if step % 3 == 0:
+                await tool.execute(action="go_to_url", url=f"{base_url}/page/{step}")
+            elif step % 3 == 1:
+                await tool.execute(action="scroll_down", scroll_amount=600)
+            else:
+                await tool.execute(action="wait", seconds=0)
+
+            start = time.perf_counter()
+            result = await tool.get_current_state()
+            state_latencies.append(time.perf_counter() - start)
+            assert not result.error, result.error
+            sizes.append(len(result.base64_image or ""))
+
+            if args.baseline:
+                page = await tool.context.get_current_page()
+                start = time.perf_counter()
+                screenshot = await page.screenshot(
+                    full_page=True, animations="disabled", type="jpeg", quality=100
+                )
+                encoded = base64.b64encode(screenshot).decode("utf-8")
+                baseline_latencies.append(time.perf_counter() - start)
+                baseline_sizes.append(len(encoded))
+    finally:
+        await tool.cleanup()
+        await BROWSER_POOL.close()
+        await runner.cleanup()
+
+    stats = tool.screenshot_stats
+    captured = max(stats["captured"], 1)
+    print(f"steps: {args.steps}")
+    print("screenshot policy:")
+    print(f"  captured / skipped:   {stats['captured']} / {stats['skipped']}")
+    print(f"  base64 bytes / step:  {statistics.fmean(sizes):,.0f}")
+    print(f"  image tokens / image: {stats['tokens'] / captured:,.0f}")
+    print(
+        f"  capture latency:      {stats['capture_seconds'] / captured * 1000:.1f} ms"
+    )
+    print(f"  get_current_state:    {statistics.fmean(state_latencies) * 1000:.1f} ms")
+    if args.baseline:
+        print("full page, quality 100:")
+        print(f"  base64 bytes / step:  {statistics.fmean(baseline_sizes):,.0f}")
+        print(
+            f"  capture latency:      {statistics.fmean(baseline_latencies) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
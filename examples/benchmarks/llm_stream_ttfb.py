@@ -0,0 +1,119 @@
+"""
+Measure time-to-first-byte of LLM.ask versus LLM.ask_stream.
+
+Serves a fake OpenAI ``/v1/chat/completions`` endpoint that emits one token every
+``--token-delay`` seconds, then compares how long callers wait for the first
+piece of text: ``ask`` returns only after the full generation, while
+``ask_stream`` yields each delta as soon as it arrives.
+
+Usage:
+    python -m examples.benchmarks.llm_stream_ttfb --tokens 50 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from app.config import LLMSettings
+from app.llm import LLM
+
+
+def make_app(tokens: int, token_delay: float) -> web.Application:
+    def chunk(delta: dict, finish_reason=None) -> bytes:
+        body = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "stub",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n".encode()
+
+    async def completions(request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        if not payload.get("stream"):
+            await asyncio.sleep(tokens * token_delay)
+            return web.json_response(
+                {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "stub",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {
+                                "role": "assistant",
+                                "content": "tok " * tokens,
+                            },
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 1,
+                        "completion_tokens": tokens,
+                        "total_tokens": tokens + 1,
+                    },
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(chunk({"role": "assistant"}))
+        for _ in range(tokens):
+            await asyncio.sleep(token_delay)
+            await response.write(chunk({"content": "tok "}))
+        await response.write(chunk({}, finish_reason="stop"))
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=18082)
+    args = parser.parse_args()
+
+    runner = web.AppRunner(make_app(args.tokens, args.token_delay))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    settings = LLMSettings(
+        model="gpt-4o",
+        base_url=f"http://127.0.0.1:{args.port}/v1",
+        api_key="stub",
+        api_type="openai",
+        api_version="",
+    )
+    llm = LLM(config_name="ttfb-benchmark", llm_config={"default": settings})
+    messages = [{"role": "user", "content": "Count to fifty."}]
+
+    try:
+        start = time.perf_counter()
+        await llm.ask(messages, stream=False)
+        ask_ttfb = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stream_ttfb = None
+        async for _ in llm.ask_stream(messages):
+            if stream_ttfb is None:
+                stream_ttfb = time.perf_counter() - start
+        stream_total = time.perf_counter() - start
+    finally:
+        await runner.cleanup()
+
+    print(f"ask        TTFB: {ask_ttfb * 1000:8.1f} ms")
+    print(f"ask_stream TTFB: {stream_ttfb * 1000:8.1f} ms")
+    print(f"ask_stream full: {stream_total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
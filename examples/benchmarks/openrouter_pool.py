@@ -0,0 +1,102 @@
+"""
+Benchmark OpenRouter requests/sec with and without the pooled HTTP session.
+
+Starts a local stub of the ``/chat/completions`` endpoint and drives it through
+``OpenRouterChatCompletions``. The "per-request" run closes the client session
+after every call, reproducing the old behaviour of opening a new connection per
+agent step; the "pooled" run keeps the shared session alive.
+
+Usage:
+    python -m examples.benchmarks.openrouter_pool --requests 500 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+from app.bedrock import OpenRouterClient
+
+
+COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "ok"},
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+async def handle_completion(request: web.Request) -> web.Response:
+    await request.json()
+    return web.json_response(COMPLETION)
+
+
+async def start_stub_server(port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_post("/api/v1/chat/completions", handle_completion)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def run(
+    client: OpenRouterClient, requests: int, concurrency: int, pooled: bool
+) -> float:
+    """Return requests per second for the given session strategy"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request():
+        async with semaphore:
+            await client.chat.completions.create(
+                model="stub",
+                messages=[{"role": "user", "content": "ping"}],
+                stream=False,
+            )
+            if not pooled:
+                await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return requests / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=18080)
+    args = parser.parse_args()
+
+    runner = await start_stub_server(args.port)
+    try:
+        # close() is a no-op while other requests are in flight, so the
+        # per-request baseline is measured sequentially
+        runs = (
+            ("per-request", False, 1),
+            ("pooled", True, 1),
+            ("pooled", True, args.concurrency),
+        )
+        for label, pooled, concurrency in runs:
+            client = OpenRouterClient()
+            client.set_api_key("stub")
+            client.base_url = f"http://127.0.0.1:{args.port}/api/v1"
+            rps = await run(client, args.requests, concurrency, pooled)
+            print(f"{label:>12}: {rps:8.1f} req/s (concurrency={concurrency})")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
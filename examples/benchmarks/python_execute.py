@@ -0,0 +1,80 @@
+"""
+Measure PythonExecute latency for many trivial snippets.
+
+Runs ``--snippets`` ``print`` snippets through ``PythonExecute`` and reports
+total time and per-call latency. The tool keeps a pool of warm worker
+processes, so each call is one pipe round-trip. ``--baseline`` also runs the
+snippets the previous way, starting a ``multiprocessing.Manager`` and a fresh
+``Process`` per call, for comparison.
+
+Usage:
+    python -m examples.benchmarks.python_execute --snippets 500 --baseline
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from typing import Callable, List
+
+from app.tool.python_execute import PythonExecute, _fresh_globals, _run_code
+
+
+def _run_into(code: str, result: dict) -> None:
+    result.update(_run_code(code, _fresh_globals()))
+
+
+def run_per_process(code: str, timeout: int = 5) -> dict:
+    """Executes a snippet the way PythonExecute did before the worker pool."""
+    with multiprocessing.Manager() as manager:
+        result = manager.dict({"observation": "", "success": False})
+        proc = multiprocessing.Process(target=_run_into, args=(code, result))
+        proc.start()
+        proc.join(timeout)
+        if proc.is_alive():
+            proc.terminate()
+            proc.join(1)
+        return dict(result)
+
+
+async def measure(run: Callable, snippets: int) -> List[float]:
+    latencies = []
+    for i in range(snippets):
+        start = time.perf_counter()
+        result = await run(f"print({i})")
+        latencies.append(time.perf_counter() - start)
+        assert result == {"observation": f"{i}\n", "success": True}, result
+    return sorted(latencies)
+
+
+def report(label: str, latencies: List[float]) -> None:
+    print(f"{label}:")
+    print(f"  total:        {sum(latencies):.2f} s")
+    print(f"  mean latency: {statistics.fmean(latencies) * 1000:.2f} ms")
+    print(f"  p99 latency:  {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--snippets", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    tool = PythonExecute(pool_size=args.pool_size)
+    try:
+        report("worker pool", await measure(tool.execute, args.snippets))
+    finally:
+        await tool.cleanup()
+
+    if args.baseline:
+
+        async def baseline(code: str) -> dict:
+            return run_per_process(code)
+
+        report("process per call", await measure(baseline, args.snippets))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Measure repeated searches and page fetches with and without the search cache.
+
+Replaces the search engines with a simulated one that answers after
+``--latency`` seconds with results pointing at pages on a local aiohttp server.
+``--runs`` research runs each search ``--queries`` queries with
+``fetch_content``, drawn from a shared pool so that runs repeat each other's
+queries and pages, as DeepResearch follow-ups and repeated agents do. The
+cache is stored in an SQLite file in a temporary directory; a last pass
+starts from an empty in-memory cache, as a new process would, and is served
+from that file. ``--baseline`` also runs the workload with caching disabled.
+
+Usage:
+    python -m examples.benchmarks.search_cache --runs 5 --queries 10 --baseline
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from aiohttp import web
+
+from app.config import SearchSettings, config
+from app.tool import web_search
+from app.tool.search.base import SearchItem, WebSearchEngine
+from app.tool.web_search import CONTENT_FETCHER, WebSearch
+
+
+class SimulatedEngine(WebSearchEngine):
+    base_url: str
+    latency: float
+    pages: int
+    searches: int = 0
+
+    def perform_search(self, query, num_results=10, *args, **kwargs):
+        self.searches += 1
+        time.sleep(self.latency)
+        # Related queries share pages
+        first = int(query.removeprefix("query")) * 2
+        return [
+            SearchItem(
+                title=f"Page {page}", url=f"{self.base_url}/page/{page % self.pages}"
+            )
+            for page in range(first, first + num_results)
+        ]
+
+
+def make_static_app(page_delay: float) -> web.Application:
+    async def page(request: web.Request) -> web.Response:
+        app["stats"]["fetches"] += 1
+        await asyncio.sleep(page_delay)
+        index = request.match_info["index"]
+        body = f"<p>Page {index}. " + "Research content. " * 500 + "</p>"
+        return web.Response(
+            text=f"<html><body>{body}</body></html>", content_type="text/html"
+        )
+
+    app = web.Application()
+    app.router.add_get("/page/{index}", page)
+    app["stats"] = {"fetches": 0}
+    return app
+
+
+async def run_workload(runs: int, queries: int, pool: int) -> List[float]:
+    """Runs research runs one after another; returns the time each took."""
+    rng = random.Random(0)
+    durations = []
+    for _ in range(runs):
+        tool = WebSearch()
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                tool.execute(
+                    query=f"query{rng.randrange(pool)}",
+                    num_results=5,
+                    fetch_content=True,
+                )
+                for _ in range(queries)
+            )
+        )
+        durations.append(time.perf_counter() - start)
+        for response in responses:
+            assert not response.error, response.error
+            assert all(result.raw_content for result in response.results)
+    return durations
+
+
+def report(label: str, durations: List[float], engine, app) -> None:
+    print(f"{label}:")
+    print(f"  total:         {sum(durations):.2f} s")
+    print(f"  per run:       {', '.join(f'{d:.2f}' for d in durations)} s")
+    print(f"  engine calls:  {engine.searches}")
+    print(f"  page fetches:  {app['stats']['fetches']}")
+    engine.searches = app["stats"]["fetches"] = 0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--pool", type=int, default=15)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--page-delay", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=18095)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    app = make_static_app(args.page_delay)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    engine = SimulatedEngine(
+        base_url=f"http://127.0.0.1:{args.port}",
+        latency=args.latency,
+        pages=args.pool * 2 + 5,
+    )
+    WebSearch._search_engine = {"simulated": engine}
+    if config.search_config is None:
+        config._config.search_config = SearchSettings()
+    settings = config.search_config
+    settings.engine, settings.fallback_engines = "simulated", []
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            settings.cache_enabled = True
+            settings.cache_path = os.path.join(workdir, "search_cache.db")
+            web_search._SEARCH_CACHE = None
+            durations = await run_workload(args.runs, args.queries, args.pool)
+            report("search cache", durations, engine, app)
+            print(f"  cache:         {WebSearch.get_cache_stats()}")
+
+            # A new process starts with an empty memory cache and reads the file
+            web_search._SEARCH_CACHE = None
+            durations = await run_workload(1, args.queries, args.pool)
+            report("new process, shared cache file", durations, engine, app)
+            print(f"  cache:         {WebSearch.get_cache_stats()}")
+
+        if args.baseline:
+            settings.cache_enabled = False
+            durations = await run_workload(args.runs, args.queries, args.pool)
+            report("no cache", durations, engine, app)
+    finally:
+        await CONTENT_FETCHER.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
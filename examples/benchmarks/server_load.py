@@ -0,0 +1,245 @@
+"""
+Load-test the ASGI API server: p50/p99 latency and max concurrent agents.
+
+By default, starts ``server.app`` in-process under Uvicorn with its ``default``
+LLM pointed at a local fake OpenAI endpoint that answers after ``--llm-latency``
+seconds (agents get a single ``terminate`` tool call, so each run is one LLM
+round-trip). Requests are then fired at increasing concurrency levels and each
+level reports latency percentiles and errors. The highest level served without
+errors and within ``--slo-ms`` at p99 is the max concurrent agents for one
+process. Pass ``--url`` to load an already running server instead.
+
+Usage:
+    python -m examples.benchmarks.server_load --concurrency 1,8,32,128 --stream
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List, Optional
+
+import aiohttp
+import uvicorn
+from aiohttp import web
+
+from app.config import LLMSettings
+from app.llm import LLM
+from app.logger import define_log_level
+
+
+def make_llm_app(latency: float) -> web.Application:
+    def completion_body(message: dict, finish_reason: str) -> dict:
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "stub",
+            "choices": [
+                {"index": 0, "finish_reason": finish_reason, "message": message}
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    def chunk(delta: dict, finish_reason=None) -> bytes:
+        body = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "stub",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n".encode()
+
+    terminate = {
+        "id": "call_stub",
+        "type": "function",
+        "function": {"name": "terminate", "arguments": '{"status": "success"}'},
+    }
+
+    async def completions(request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        await asyncio.sleep(latency)
+        uses_tools = bool(payload.get("tools"))
+
+        if not payload.get("stream"):
+            if uses_tools:
+                message = {
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [terminate],
+                }
+                return web.json_response(completion_body(message, "tool_calls"))
+            message = {"role": "assistant", "content": "ok"}
+            return web.json_response(completion_body(message, "stop"))
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(chunk({"role": "assistant"}))
+        if uses_tools:
+            await response.write(chunk({"tool_calls": [{"index": 0, **terminate}]}))
+            await response.write(chunk({}, finish_reason="tool_calls"))
+        else:
+            await response.write(chunk({"content": "ok"}))
+            await response.write(chunk({}, finish_reason="stop"))
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(
+    session: aiohttp.ClientSession,
+    url: str,
+    payload: dict,
+    concurrency: int,
+    requests: int,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    in_flight = 0
+    peak = 0
+
+    async def one_request():
+        nonlocal errors, in_flight, peak
+        async with semaphore:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=payload) as response:
+                    body = await response.read()
+                    if response.status != 200 or b"event: error" in body:
+                        errors += 1
+                        return
+                latencies.append(time.perf_counter() - start)
+            except aiohttp.ClientError:
+                errors += 1
+            finally:
+                in_flight -= 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "peak": peak,
+        "ok": len(latencies),
+        "errors": errors,
+        "p50": percentile(latencies, 50) if latencies else float("nan"),
+        "p99": percentile(latencies, 99) if latencies else float("nan"),
+        "mean": statistics.fmean(latencies) if latencies else float("nan"),
+        "throughput": len(latencies) / elapsed,
+    }
+
+
+async def start_local_server(host: str, port: int, llm_port: int, latency: float):
+    runner = web.AppRunner(make_llm_app(latency), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, llm_port).start()
+
+    # Register the stub-backed LLM before the server asks for its singleton
+    settings = LLMSettings(
+        model="gpt-4o",
+        base_url=f"http://{host}:{llm_port}/v1",
+        api_key="stub",
+        api_type="openai",
+        api_version="",
+    )
+    LLM(config_name="default", llm_config={"default": settings})
+
+    import server
+
+    api = uvicorn.Server(
+        uvicorn.Config(server.app, host=host, port=port, log_level="warning")
+    )
+    serve = asyncio.create_task(api.serve())
+    while not api.started:
+        await asyncio.sleep(0.05)
+    return runner, api, serve
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Base URL of a running server")
+    parser.add_argument("--endpoint", choices=["agent", "chat"], default="agent")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--concurrency", default="1,8,32,64,128")
+    parser.add_argument("--requests-per-level", type=int, default=None)
+    parser.add_argument("--slo-ms", type=float, default=2000.0)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=18090)
+    parser.add_argument("--llm-port", type=int, default=18091)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    local: Optional[tuple] = None
+    base_url = args.url
+    if base_url is None:
+        # Per-step INFO logs would dominate the measurement
+        define_log_level("WARNING", "WARNING", name="server_load")
+        local = await start_local_server(
+            "127.0.0.1", args.port, args.llm_port, args.llm_latency
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    path = "/api/agent/run" if args.endpoint == "agent" else "/api/chat/completions"
+    payload = {
+        "model": "openai/gpt-4o",
+        "messages": [{"role": "user", "content": "Say ok and finish."}],
+        "stream": args.stream,
+    }
+
+    results = []
+    health = {}
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=300)
+    try:
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout
+        ) as session:
+            for level in levels:
+                requests = args.requests_per_level or level * 4
+                results.append(
+                    await run_level(session, base_url + path, payload, level, requests)
+                )
+            async with session.get(base_url + "/health") as response:
+                health = await response.json()
+    finally:
+        if local is not None:
+            runner, api, serve = local
+            api.should_exit = True
+            await serve
+            await runner.cleanup()
+
+    print(f"endpoint: {path} (stream={args.stream})")
+    print(
+        f"{'conc':>6} {'peak':>6} {'ok':>6} {'err':>5} "
+        f"{'p50 ms':>9} {'p99 ms':>9} {'req/s':>8}"
+    )
+    max_agents = 0
+    for r in results:
+        print(
+            f"{r['concurrency']:>6} {r['peak']:>6} {r['ok']:>6} {r['errors']:>5} "
+            f"{r['p50'] * 1000:>9.1f} {r['p99'] * 1000:>9.1f} {r['throughput']:>8.1f}"
+        )
+        if r["errors"] == 0 and r["p99"] * 1000 <= args.slo_ms:
+            max_agents = max(max_agents, r["peak"])
+    print(f"max concurrent agents within p99 <= {args.slo_ms:.0f} ms: {max_agents}")
+    if "agent_pool" in health:
+        print(f"agent pool: {json.dumps(health['agent_pool'])}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Measure StrReplaceEditor edit latency and undo history memory on a large file.
+
+Creates a ``--size-mb`` MB file in a temporary directory, applies ``--edits``
+``str_replace`` edits through ``StrReplaceEditor`` and reports per-edit latency
+and the size of the undo history, which keeps one reversible patch per edit.
+The previous history kept a full copy of the file per edit; the size that
+would have reached is reported for comparison. Finally every edit is undone
+and the file is checked against the original.
+
+Usage:
+    python -m examples.benchmarks.str_replace_editor --size-mb 10 --edits 1000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import tempfile
+import time
+
+from app.config import config
+from app.tool.str_replace_editor import StrReplaceEditor
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=10)
+    parser.add_argument("--edits", type=int, default=1000)
+    args = parser.parse_args()
+
+    config.sandbox.use_sandbox = False
+    line_count = args.size_mb * 1024 * 1024 // 64
+    original = "".join(f"line {i:09d} {'x' * 48}\n" for i in range(line_count))
+    step = max(line_count // args.edits, 1)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "large.txt")
+        tool = StrReplaceEditor()
+        await tool.execute(command="create", path=path, file_text=original)
+
+        latencies = []
+        for edit in range(args.edits):
+            line = edit * step % line_count
+            start = time.perf_counter()
+            await tool.execute(
+                command="str_replace",
+                path=path,
+                old_str=f"line {line:09d} ",
+                new_str=f"edited {edit} of line {line:09d}\n",
+            )
+            latencies.append(time.perf_counter() - start)
+        history_bytes = tool.file_history.size
+
+        start = time.perf_counter()
+        for _ in range(args.edits):
+            await tool.execute(command="undo_edit", path=path)
+        undo_seconds = time.perf_counter() - start
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == original, "undo did not restore the original file"
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"file: {len(original) / 1e6:.1f} MB, edits: {args.edits}")
+    print(f"  edit latency mean:  {statistics.fmean(latencies) * 1000:.1f} ms")
+    print(f"  edit latency max:   {max(latencies) * 1000:.1f} ms")
+    print(f"  undo latency mean:  {undo_seconds / args.edits * 1000:.1f} ms")
+    print(f"  undo history:       {history_bytes / 1e6:.2f} MB")
+    print(f"  full-copy history:  {len(original) * args.edits / 1e6:,.0f} MB")
+    print(f"  peak RSS:           {peak_rss:.0f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
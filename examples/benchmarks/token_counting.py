@@ -0,0 +1,87 @@
+"""
+Benchmark per-step token counting cost as agent memory grows.
+
+Simulates a ToolCallAgent run that appends an assistant tool call and its tool
+result on every step, then counts the formatted history the way ``LLM.ask_tool``
+does. With the per-message cache the per-step cost stays flat once the history
+reaches ``Memory.max_messages``; without it the cost grows with the history.
+
+Usage:
+    python -m examples.benchmarks.token_counting --steps 60 --output-chars 4000
+"""
+
+import argparse
+import time
+
+import tiktoken
+
+from app.llm import LLM, TokenCounter
+from app.schema import Function, Memory, Message, ToolCall
+
+
+def build_step_messages(step: int, output_chars: int) -> list:
+    """Create the assistant tool call and tool result produced by one step"""
+    call = ToolCall(
+        id=f"call_{step}",
+        function=Function(
+            name="python_execute", arguments=f'{{"code": "print({step})"}}'
+        ),
+    )
+    output = (f"line {step} of tool output " * (output_chars // 24 + 1))[:output_chars]
+    return [
+        Message.from_tool_calls(content=f"Step {step}", tool_calls=[call]),
+        Message.tool_message(
+            content=output, name="python_execute", tool_call_id=call.id
+        ),
+    ]
+
+
+def run(counter: TokenCounter, steps: int, output_chars: int, max_messages: int):
+    """Return per-step counting times in milliseconds"""
+    memory = Memory(max_messages=max_messages)
+    memory.add_message(Message.user_message("Summarize the repository layout."))
+    system = [Message.system_message("You are a helpful agent.")]
+
+    timings = []
+    for step in range(steps):
+        memory.add_messages(build_step_messages(step, output_chars))
+        formatted = LLM.format_messages(system + memory.messages)
+
+        start = time.perf_counter()
+        counter.count_message_tokens(formatted)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=60)
+    parser.add_argument("--output-chars", type=int, default=4000)
+    parser.add_argument("--max-messages", type=int, default=Memory().max_messages)
+    args = parser.parse_args()
+
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+    results = {
+        "uncached": run(
+            TokenCounter(tokenizer, cache_size=0),
+            args.steps,
+            args.output_chars,
+            args.max_messages,
+        ),
+        "cached": run(
+            TokenCounter(tokenizer), args.steps, args.output_chars, args.max_messages
+        ),
+    }
+
+    print(f"{'step':>6} {'uncached ms':>12} {'cached ms':>10}")
+    for step in range(0, args.steps, max(1, args.steps // 10)):
+        print(
+            f"{step + 1:>6} {results['uncached'][step]:>12.3f} "
+            f"{results['cached'][step]:>10.3f}"
+        )
+    for name, timings in results.items():
+        print(f"{name}: total {sum(timings):.1f} ms over {args.steps} steps")
+
+
+if __name__ == "__main__":
+    main()
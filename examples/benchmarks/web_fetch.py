@@ -0,0 +1,137 @@
+"""
+Measure WebContentFetcher throughput and event loop stalls on a local server.
+
+Serves ``--pages`` generated HTML pages of about ``--page-kb`` KB each, with
+ETags, from a local aiohttp server, and fetches all of them concurrently with
+``WebContentFetcher``: a pooled async client, capped body reads and text
+extraction in a process pool. A second pass shows conditional GET
+revalidation. While fetching, a ticker task records the longest event loop
+stall. ``--baseline`` also fetches the pages the previous way, with
+``requests.get`` in the default thread pool and parsing on the event loop.
+
+Usage:
+    python -m examples.benchmarks.web_fetch --pages 200 --baseline
+"""
+
+import argparse
+import asyncio
+import hashlib
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import requests
+from aiohttp import web
+
+from app.tool.web_search import USER_AGENT, WebContentFetcher, _extract_text
+
+
+def make_static_app(pages: int, page_kb: int) -> web.Application:
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing. " * 8
+    bodies = []
+    for i in range(pages):
+        body = f"<html><head><title>Page {i}</title><style>p {{margin: 0}}</style>"
+        body += f"</head><body><nav>menu</nav><h1>Page {i}</h1>"
+        body += (paragraph + "</p>") * (page_kb * 1024 // (len(paragraph) + 4))
+        body += "<footer>footer</footer></body></html>"
+        bodies.append(body.encode("utf-8"))
+    etags = [f'"{hashlib.md5(body).hexdigest()}"' for body in bodies]
+
+    async def page(request: web.Request) -> web.Response:
+        index = int(request.match_info["index"])
+        if request.headers.get("If-None-Match") == etags[index]:
+            return web.Response(status=304, headers={"ETag": etags[index]})
+        return web.Response(
+            body=bodies[index],
+            content_type="text/html",
+            charset="utf-8",
+            headers={"ETag": etags[index]},
+        )
+
+    app = web.Application()
+    app.router.add_get("/page/{index}", page)
+    return app
+
+
+async def fetch_with_requests(url: str, timeout: int = 10) -> Optional[str]:
+    """Fetches a page the way WebContentFetcher did before the pooled client."""
+    headers = {"User-Agent": USER_AGENT}
+    response = await asyncio.get_event_loop().run_in_executor(
+        None, lambda: requests.get(url, headers=headers, timeout=timeout)
+    )
+    if response.status_code != 200:
+        return None
+    return _extract_text(response.content, response.encoding, 10000)
+
+
+async def measure(
+    fetch: Callable[[str], Awaitable[Optional[str]]], urls: List[str]
+) -> Tuple[float, float]:
+    """Fetches all URLs concurrently; returns elapsed seconds and longest stall."""
+    longest_stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal longest_stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            longest_stall = max(longest_stall, time.perf_counter() - start - 0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    texts = await asyncio.gather(*(fetch(url) for url in urls))
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker_task
+    assert all(text and text.startswith("Page") for text in texts), texts[:1]
+    return elapsed, longest_stall
+
+
+def report(label: str, elapsed: float, stall: float, pages: int) -> None:
+    print(f"{label}:")
+    print(f"  total:              {elapsed:.2f} s ({pages / elapsed:.0f} pages/s)")
+    print(f"  longest loop stall: {stall * 1000:.0f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-kb", type=int, default=200)
+    parser.add_argument("--port", type=int, default=18094)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    runner = web.AppRunner(make_static_app(args.pages, args.page_kb), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    urls = [f"http://127.0.0.1:{args.port}/page/{i}" for i in range(args.pages)]
+
+    fetcher = WebContentFetcher()
+    try:
+        # Start the extraction workers outside the measurement
+        await asyncio.get_running_loop().run_in_executor(
+            fetcher._get_executor(), _extract_text, b"<p>warm</p>", None, 10
+        )
+        report(
+            "pooled fetcher", *await measure(fetcher.fetch_content, urls), args.pages
+        )
+        report(
+            "pooled fetcher, revalidated",
+            *await measure(fetcher.fetch_content, urls),
+            args.pages,
+        )
+        print(f"  {fetcher.get_stats()}")
+
+        if args.baseline:
+            report(
+                "requests in thread pool",
+                *await measure(fetch_with_requests, urls),
+                args.pages,
+            )
+    finally:
+        await fetcher.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
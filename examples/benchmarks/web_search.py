@@ -0,0 +1,104 @@
+"""
+Measure WebSearch latency with slow and failing engines, hedged vs. sequential.
+
+Replaces the search engines with simulated ones: the preferred engine answers
+after ``--slow`` seconds on most queries, one fallback fails half of the time
+and the other two answer within a fraction of a second. ``--queries`` searches
+run in hedged mode, where the next engine is queried after ``--hedge-delay``
+seconds, the first good answer wins and engine order adapts to observed
+latency and failures. ``--baseline`` also runs them with engines tried one at
+a time, each with retries, as before.
+
+Usage:
+    python -m examples.benchmarks.web_search --queries 20 --baseline
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from app.config import SearchSettings, config
+from app.tool import web_search
+from app.tool.search.base import SearchItem, WebSearchEngine
+from app.tool.web_search import WebSearch
+
+
+class SimulatedEngine(WebSearchEngine):
+    name: str
+    latency: float
+    slow_latency: float = 0.0
+    slow_rate: float = 0.0
+    failure_rate: float = 0.0
+
+    def perform_search(self, query, num_results=10, *args, **kwargs):
+        if random.random() < self.slow_rate:
+            time.sleep(self.slow_latency)
+        else:
+            time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise ConnectionError(f"{self.name} rate limited")
+        return [
+            SearchItem(title=f"{self.name} {i}", url=f"https://example.com/{query}/{i}")
+            for i in range(num_results)
+        ]
+
+
+async def run_queries(queries: int) -> List[float]:
+    tool = WebSearch()
+    latencies = []
+    for i in range(queries):
+        start = time.perf_counter()
+        response = await tool.execute(query=f"query{i}", num_results=5)
+        latencies.append(time.perf_counter() - start)
+        assert not response.error, response.error
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    print(f"{label}:")
+    print(f"  mean latency: {statistics.fmean(latencies):.2f} s")
+    print(f"  max latency:  {max(latencies):.2f} s")
+    print(f"  total:        {sum(latencies):.2f} s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--slow", type=float, default=5.0)
+    parser.add_argument("--hedge-delay", type=float, default=1.0)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    random.seed(0)
+    WebSearch._search_engine = {
+        "google": SimulatedEngine(
+            name="google", latency=0.4, slow_latency=args.slow, slow_rate=0.7
+        ),
+        "duckduckgo": SimulatedEngine(name="duckduckgo", latency=0.3),
+        "baidu": SimulatedEngine(name="baidu", latency=0.2, failure_rate=0.5),
+        "bing": SimulatedEngine(name="bing", latency=0.6),
+    }
+    if config.search_config is None:
+        config._config.search_config = SearchSettings()
+    settings = config.search_config
+    settings.engine, settings.fallback_engines = "google", ["baidu", "duckduckgo"]
+    settings.hedge_delay = args.hedge_delay
+
+    settings.hedged_search = True
+    report("hedged", await run_queries(args.queries))
+    for name, stats in WebSearch.get_engine_stats().items():
+        print(f"  {name:<10} {stats}")
+    print(f"  final engine order: {WebSearch()._get_engine_order()}")
+
+    if args.baseline:
+        web_search._ENGINE_STATS.clear()
+        settings.hedged_search = False
+        settings.adaptive_engine_order = False
+        report("one engine at a time", await run_queries(args.queries))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
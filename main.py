@@ -1,7 +1,10 @@
 import asyncio
 
 from app.agent.manus import Manus
+from app.llm import LLM
 from app.logger import logger
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.web_search import CONTENT_FETCHER
 
 
 async def main():
@@ -20,6 +23,9 @@ async def main():
     finally:
         # Ensure agent resources are cleaned up before exiting
         await agent.cleanup()
+        await BROWSER_POOL.close()
+        await LLM.close_all()
+        await CONTENT_FETCHER.close()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,10 @@ import time
 
 from app.agent.manus import Manus
 from app.flow.flow_factory import FlowFactory, FlowType
+from app.llm import LLM
 from app.logger import logger
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.web_search import CONTENT_FETCHER
 
 
 async def run_flow():
@@ -43,6 +46,10 @@ async def run_flow():
         logger.info("Operation cancelled by user.")
     except Exception as e:
         logger.error(f"Error: {str(e)}")
+    finally:
+        await BROWSER_POOL.close()
+        await LLM.close_all()
+        await CONTENT_FETCHER.close()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,10 @@ import sys
 
 from app.agent.mcp import MCPAgent
 from app.config import config
+from app.llm import LLM
 from app.logger import logger
+from app.tool.browser_pool import BROWSER_POOL
+from app.tool.web_search import CONTENT_FETCHER
 
 
 class MCPRunner:
@@ -63,6 +66,9 @@ class MCPRunner:
     async def cleanup(self) -> None:
         """Clean up agent resources."""
         await self.agent.cleanup()
+        await BROWSER_POOL.close()
+        await LLM.close_all()
+        await CONTENT_FETCHER.close()
         logger.info("Session ended")
 
 
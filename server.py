@@ -1,220 +1,323 @@
+import json
 import os
-import ssl
 import time
 import uuid
-import asyncio
-import json
-from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
 
 try:
-    from flask import Flask, jsonify, request, Response, stream_with_context
-    from flask_cors import CORS
+    import uvicorn
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse, StreamingResponse
+    from starlette.background import BackgroundTask
 except ImportError as e:
-    print(f"Error importing Flask dependencies: {e}")
-    print("Please install Flask and Flask-CORS: pip install flask==2.2.3 flask-cors==4.0.0 werkzeug==2.2.3")
+    print(f"Error importing ASGI dependencies: {e}")
+    print(
+        "Please install FastAPI and Uvicorn: pip install fastapi~=0.115.11 uvicorn~=0.34.0"
+    )
     exit(1)
 
-from werkzeug.serving import run_simple
-
 try:
-    from app.llm import LLM
     from app.agent.manus import Manus
+    from app.agent.pool import AgentPool
     from app.agent.toolcall import ToolCallAgent
-    from app.schema import Message
+    from app.llm import LLM
+    from app.logger import logger
+    from app.sandbox.client import SANDBOX_CLIENT
+    from app.schema import AgentState, Message
+    from app.tool.browser_pool import BROWSER_POOL
+    from app.tool.web_search import CONTENT_FETCHER
 except ImportError as e:
     print(f"Error importing application modules: {e}")
-    print("Please make sure all requirements are installed: pip install -r requirements.txt")
+    print(
+        "Please make sure all requirements are installed: pip install -r requirements.txt"
+    )
     exit(1)
 
-app = Flask(__name__)
-CORS(app)
+# Stop reverse proxies such as Nginx from buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the clients shared by all requests on the server's single event loop"""
+    await agent_pool.start()
+    await BROWSER_POOL.prewarm(int(os.environ.get("BROWSER_POOL_PREWARM", 0)))
+    yield
+
+    await agent_pool.cleanup()
+
+    await LLM.close_all()
 
-# Initialize agent cache
-agent_cache = {}
+    await SANDBOX_CLIENT.cleanup()
+    await BROWSER_POOL.close()
+    await CONTENT_FETCHER.close()
 
-@app.route("/health", methods=["GET"])
-def health_check():
+
+app = FastAPI(title="Agent Orchestra API", lifespan=lifespan)
+app.add_middleware(
+    CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]
+)
+
+
+def error_response(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+async def read_json(request: Request) -> Optional[dict]:
+    """Parse the request body, returning None when it is missing or malformed"""
+    try:
+        data = await request.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@app.get("/health")
+async def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "Agent Orchestra API"})
+    return {
+        "status": "healthy",
+        "service": "Agent Orchestra API",
+        "agent_pool": agent_pool.get_stats(),
+        "browser_pool": BROWSER_POOL.get_stats(),
+    }
+
 
-@app.route("/api/models", methods=["GET"])
-def list_models():
+@app.get("/api/models")
+async def list_models():
     """List available models"""
-    models = {
+    return {
         "models": [
-            {"id": "openai/gpt-4o", "name": "GPT-4o", "provider": "OpenAI via OpenRouter"},
-            {"id": "anthropic/claude-3-opus", "name": "Claude 3 Opus", "provider": "Anthropic via OpenRouter"},
-            {"id": "mistral/mistral-large", "name": "Mistral Large", "provider": "Mistral via OpenRouter"},
-            {"id": "google/gemini-2.0-flash-001", "name": "Gemini 2.0 Flash", "provider": "Google"}
+            {
+                "id": "openai/gpt-4o",
+                "name": "GPT-4o",
+                "provider": "OpenAI via OpenRouter",
+            },
+            {
+                "id": "anthropic/claude-3-opus",
+                "name": "Claude 3 Opus",
+                "provider": "Anthropic via OpenRouter",
+            },
+            {
+                "id": "mistral/mistral-large",
+                "name": "Mistral Large",
+                "provider": "Mistral via OpenRouter",
+            },
+            {
+                "id": "google/gemini-2.0-flash-001",
+                "name": "Gemini 2.0 Flash",
+                "provider": "Google",
+            },
         ]
     }
-    return jsonify(models)
 
-def get_agent_for_model(model_name: str, agent_id: str = None):
-    """Get or create an agent for the specified model"""
-    config_name = "default"
-    if model_name.startswith("anthropic/"):
-        config_name = "anthropic"
-    elif model_name.startswith("mistral/"):
-        config_name = "mistral"
-    elif model_name.startswith("google/"):
-        config_name = "gemini"
-
-    # Create a unique agent ID if not provided
-    if not agent_id:
-        agent_id = f"{config_name}-{str(uuid.uuid4())[:8]}"
 
-    # Create a cache key
-    cache_key = f"{agent_id}-{model_name}"
+def get_config_name(model_name: str) -> str:
+    """Map a model id to the LLM config section that serves it"""
+    if model_name.startswith("anthropic/"):
+        return "anthropic"
+    if model_name.startswith("mistral/"):
+        return "mistral"
+    if model_name.startswith("google/"):
+        return "gemini"
+    return "default"
 
-    # Return cached agent if exists
-    if cache_key in agent_cache:
-        return agent_cache[cache_key], cache_key
 
-    # Initialize LLM for the agent
-    llm = LLM(config_name=config_name)
+def create_agent(model_name: str, agent_id: str) -> ToolCallAgent:
+    """Create a new agent for the specified model"""
+    # LLM instances are per-config singletons whose connection pools outlive
+    # any single agent; the lifespan closes them
+    llm = LLM(config_name=get_config_name(model_name))
 
-    # Create a new agent
     if model_name.endswith("vision"):
         # Vision-capable agent
-        agent = ToolCallAgent(
+        return ToolCallAgent(
             name=agent_id,
             llm=llm,
-            description="Vision-capable agent that can process images and use tools"
-        )
-    else:
-        # Default agent
-        agent = Manus(
-            name=agent_id,
-            llm=llm,
-            description="General-purpose agent with tool-using capabilities"
+            description="Vision-capable agent that can process images and use tools",
         )
 
-    # Cache the agent
-    agent_cache[cache_key] = agent
+    # Default agent
+    return Manus(
+        name=agent_id,
+        llm=llm,
+        description="General-purpose agent with tool-using capabilities",
+    )
+
+
+def parse_warm_agents(spec: str) -> Dict[str, int]:
+    """Parse "model=count,model=count" into warm agent counts per model"""
+    warm_agents = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model_name, _, count = item.partition("=")
+        warm_agents[model_name.strip()] = int(count or 1)
+    return warm_agents
+
+
+# Pool of agents kept across requests, bounded by count, memory and idle time
+agent_pool = AgentPool(
+    create_agent,
+    max_agents=int(os.environ.get("AGENT_POOL_MAX_AGENTS", 100)),
+    max_memory_bytes=int(os.environ.get("AGENT_POOL_MAX_MEMORY_MB", 512)) * 1024**2,
+    idle_timeout=float(os.environ.get("AGENT_POOL_IDLE_TIMEOUT", 1800)),
+    warm_agents=parse_warm_agents(os.environ.get("AGENT_POOL_WARM", "")),
+)
 
+
+async def get_agent_for_model(
+    model_name: str, agent_id: str = None
+) -> Tuple[ToolCallAgent, str]:
+    """Get or create an agent for the specified model"""
+    # Create a unique agent ID if not provided
+    if not agent_id:
+        agent_id = f"{get_config_name(model_name)}-{str(uuid.uuid4())[:8]}"
+
+    # Create a cache key
+    cache_key = f"{agent_id}-{model_name}"
+
+    agent = await agent_pool.acquire(cache_key, model_name, agent_id)
     return agent, cache_key
 
-@app.route("/api/agent/run", methods=["POST"])
-async def run_agent():
+
+def lease_releaser(cache_key: str) -> Callable[[], Awaitable[None]]:
+    """Return a callback that releases the agent's pool lease at most once"""
+    released = False
+
+    async def release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            agent_pool.release(cache_key)
+
+    return release
+
+
+def format_messages(messages: List[dict]) -> List[Message]:
+    """Convert request messages to the format expected by the agent"""
+    formatted_messages = []
+    for msg in messages:
+        role = msg.get("role")
+        content = msg.get("content", "")
+
+        if role == "user":
+            formatted_messages.append(Message.user_message(content))
+        elif role == "assistant":
+            formatted_messages.append(Message.assistant_message(content))
+        elif role == "system":
+            formatted_messages.append(Message.system_message(content))
+    return formatted_messages
+
+
+@app.post("/api/agent/run")
+async def run_agent(request: Request):
     """Process requests through the agent system"""
     try:
-        data = request.json
+        data = await read_json(request)
         if not data:
-            return jsonify({"error": "Missing request body"}), 400
+            return error_response("Missing request body", 400)
 
         # Extract request parameters
         model = data.get("model", "openai/gpt-4o")
-        messages = data.get("messages", [])
         agent_id = data.get("agent_id")
         task = data.get("task")
         stream = data.get("stream", False)
 
-        # Convert messages to the format expected by the agent
-        formatted_messages = []
-        for msg in messages:
-            role = msg.get("role")
-            content = msg.get("content", "")
-
-            if role == "user":
-                formatted_messages.append(Message.user_message(content))
-            elif role == "assistant":
-                formatted_messages.append(Message.assistant_message(content))
-            elif role == "system":
-                formatted_messages.append(Message.system_message(content))
-
-        # Get or create an agent for this request
-        agent, cache_key = get_agent_for_model(model, agent_id)
-
-        # Add messages to agent memory
-        for msg in formatted_messages:
-            agent.memory.add_message(msg)
-
-        if stream:
-            # Stream response
-            return Response(
-                stream_with_context(stream_agent_response(agent, task, formatted_messages, model)),
-                content_type='text/event-stream'
-            )
-        else:
-            # Non-streaming response
-            # Set task if provided
-            if task:
-                # Create a response to process through the agent
-                response = await agent.process_task(task)
-            else:
-                # Use the last user message as the task
-                last_user_msg = next((msg for msg in reversed(formatted_messages)
-                                    if isinstance(msg, Message) and msg.role == "user"), None)
-                if last_user_msg:
-                    response = await agent.process_message(last_user_msg.content)
-                else:
-                    return jsonify({"error": "No user message or task provided"}), 400
+        formatted_messages = format_messages(data.get("messages", []))
+
+        # Without a task, the last user message is the task; it runs from memory
+        if not task and not any(msg.role == "user" for msg in formatted_messages):
+            return error_response("No user message or task provided", 400)
+
+        # Get or create an agent for this request; the pool won't evict it
+        # until the lease is released at the end of the run
+        agent, cache_key = await get_agent_for_model(model, agent_id)
+        release = lease_releaser(cache_key)
+        handed_off = False
+        try:
+            # Another request holding the lease owns the agent even before its
+            # streamed run sets RUNNING, so claim it before touching memory
+            if agent_pool.lease_count(cache_key) > 1 or agent.state != AgentState.IDLE:
+                return error_response(f"Agent '{agent.name}' is already running", 409)
+
+            # Add messages to agent memory only once the agent is claimed
+            for msg in formatted_messages:
+                agent.memory.add_message(msg)
+
+            if stream:
+                # The generator releases the lease when the run ends; the
+                # background task also does if the body is never iterated
+                handed_off = True
+                return StreamingResponse(
+                    stream_agent_response(agent, task, model, release),
+                    media_type="text/event-stream",
+                    headers=SSE_HEADERS,
+                    background=BackgroundTask(release),
+                )
+
+            response = await agent.run(task)
 
             # Format response
-            result = {
+            return {
                 "id": f"agent-{str(uuid.uuid4())}",
                 "agent_id": agent.name,
                 "created": int(time.time()),
                 "model": model,
                 "response": response,
-                "messages": agent.memory.get_messages_as_dict(),
+                "messages": agent.memory.to_dict_list(),
             }
-
-            return jsonify(result)
+        finally:
+            if not handed_off:
+                await release()
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(str(e), 500)
+
+
+async def stream_agent_response(
+    agent: ToolCallAgent,
+    task: Optional[str],
+    model: str,
+    release: Callable[[], Awaitable[None]],
+) -> AsyncIterator[str]:
+    """Generator function for streaming agent responses.
 
-async def stream_agent_response(agent, task, formatted_messages, model):
-    """Generator function for streaming agent responses"""
+    Each event is yielded whole; the ASGI server only pulls the next one once the
+    previous write has drained, so a slow client slows the agent instead of
+    growing a buffer. A client disconnect cancels the generator and the run.
+    """
     try:
         # Send event with response metadata
         event_id = f"agent-{str(uuid.uuid4())}"
-        yield f"id: {event_id}\n"
-        yield f"event: metadata\n"
-        yield f"data: {{\n"
-        yield f"data: \"id\": \"{event_id}\",\n"
-        yield f"data: \"agent_id\": \"{agent.name}\",\n"
-        yield f"data: \"created\": {int(time.time())},\n"
-        yield f"data: \"model\": \"{model}\"\n"
-        yield f"data: }}\n\n"
-
-        # Determine what to process
-        if task:
-            # Create a response generator to process through the agent
-            response_generator = agent.process_task_stream(task)
-        else:
-            # Use the last user message as the task
-            last_user_msg = next((msg for msg in reversed(formatted_messages)
-                                if isinstance(msg, Message) and msg.role == "user"), None)
-            if last_user_msg:
-                response_generator = agent.process_message_stream(last_user_msg.content)
-            else:
-                yield f"event: error\n"
-                yield f"data: No user message or task provided\n\n"
-                return
-
-        # Stream the agent's response
-        async for chunk in response_generator:
-            yield f"event: chunk\n"
-            yield f"data: {chunk}\n\n"
+        metadata = {
+            "id": event_id,
+            "agent_id": agent.name,
+            "created": int(time.time()),
+            "model": model,
+        }
+        yield f"id: {event_id}\nevent: metadata\ndata: {json.dumps(metadata)}\n\n"
+
+        # Stream content deltas and tool-call argument fragments as they arrive
+        async for chunk in agent.run_stream(task):
+            yield f"event: chunk\ndata: {json.dumps(chunk.model_dump(exclude_none=True))}\n\n"
 
         # Send completion event
-        yield f"event: done\n"
-        yield f"data: {{\n"
-        yield f"data: \"messages\": {json.dumps(agent.memory.get_messages_as_dict())}\n"
-        yield f"data: }}\n\n"
+        done = {"messages": agent.memory.to_dict_list()}
+        yield f"event: done\ndata: {json.dumps(done)}\n\n"
     except Exception as e:
-        yield f"event: error\n"
-        yield f"data: {str(e)}\n\n"
+        yield f"event: error\ndata: {str(e)}\n\n"
+    finally:
+        await release()
 
-@app.route("/api/chat/completions", methods=["POST"])
-async def chat_completions():
+
+@app.post("/api/chat/completions")
+async def chat_completions(request: Request):
     """Legacy chat completion API endpoint"""
     try:
-        data = request.json
+        data = await read_json(request)
         if not data:
-            return jsonify({"error": "Missing request body"}), 400
+            return error_response("Missing request body", 400)
 
         # Extract request parameters
         model = data.get("model", "openai/gpt-4o")
@@ -222,116 +325,77 @@ async def chat_completions():
         temperature = data.get("temperature", 0.7)
         stream = data.get("stream", False)
 
-        # For compatibility, get a simple LLM instance
-        config_name = "default"
-        if model.startswith("anthropic/"):
-            config_name = "anthropic"
-        elif model.startswith("mistral/"):
-            config_name = "mistral"
-        elif model.startswith("google/"):
-            config_name = "gemini"
-
-        llm = LLM(config_name=config_name)
+        llm = LLM(config_name=get_config_name(model))
 
         if stream:
-            # Stream response
-            return Response(
-                stream_with_context(stream_chat_response(llm, messages, temperature, model)),
-                content_type='text/event-stream'
-            )
-        else:
-            # Process request with LLM directly (non-streaming)
-            response = await llm.ask(
-                messages=messages,
-                temperature=temperature,
-                stream=False
+            return StreamingResponse(
+                stream_chat_response(llm, messages, temperature, model),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
             )
 
-            # Format response
-            result = {
-                "id": f"chatcmpl-{str(uuid.uuid4())}",
-                "object": "chat.completion",
-                "created": int(time.time()),
-                "model": model,
-                "choices": [
-                    {
-                        "index": 0,
-                        "message": {
-                            "role": "assistant",
-                            "content": response
-                        },
-                        "finish_reason": "stop"
-                    }
-                ]
-            }
+        # Process request with LLM directly (non-streaming)
+        response = await llm.ask(
+            messages=messages, temperature=temperature, stream=False
+        )
 
-            return jsonify(result)
+        # Format response
+        return {
+            "id": f"chatcmpl-{str(uuid.uuid4())}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": response},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(str(e), 500)
+
 
-async def stream_chat_response(llm, messages, temperature, model):
+async def stream_chat_response(
+    llm: LLM, messages: List[dict], temperature: float, model: str
+) -> AsyncIterator[str]:
     """Generator function for streaming chat completions"""
+    event_id = f"chatcmpl-{str(uuid.uuid4())}"
+
+    def chunk(delta: dict, finish_reason: Optional[str] = None) -> str:
+        choice = {"index": 0, "delta": delta}
+        if finish_reason:
+            choice["finish_reason"] = finish_reason
+        body = {
+            "id": event_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [choice],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
     try:
         # Send initial response message
-        event_id = f"chatcmpl-{str(uuid.uuid4())}"
-        yield f"data: {{\n"
-        yield f"data: \"id\": \"{event_id}\",\n"
-        yield f"data: \"object\": \"chat.completion.chunk\",\n"
-        yield f"data: \"created\": {int(time.time())},\n"
-        yield f"data: \"model\": \"{model}\",\n"
-        yield f"data: \"choices\": [{{\n"
-        yield f"data: \"index\": 0,\n"
-        yield f"data: \"delta\": {{\n"
-        yield f"data: \"role\": \"assistant\"\n"
-        yield f"data: }}\n"
-        yield f"data: }}]\n"
-        yield f"data: }}\n\n"
-
-        # Stream the response content
-        response_generator = llm.ask(
-            messages=messages,
-            temperature=temperature,
-            stream=True
-        )
+        yield chunk({"role": "assistant"})
 
-        async for chunk in response_generator:
-            if chunk:
-                yield f"data: {{\n"
-                yield f"data: \"id\": \"{event_id}\",\n"
-                yield f"data: \"object\": \"chat.completion.chunk\",\n"
-                yield f"data: \"created\": {int(time.time())},\n"
-                yield f"data: \"model\": \"{model}\",\n"
-                yield f"data: \"choices\": [{{\n"
-                yield f"data: \"index\": 0,\n"
-                yield f"data: \"delta\": {{\n"
-                yield f"data: \"content\": {json.dumps(chunk)}\n"
-                yield f"data: }}\n"
-                yield f"data: }}]\n"
-                yield f"data: }}\n\n"
+        # Stream the response content as the model generates it
+        async for content in llm.ask_stream(messages=messages, temperature=temperature):
+            if content:
+                yield chunk({"content": content})
 
         # Send completion message
-        yield f"data: {{\n"
-        yield f"data: \"id\": \"{event_id}\",\n"
-        yield f"data: \"object\": \"chat.completion.chunk\",\n"
-        yield f"data: \"created\": {int(time.time())},\n"
-        yield f"data: \"model\": \"{model}\",\n"
-        yield f"data: \"choices\": [{{\n"
-        yield f"data: \"index\": 0,\n"
-        yield f"data: \"delta\": {{}},\n"
-        yield f"data: \"finish_reason\": \"stop\"\n"
-        yield f"data: }}]\n"
-        yield f"data: }}\n\n"
-
-        # Send [DONE] to signify the end of the stream
-        yield f"data: [DONE]\n\n"
+        yield chunk({}, finish_reason="stop")
     except Exception as e:
-        yield f"data: {{\n"
-        yield f"data: \"error\": \"{str(e)}\"\n"
-        yield f"data: }}\n\n"
-        yield f"data: [DONE]\n\n"
+        yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    # Send [DONE] to signify the end of the stream
+    yield "data: [DONE]\n\n"
 
-def create_ssl_context():
-    """Create SSL context for HTTPS"""
+
+def ensure_ssl_certificates() -> Tuple[str, str]:
+    """Return the HTTPS certificate and key, generating self-signed ones if needed"""
     cert_dir = os.path.join(os.path.dirname(__file__), "certs")
     os.makedirs(cert_dir, exist_ok=True)
 
@@ -346,9 +410,8 @@ def create_ssl_context():
             f"-keyout {key_file} -days 365 -subj '/CN=localhost'"
         )
 
-    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-    context.load_cert_chain(cert_file, key_file)
-    return context
+    return cert_file, key_file
+
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 80))
@@ -358,21 +421,19 @@ if __name__ == "__main__":
     print(f"Agent endpoint: http://{host}:{port}/api/agent/run")
     print(f"Legacy chat endpoint: http://{host}:{port}/api/chat/completions")
 
-    try:
-        # Try to use HTTPS if certificates are available
-        context = create_ssl_context()
-        https_port = int(os.environ.get("HTTPS_PORT", 443))
-        print(f"HTTPS also available on port {https_port}")
-
-        # For port 80, we'll use the standard HTTP server instead of run_simple
-        # since port 80 usually requires root privileges
-        if port < 1024 and os.geteuid() != 0:
-            print("Warning: Ports below 1024 typically require root privileges.")
-            print("Consider using sudo or a reverse proxy like Nginx.")
-
-        # Start the server
-        app.run(host=host, port=port, ssl_context=context if port == 443 else None)
-    except Exception as e:
-        print(f"Failed to start server: {e}")
-        print("Falling back to HTTP (not secure)...")
-        app.run(host=host, port=port)
+    if port < 1024 and os.geteuid() != 0:
+        print("Warning: Ports below 1024 typically require root privileges.")
+        print("Consider using sudo or a reverse proxy like Nginx.")
+
+    ssl_options = {}
+    if port == 443:
+        try:
+            cert_file, key_file = ensure_ssl_certificates()
+            ssl_options = {"ssl_certfile": cert_file, "ssl_keyfile": key_file}
+        except Exception as e:
+            print(f"Failed to set up HTTPS: {e}")
+            print("Falling back to HTTP (not secure)...")
+
+    # A single worker process runs every request on one persistent event loop,
+    # so LLM clients, connection pools and agents are shared between requests
+    uvicorn.run(app, host=host, port=port, **ssl_options)
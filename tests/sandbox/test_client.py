@@ -77,6 +77,26 @@ async def test_local_file_operations(local_client: LocalSandboxClient, temp_dir:
     assert dst_file.read_text().strip() == test_content
 
 
+@pytest.mark.asyncio
+async def test_local_batch_file_operations(local_client: LocalSandboxClient):
+    """Tests batched file reads, writes and stats in local sandbox."""
+    await local_client.create()
+
+    files = {f"/workspace/pkg{i % 3}/mod{i}.py": f"value = {i}\n" for i in range(20)}
+    await local_client.write_files(files)
+    assert await local_client.read_files(list(files)) == files
+
+    stats = await local_client.stat_many(
+        ["/workspace/pkg0", "/workspace/pkg0/mod0.py", "/workspace/missing"]
+    )
+    assert stats["/workspace/pkg0"] == {"exists": True, "is_dir": True}
+    assert stats["/workspace/pkg0/mod0.py"] == {"exists": True, "is_dir": False}
+    assert stats["/workspace/missing"] == {"exists": False, "is_dir": False}
+
+    with pytest.raises(FileNotFoundError):
+        await local_client.read_files(["/workspace/pkg0/mod0.py", "/missing.txt"])
+
+
 @pytest.mark.asyncio
 async def test_local_volume_binding(local_client: LocalSandboxClient, temp_dir: Path):
     """Tests volume binding in local sandbox."""
@@ -46,6 +46,26 @@ async def test_sandbox_file_operations(sandbox):
     assert content.strip() == test_content
 
 
+@pytest.mark.asyncio
+async def test_sandbox_read_lines(sandbox):
+    """Tests reading line ranges through the line offset index."""
+    lines = [f"line {i}" for i in range(1, 2501)]
+    await sandbox.write_file("/workspace/lines.txt", "\n".join(lines) + "\n")
+
+    content, total = await sandbox.read_lines("/workspace/lines.txt", 1200, 1202)
+    assert content == "line 1200\nline 1201\nline 1202"
+    assert total == 2501
+
+    content, _ = await sandbox.read_lines("/workspace/lines.txt", 2499, -1)
+    assert content == "line 2499\nline 2500\n"
+
+    # The index is rebuilt when the file changes
+    await sandbox.write_file("/workspace/lines.txt", "first\nsecond")
+    content, total = await sandbox.read_lines("/workspace/lines.txt", 2, 2)
+    assert content == "second"
+    assert total == 2
+
+
 @pytest.mark.asyncio
 async def test_sandbox_python_execution(sandbox):
     """Tests Python code execution in sandbox."""
@@ -86,6 +106,31 @@ async def test_sandbox_file_persistence(sandbox):
         assert content.strip() == expected_content
 
 
+@pytest.mark.asyncio
+async def test_sandbox_copy_directory(sandbox, tmp_path):
+    """Tests streaming directory copies to and from the sandbox."""
+    src = tmp_path / "src"
+    (src / "nested").mkdir(parents=True)
+    (src / "small.txt").write_text("small")
+    (src / "nested" / "large.bin").write_bytes(b"x" * (8 * 1024 * 1024 + 3))
+
+    await sandbox.copy_to(str(src), "/workspace/copied")
+    content = await sandbox.read_file("/workspace/copied/small.txt")
+    assert content == "small"
+
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    await sandbox.copy_from("/workspace/copied", str(dst))
+    assert (dst / "copied" / "small.txt").read_text() == "small"
+    assert (
+        dst / "copied" / "nested" / "large.bin"
+    ).stat().st_size == 8 * 1024 * 1024 + 3
+
+    # A directory cannot be copied onto a file path
+    with pytest.raises(RuntimeError):
+        await sandbox.copy_from("/workspace/copied", str(tmp_path / "file.txt"))
+
+
 @pytest.mark.asyncio
 async def test_sandbox_python_environment(sandbox):
     """Tests Python environment configuration."""
@@ -0,0 +1,179 @@
+import asyncio
+from typing import AsyncGenerator, Dict, Optional
+
+import pytest
+import pytest_asyncio
+
+from app.config import SandboxSettings
+from app.sandbox.core.manager import SandboxManager
+
+
+class FakeImages:
+    def get(self, image: str) -> str:
+        return image
+
+
+class FakeDockerClient:
+    """Docker client stand-in; every image is already available."""
+
+    images = FakeImages()
+
+
+class FakeSandbox:
+    """DockerSandbox stand-in that counts lifecycle calls instead of using Docker."""
+
+    created = 0
+    resets = 0
+    cleanups = 0
+
+    def __init__(
+        self,
+        config: Optional[SandboxSettings] = None,
+        volume_bindings: Optional[Dict[str, str]] = None,
+    ):
+        self.config = config or SandboxSettings()
+        self.volume_bindings = volume_bindings or {}
+        self.files: Dict[str, str] = {}
+
+    async def create(self) -> "FakeSandbox":
+        await asyncio.sleep(0.05)  # Container startup
+        FakeSandbox.created += 1
+        return self
+
+    async def reset(self) -> None:
+        FakeSandbox.resets += 1
+        self.files.clear()
+
+    async def cleanup(self) -> None:
+        FakeSandbox.cleanups += 1
+
+
+@pytest_asyncio.fixture(scope="function")
+async def manager() -> AsyncGenerator[SandboxManager, None]:
+    """Creates a pooled sandbox manager backed by fakes."""
+    FakeSandbox.created = FakeSandbox.resets = FakeSandbox.cleanups = 0
+    manager = SandboxManager(
+        max_sandboxes=4,
+        idle_timeout=60,
+        cleanup_interval=30,
+        min_idle=1,
+        max_idle=2,
+        client=FakeDockerClient(),
+        sandbox_factory=FakeSandbox,
+    )
+    try:
+        yield manager
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_fills_pool(manager):
+    """Tests that prewarming creates min_idle ready sandboxes."""
+    await manager.prewarm()
+
+    stats = manager.get_stats()
+    assert stats["warm_sandboxes"] == 1
+    assert stats["total_sandboxes"] == 0
+    assert FakeSandbox.created == 1
+
+
+@pytest.mark.asyncio
+async def test_create_uses_warm_sandbox(manager):
+    """Tests that a warm sandbox is handed out without creating a new one."""
+    await manager.prewarm()
+
+    sandbox_id = await manager.create_sandbox()
+    assert sandbox_id in manager._sandboxes
+    assert FakeSandbox.created == 1
+
+    stats = manager.get_stats()
+    assert stats["pool_hits"] == 1
+    assert stats["pool_misses"] == 0
+    assert stats["pool_hit_rate"] == 1.0
+
+    # The pool is topped back up to min_idle in the background
+    await asyncio.sleep(0.1)
+    assert manager.get_stats()["warm_sandboxes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_release_resets_and_recycles(manager):
+    """Tests that released sandboxes are reset and reused, not destroyed."""
+    sandbox_id = await manager.create_sandbox()
+    sandbox = manager._sandboxes[sandbox_id]
+    sandbox.files["/workspace/out.txt"] = "data"
+    await asyncio.sleep(0.1)  # Let the pool refill
+
+    await manager.release_sandbox(sandbox_id)
+    assert sandbox_id not in manager._sandboxes
+    assert FakeSandbox.resets == 1
+    assert FakeSandbox.cleanups == 0
+    assert manager.get_stats()["warm_sandboxes"] == 2
+
+    # The pool is full, so the next release destroys the sandbox instead
+    first = await manager.create_sandbox()
+    second = await manager.create_sandbox()
+    third = await manager.create_sandbox()
+    assert not sandbox.files
+    for sandbox_id in (first, second, third):
+        await manager.release_sandbox(sandbox_id)
+    assert manager.get_stats()["warm_sandboxes"] == manager.max_idle
+    assert FakeSandbox.cleanups >= 1
+
+
+@pytest.mark.asyncio
+async def test_volume_bindings_bypass_pool(manager):
+    """Tests that sandboxes with volume bindings are never pooled."""
+    await manager.prewarm()
+
+    sandbox_id = await manager.create_sandbox(volume_bindings={"/tmp": "/data"})
+    assert manager.get_stats()["pool_misses"] == 1
+
+    await manager.release_sandbox(sandbox_id)
+    assert FakeSandbox.resets == 0
+    assert FakeSandbox.cleanups == 1
+
+
+@pytest.mark.asyncio
+async def test_acquisition_latency_stats(manager):
+    """Tests that warm acquisitions are reflected in latency statistics."""
+    await manager.create_sandbox()
+    await asyncio.sleep(0.1)
+    await manager.create_sandbox()
+
+    stats = manager.get_stats()
+    assert stats["pool_hits"] == 1
+    assert stats["pool_misses"] == 1
+    assert stats["acquire_latency_p95"] >= 0.05
+    assert stats["acquire_latency_avg"] < stats["acquire_latency_p95"]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_destroys_warm_sandboxes(manager):
+    """Tests manager cleanup also destroys pooled sandboxes."""
+    await manager.prewarm()
+    await manager.create_sandbox()
+
+    await manager.cleanup()
+    assert not manager._sandboxes
+    assert manager.get_stats()["warm_sandboxes"] == 0
+    assert FakeSandbox.cleanups == FakeSandbox.created
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_counts_no_misses():
+    """Tests that acquisitions are not counted as misses without a warm pool."""
+    manager = SandboxManager(client=FakeDockerClient(), sandbox_factory=FakeSandbox)
+    try:
+        await manager.create_sandbox()
+
+        stats = manager.get_stats()
+        assert stats["pool_misses"] == 0
+        assert stats["pool_hit_rate"] == 0.0
+    finally:
+        await manager.cleanup()
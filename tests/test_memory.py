@@ -0,0 +1,107 @@
+import re
+from typing import List
+
+from app.schema import Function, Memory, Message, Role, ToolCall
+
+
+def count_tokens(messages: List[dict]) -> int:
+    """Roughly four characters per token, plus per-message and request overhead."""
+    return 3 + sum(
+        4
+        + (len(str(m.get("content") or "")) + len(str(m.get("tool_calls") or ""))) // 4
+        for m in messages
+    )
+
+
+def exchange(step: int, calls: int = 2, output_chars: int = 2000) -> List[Message]:
+    tool_calls = [
+        ToolCall(
+            id=f"call_{step}_{i}",
+            function=Function(name="python_execute", arguments="{}"),
+        )
+        for i in range(calls)
+    ]
+    return [Message.from_tool_calls(tool_calls, content=f"Step {step}")] + [
+        Message.tool_message(
+            f"output {step} " + "x" * output_chars,
+            name="python_execute",
+            tool_call_id=call.id,
+        )
+        for call in tool_calls
+    ]
+
+
+def make_memory(steps: int, **kwargs) -> Memory:
+    memory = Memory(max_messages=1000, **kwargs)
+    memory.add_messages(
+        [Message.system_message("You are an agent"), Message.user_message("The task")]
+    )
+    for step in range(steps):
+        memory.add_messages(exchange(step))
+    return memory
+
+
+def assert_no_orphan_tool_messages(messages: List[Message]) -> None:
+    call_ids = set()
+    for message in messages:
+        if message.role == Role.TOOL:
+            assert message.tool_call_id in call_ids, message
+        elif message.tool_calls:
+            call_ids = {call.id for call in message.tool_calls}
+        else:
+            call_ids = set()
+
+
+def test_compact_keeps_system_task_and_recent_messages():
+    memory = make_memory(steps=20, keep_recent_messages=6)
+    recent = [message.model_copy() for message in memory.messages[-6:]]
+
+    total = memory.compact(count_tokens, max_tokens=3000)
+
+    assert total <= 3000
+    assert memory.messages[0].content == "You are an agent"
+    assert memory.messages[1].content == "The task"
+    assert memory.messages[-6:] == recent
+    assert memory.compaction_stats["messages_dropped"] > 0
+    assert_no_orphan_tool_messages(memory.messages)
+
+
+def test_compact_updates_one_drop_note():
+    memory = make_memory(steps=10)
+    memory.compact(count_tokens, max_tokens=3000)
+    first_dropped = memory.compaction_stats["messages_dropped"]
+    for step in range(10, 20):
+        memory.add_messages(exchange(step))
+    memory.compact(count_tokens, max_tokens=3000)
+
+    notes = [
+        m
+        for m in memory.messages
+        if "earlier messages were removed" in (m.content or "")
+    ]
+    assert len(notes) == 1
+    dropped = int(re.search(r"\[(\d+) earlier", notes[0].content).group(1))
+    assert dropped == memory.compaction_stats["messages_dropped"] > first_dropped > 0
+    # 2 + 3 * 20 messages were added, plus the note
+    assert len(memory.messages) == 2 + 3 * 20 - dropped + 1
+    assert_no_orphan_tool_messages(memory.messages)
+
+
+def test_compact_within_budget_changes_nothing():
+    memory = make_memory(steps=2)
+    before = [message.model_copy() for message in memory.messages]
+
+    memory.compact(count_tokens, max_tokens=100_000)
+
+    assert memory.messages == before
+    assert memory.compaction_stats["compactions"] == 0
+
+
+def test_trim_never_starts_with_a_tool_result():
+    memory = make_memory(steps=5)
+    memory.max_messages = 5
+    memory.add_message(Message.user_message("Next"))
+
+    assert memory.messages[0].role != Role.TOOL
+    assert len(memory.messages) <= 5
+    assert_no_orphan_tool_messages(memory.messages)
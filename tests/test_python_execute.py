@@ -0,0 +1,29 @@
+import pytest
+
+from app.tool.python_execute import PythonExecute
+
+
+@pytest.mark.asyncio
+async def test_snippets_can_start_processes():
+    tool = PythonExecute()
+    code = (
+        "import multiprocessing\n"
+        "with multiprocessing.Pool(2) as pool:\n"
+        "    print(pool.map(abs, [-1, -2]))"
+    )
+
+    assert await tool.execute(code) == {"observation": "[1, 2]\n", "success": True}
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_scoped_to_the_tool():
+    first, second = PythonExecute(), PythonExecute()
+    await first.execute("x = 1", session_id="s")
+
+    assert (await first.execute("print(x)", session_id="s"))["observation"] == "1\n"
+    assert not (await second.execute("print(x)", session_id="s"))["success"]
+
+    await first.cleanup()
+    assert not (await first.execute("print(x)", session_id="s"))["success"]
+    await first.cleanup()
+    await second.cleanup()
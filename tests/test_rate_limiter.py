@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from app.rate_limiter import RateLimiter, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_refunds_its_reservation():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+    await limiter.acquire(tokens=6000)  # Empties the token bucket
+
+    waiting = asyncio.create_task(limiter.acquire(tokens=3000))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    # Only the first request's usage remains reserved
+    assert limiter.token_bucket.reserve(0) == 0.0
+    assert limiter.token_bucket._level == pytest.approx(0, abs=5)
+    assert limiter.request_bucket._level == pytest.approx(59, abs=0.1)
+
+
+def test_drain_removes_burst_capacity():
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(1) == 0.0
+
+    bucket.drain()
+
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(1) == pytest.approx(2.0, abs=0.05)
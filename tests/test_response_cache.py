@@ -0,0 +1,70 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.response_cache import ResponseCache
+
+
+@pytest.mark.asyncio
+async def test_coalesced_waiter_survives_starter_cancellation():
+    """Cancelling the caller that started a computation must not fail the waiters."""
+    cache = ResponseCache()
+    calls = 0
+    release = asyncio.Event()
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    starter = asyncio.create_task(cache.get_or_create("k", factory))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_create("k", factory))
+    await asyncio.sleep(0)
+
+    starter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await starter
+
+    release.set()
+    assert await waiter == "value"
+    assert calls == 1
+    assert await cache.get("k") == "value"
+
+
+@pytest.mark.asyncio
+async def test_coalesced_waiter_receives_factory_error():
+    cache = ResponseCache()
+
+    async def factory():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream failed")
+
+    results = await asyncio.gather(
+        cache.get_or_create("k", factory),
+        cache.get_or_create("k", factory),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get_stats()["coalesced"] == 1
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_store_read_error_is_a_miss(tmp_path, monkeypatch):
+    cache = ResponseCache(path=tmp_path / "cache.db", table="search_results")
+
+    def locked(key):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache.store, "get", locked)
+
+    async def factory():
+        return "fresh"
+
+    assert await cache.get("k") is None
+    assert await cache.get_or_create("k", factory) == "fresh"
+    assert cache.get_stats()["misses"] == 1
@@ -0,0 +1,91 @@
+import pytest
+
+from app.exceptions import ToolError
+from app.tool.file_operators import LocalFileOperator
+from app.tool.str_replace_editor import EditHistory, StrReplaceEditor
+
+
+@pytest.mark.asyncio
+async def test_str_replace_many_edits_every_file(tmp_path):
+    editor, operator = StrReplaceEditor(), LocalFileOperator()
+    paths = [tmp_path / "a.py", tmp_path / "b.py"]
+    for path in paths:
+        path.write_text(f"import old_name\n# {path.name}\n")
+
+    await editor.str_replace_many(paths, "old_name", "new_name", operator)
+
+    for path in paths:
+        assert path.read_text() == f"import new_name\n# {path.name}\n"
+        await editor.undo_edit(str(path), operator)
+        assert path.read_text() == f"import old_name\n# {path.name}\n"
+
+
+@pytest.mark.asyncio
+async def test_str_replace_many_is_all_or_nothing(tmp_path):
+    editor, operator = StrReplaceEditor(), LocalFileOperator()
+    edited, duplicated = tmp_path / "a.py", tmp_path / "b.py"
+    edited.write_text("old_name\n")
+    duplicated.write_text("old_name\nold_name\n")
+
+    with pytest.raises(ToolError, match="Multiple occurrences"):
+        await editor.str_replace_many(
+            [edited, duplicated], "old_name", "new_name", operator
+        )
+
+    assert edited.read_text() == "old_name\n"
+    assert str(edited) not in editor.file_history
+
+
+@pytest.mark.asyncio
+async def test_undo_round_trips_interleaved_edits(tmp_path):
+    editor, operator = StrReplaceEditor(), LocalFileOperator()
+    first, second = tmp_path / "first.py", tmp_path / "second.py"
+    first.write_text("a = 1\nb = 2\n")
+    second.write_text("x = 1\n")
+    versions = {first: [first.read_text()], second: [second.read_text()]}
+
+    async def edit(path, action):
+        await action
+        versions[path].append(path.read_text())
+
+    await edit(first, editor.str_replace(str(first), "a = 1", "a = 10", operator))
+    await edit(second, editor.insert(str(second), 1, "y = 2", operator))
+    await edit(first, editor.insert(str(first), 0, "import os", operator))
+    await edit(second, editor.str_replace(str(second), "x = 1\n", "", operator))
+    await edit(first, editor.str_replace(str(first), "b = 2", "b = 20", operator))
+
+    for path in (second, first, second, first, first):
+        versions[path].pop()
+        await editor.undo_edit(str(path), operator)
+        assert path.read_text() == versions[path][-1]
+    assert str(first) not in editor.file_history
+    assert str(second) not in editor.file_history
+    assert editor.file_history.size == 0
+
+
+def test_history_evicts_oldest_files_first():
+    history = EditHistory(max_bytes=3 * (100 + 64))
+    for name in ("old", "middle", "new"):
+        history.record(name, "content", 0, "r" * 100, "inserted")
+    assert history.size == 3 * (100 + 64)
+
+    history.record("middle", "content", 0, "r" * 100, "inserted")
+
+    assert "old" not in history
+    assert "middle" in history and "new" in history
+    assert history.size <= history.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_undo_refuses_after_external_change(tmp_path):
+    editor, operator = StrReplaceEditor(), LocalFileOperator()
+    path = tmp_path / "a.py"
+    path.write_text("a = 1\n")
+    await editor.str_replace(str(path), "a = 1", "a = 2", operator)
+    path.write_text("a = 3\n")
+
+    with pytest.raises(ToolError, match="has changed"):
+        await editor.undo_edit(str(path), operator)
+
+    assert path.read_text() == "a = 3\n"
+    assert str(path) in editor.file_history
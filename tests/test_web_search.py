@@ -0,0 +1,131 @@
+import time
+from typing import List
+
+import pytest
+
+from app.config import SearchSettings, config
+from app.tool import web_search
+from app.tool.search.base import SearchItem, WebSearchEngine
+from app.tool.web_search import WebSearch, _EngineStats
+
+
+class FakeEngine(WebSearchEngine):
+    delay: float = 0.0
+    urls: List[str] = []
+    searches: int = 0
+
+    def perform_search(self, query, num_results=10, *args, **kwargs):
+        self.searches += 1
+        time.sleep(self.delay)
+        return [SearchItem(title=url, url=url) for url in self.urls[:num_results]]
+
+
+@pytest.fixture
+def settings(monkeypatch) -> SearchSettings:
+    settings = SearchSettings(
+        engine="first",
+        fallback_engines=["second", "third"],
+        hedged_search=True,
+        hedge_delay=0.1,
+        adaptive_engine_order=False,
+        cache_enabled=False,
+    )
+    monkeypatch.setattr(config._config, "search_config", settings)
+    monkeypatch.setattr(web_search, "_ENGINE_STATS", {})
+    return settings
+
+
+def make_tool(**engines: FakeEngine) -> WebSearch:
+    tool = WebSearch()
+    tool._search_engine = engines
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_adds_an_engine_when_the_first_is_slow(settings):
+    slow = FakeEngine(delay=0.5, urls=["https://slow/1"])
+    fast = FakeEngine(delay=0.0, urls=["https://fast/1"])
+    unused = FakeEngine(urls=["https://unused/1"])
+    tool = make_tool(first=slow, second=fast, third=unused)
+
+    start = time.monotonic()
+    results = await tool._try_all_engines("query", 5, {})
+
+    assert [r.source for r in results] == ["second"]
+    assert time.monotonic() - start < 0.4
+    assert unused.searches == 0
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_moves_on_at_once_after_a_failure(settings):
+    settings.hedge_delay = 5.0
+    failing = FakeEngine(urls=[])
+    working = FakeEngine(urls=["https://ok/1"])
+    tool = make_tool(first=failing, second=working, third=FakeEngine())
+
+    start = time.monotonic()
+    results = await tool._try_all_engines("query", 5, {})
+
+    assert [r.url for r in results] == ["https://ok/1"]
+    assert time.monotonic() - start < 1.0
+    assert web_search._ENGINE_STATS["first"].failures == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_merges_engines_that_answer_together(settings):
+    settings.merge_results = True
+    first = FakeEngine(delay=0.15, urls=["https://a/1", "https://shared/"])
+    second = FakeEngine(delay=0.0, urls=["https://b/1", "https://SHARED"])
+    tool = make_tool(first=first, second=second, third=FakeEngine())
+
+    results = await tool._try_all_engines("query", 5, {})
+
+    assert [r.url for r in results] == ["https://b/1", "https://a/1", "https://SHARED"]
+
+
+def test_merge_results_interleaves_by_rank_without_duplicates():
+    answers = [
+        ("one", [SearchItem(title="", url=u) for u in ["https://x/1", "https://x/2"]]),
+        ("two", [SearchItem(title="", url=u) for u in ["https://X/1/", "https://y/2"]]),
+    ]
+
+    merged = WebSearch()._merge_results(answers, 3)
+
+    assert [r.url for r in merged] == ["https://x/1", "https://x/2", "https://y/2"]
+    assert [r.position for r in merged] == [1, 2, 3]
+    assert [r.source for r in merged] == ["one", "one", "two"]
+
+
+def test_engine_stats_moving_averages():
+    stats = _EngineStats()
+    assert stats.expected_cost(default_latency=2.0) == 2.0
+
+    stats.record(1.0, success=True)
+    stats.record(2.0, success=True)
+    assert stats.latency == pytest.approx(0.3 * 2.0 + 0.7 * 1.0)
+
+    stats.record(5.0, success=False)
+    assert stats.latency == pytest.approx(1.3)
+    assert stats.failure_rate == pytest.approx(0.3)
+    assert stats.expected_cost(2.0) == pytest.approx(1.3 + 0.3 * 10.0)
+
+    # A search cancelled sooner than the average says nothing new
+    stats.record_cancelled(0.5, default_latency=2.0)
+    assert stats.latency == pytest.approx(1.3)
+    stats.record_cancelled(3.3, default_latency=2.0)
+    assert stats.latency == pytest.approx(0.3 * 3.3 + 0.7 * 1.3)
+
+
+def test_adaptive_order_keeps_untried_engines_after_known_ones(settings):
+    settings.adaptive_engine_order = True
+    tool = make_tool(first=FakeEngine(), second=FakeEngine(), third=FakeEngine())
+    assert tool._get_engine_order() == ["first", "second", "third"]
+
+    # A slow configured engine still ranks before untried ones
+    web_search._ENGINE_STATS["first"] = _EngineStats()
+    web_search._ENGINE_STATS["first"].record(30.0, success=True)
+    assert tool._get_engine_order() == ["first", "second", "third"]
+
+    web_search._ENGINE_STATS["third"] = _EngineStats()
+    web_search._ENGINE_STATS["third"].record(0.1, success=True)
+    assert tool._get_engine_order() == ["third", "first", "second"]